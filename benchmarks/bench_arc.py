@@ -0,0 +1,56 @@
+"""Time spent on arcs when parsing, writing out and evaluating paths
+
+The center parameterization of an arc is calculated when it's first
+needed, so parsing an arc-heavy path and writing it out again never
+calculates it. The other rows include calculating it.
+
+Run with: python benchmarks/bench_arc.py
+"""
+
+import timeit
+
+from svg.path import Arc, parse_path
+from svg.path.path import QUADRATURE
+
+ARCS = 5000
+
+
+def make_pathdef(count: int) -> str:
+    return " ".join(
+        f"M {i % 500},{i % 300} a 5,3 30 0 1 8,2 A 10,10 0 1,0 {i % 500},20"
+        for i in range(count // 2)
+    )
+
+
+def main() -> None:
+    pathdef = make_pathdef(ARCS)
+    arc = Arc(0j, 5 + 3j, 30, False, True, 8 + 2j)
+    cases = [
+        ("parse", 10, lambda: parse_path(pathdef)),
+        ("parse and d()", 10, lambda: parse_path(pathdef).d()),
+        ("parse and bbox", 10, lambda: parse_path(pathdef).boundingbox()),
+        (
+            "parse and length",
+            3,
+            lambda: parse_path(pathdef).length(method=QUADRATURE),
+        ),
+    ]
+    print(f"{ARCS} arcs")
+    print(f"{'':<20} {'time (ms)':>10}")
+    for name, number, function in cases:
+        seconds = min(timeit.repeat(function, number=number, repeat=3)) / number
+        print(f"{name:<20} {seconds * 1000:>10.2f}")
+
+    print()
+    print(f"{'one arc':<20} {'time (us)':>10}")
+    for name, function in (
+        ("Arc()", lambda: Arc(0j, 5 + 3j, 30, False, True, 8 + 2j)),
+        ("point()", lambda: arc.point(0.3)),
+        ("tangent()", lambda: arc.tangent(0.3)),
+    ):
+        seconds = min(timeit.repeat(function, number=100000, repeat=3)) / 100000
+        print(f"{name:<20} {seconds * 1e6:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
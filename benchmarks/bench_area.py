@@ -0,0 +1,76 @@
+"""Time to calculate the area and centroid of paths
+
+The brute force flattens each path and sums the areas of the triangles of
+the polygon, which is only as accurate as the flattening. area() and
+centroid() integrate each segment in closed form with Green's theorem.
+area_many() and centroid_many() integrate the segments of many paths
+together with NumPy. The last column is the largest relative error.
+
+Run with: python benchmarks/bench_area.py
+"""
+
+import time
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+from svg.path import Path, parse_path
+from svg.path.array import PathArray, area_many, centroid_many
+
+TOLERANCE = 0.01
+COUNT = 1000
+
+
+def pathdef(i: int) -> str:
+    x = (i % 40) * 300
+    y = (i // 40) * 300
+    return (
+        f"M {x + 100},{y + 200} C {x + 100},{y + 100} {x + 250},{y + 100} "
+        f"{x + 250},{y + 200} Q {x + 300},{y + 250} {x + 250},{y + 290} "
+        f"A 80,40 {i % 90} 0,1 {x + 120},{y + 250} L {x + 90},{y + 230} Z"
+    )
+
+
+def flattened(path: Path) -> Tuple[float, complex]:
+    points, starts = path.flatten(TOLERANCE)
+    area = 0.0
+    moment = 0j
+    for first, last in zip(starts, list(starts[1:]) + [len(points)]):
+        ring = points[first:last]
+        following = np.roll(ring, -1)
+        cross = ring.real * following.imag - ring.imag * following.real
+        area += cross.sum() / 2
+        moment += ((ring + following) * cross).sum() / 6
+    return area, moment / area
+
+
+def timed(function: Callable[[], object]) -> Tuple[float, object]:
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    paths = [parse_path(pathdef(i)) for i in range(COUNT)]
+    arrays = [PathArray.from_path(path) for path in paths]
+    exact = np.array([path.area() for path in paths])
+    print(f"{COUNT} paths of {len(paths[0])} segments")
+
+    seconds, result = timed(lambda: [flattened(path) for path in paths])
+    sampled: List[Tuple[float, complex]] = result  # type: ignore[assignment]
+    error = max(abs(area / e - 1) for (area, _), e in zip(sampled, exact))
+    print(f"{'flatten and sum':<30} {seconds / COUNT * 1e3:>10.4f} ms {error:>10.1e}")
+
+    seconds, _ = timed(lambda: [(path.area(), path.centroid()) for path in paths])
+    print(f"{'area(), centroid()':<30} {seconds / COUNT * 1e3:>10.4f} ms")
+
+    seconds, result = timed(lambda: (area_many(arrays), centroid_many(arrays)))
+    many = result[0]  # type: ignore[index]
+    error = float(np.max(np.abs(many / exact - 1)))
+    print(
+        f"{'area_many(), centroid_many()':<30} {seconds / COUNT * 1e3:>10.4f} ms {error:>10.1e}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Time to evaluate Bézier curves
+
+point() and tangent() evaluate the curve as a polynomial with Horner's
+rule, with the coefficients calculated on the first call. The lengths
+call point() or tangent() many times. The curves are far from the origin,
+where rounding errors are the largest, and the last column is the largest
+difference from the Bernstein form, evaluated with exact fractions.
+
+Run with: python benchmarks/bench_bezier.py
+"""
+
+import timeit
+from fractions import Fraction
+from typing import Callable, List, Tuple
+
+from svg.path import CubicBezier, QuadraticBezier
+from svg.path.path import QUADRATURE, NonLinear
+
+OFFSET = 1e6 + 1e6j
+CUBIC = CubicBezier(OFFSET, OFFSET + 100j, OFFSET + 100 + 100j, OFFSET + 100)
+QUADRATIC = QuadraticBezier(OFFSET, OFFSET + 100j, OFFSET + 100)
+POSITIONS = [i / 100 for i in range(101)]
+
+
+def exact_point(curve: NonLinear, pos: float) -> Tuple[Fraction, Fraction]:
+    """The Bernstein form of the curve, evaluated with fractions"""
+    if isinstance(curve, CubicBezier):
+        points = [curve.start, curve.control1, curve.control2, curve.end]
+        weights = [1, 3, 3, 1]
+    else:
+        assert isinstance(curve, QuadraticBezier)
+        points = [curve.start, curve.control, curve.end]
+        weights = [1, 2, 1]
+    t = Fraction(pos)
+    degree = len(points) - 1
+    x = y = Fraction(0)
+    for i, (point, weight) in enumerate(zip(points, weights)):
+        basis = weight * (1 - t) ** (degree - i) * t**i
+        x += basis * Fraction(point.real)
+        y += basis * Fraction(point.imag)
+    return x, y
+
+
+def max_error(curve: NonLinear) -> float:
+    errors: List[float] = []
+    for pos in POSITIONS:
+        x, y = exact_point(curve, pos)
+        point = curve.point(pos)
+        errors.append(max(abs(point.real - x), abs(point.imag - y)))
+    return max(errors)
+
+
+def main() -> None:
+    print(f"{'':<10} {'method':<20} {'time (us)':>10} {'max error':>10}")
+    for name, curve in (("cubic", CUBIC), ("quadratic", QUADRATIC)):
+        cases: List[Tuple[str, int, Callable[[], object]]] = [
+            ("point()", 100000, lambda: curve.point(0.3)),
+            ("tangent()", 100000, lambda: curve.tangent(0.3)),
+            ("length()", 100, lambda: curve.length()),
+            ("length(QUADRATURE)", 1000, lambda: curve.length(method=QUADRATURE)),
+            ("boundingbox()", 10000, lambda: curve.boundingbox()),
+        ]
+        error = f"{max_error(curve):>10.1e}"
+        for method, number, function in cases:
+            seconds = min(timeit.repeat(function, number=number, repeat=5)) / number
+            print(f"{name:<10} {method:<20} {seconds * 1e6:>10.3f} {error}")
+            error = ""
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Time to find the closest point on a path
+
+The brute force samples every segment at 1000 positions. closest_point()
+finds the roots of the distance derivative of each segment, and skips the
+segments whose bounding boxes are further away than the best point so far.
+closest_point_many() does the same for an array of points. The last column
+is the largest distance the brute force gets wrong.
+
+Run with: python benchmarks/bench_closest.py
+"""
+
+import time
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+from svg.path import Move, Path, parse_path
+
+SAMPLES = 1000
+PATHDEF = "M 100,200 C 100,100 250,100 250,200 S 400,300 400,200 " + " ".join(
+    f"Q {x + 50},{(x % 200) + 50} {x + 100},300 a 25,50 -30 0,1 50,-25"
+    for x in range(400, 10400, 150)
+)
+
+
+def brute_force(path: Path, point: complex) -> float:
+    best = float("inf")
+    for segment in path:
+        if isinstance(segment, Move):
+            continue
+        for i in range(SAMPLES + 1):
+            best = min(best, abs(segment.point(i / SAMPLES) - point))
+    return best
+
+
+def timed(function: Callable[[], object]) -> Tuple[float, object]:
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    path = parse_path(PATHDEF)
+    x, y = np.meshgrid(np.linspace(0, 10500, 50), np.linspace(0, 400, 4))
+    points = (x + 1j * y).ravel()
+    print(f"{len(path)} segments, {len(points)} points")
+
+    seconds, result = timed(lambda: [brute_force(path, p) for p in points[:10]])
+    sampled: List[float] = result  # type: ignore[assignment]
+    exact = [path.closest_point(complex(p)).distance for p in points[:10]]
+    error = max(s - e for s, e in zip(sampled, exact))
+    print(f"{'brute force':<24} {seconds / 10 * 1e3:>10.3f} ms {error:>10.1e}")
+
+    seconds, _ = timed(lambda: [path.closest_point(complex(p)) for p in points])
+    print(f"{'closest_point()':<24} {seconds / len(points) * 1e3:>10.3f} ms")
+
+    seconds, _ = timed(lambda: path.closest_point_many(points))
+    print(f"{'closest_point_many()':<24} {seconds / len(points) * 1e3:>10.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
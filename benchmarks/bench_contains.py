@@ -0,0 +1,81 @@
+"""Time to test if points are inside a filled path
+
+The brute force flattens the path to a polygon once, and counts the edges of
+the polygon that cross a ray from each point. contains() solves each segment
+for the ray exactly, and skips the segments whose bounding boxes the ray
+can't cross. contains_many() does the same for an array of points, and skips
+the segments that no point is level with. The last column is the number of
+points the brute force gets wrong.
+
+Run with: python benchmarks/bench_contains.py
+"""
+
+import time
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+from svg.path import Move, Path, parse_path
+
+TOLERANCE = 0.01
+PATHDEF = (
+    "M 100,200 C 100,100 250,100 250,200 S 400,300 400,200 "
+    + " ".join(
+        f"Q {x + 50},{(x % 200) + 50} {x + 100},300 a 25,50 -30 0,1 50,-25"
+        for x in range(400, 10400, 150)
+    )
+    + " V 400 H 100 Z"
+)
+
+
+def polygon(path: Path) -> List[Tuple[complex, complex]]:
+    edges: List[Tuple[complex, complex]] = []
+    for segment in path:
+        if isinstance(segment, Move):
+            continue
+        points = segment.flatten(TOLERANCE)
+        edges.extend(zip(points, points[1:]))
+    return edges
+
+
+def brute_force(edges: List[Tuple[complex, complex]], point: complex) -> bool:
+    winding = 0
+    for start, end in edges:
+        if (start.imag <= point.imag) != (end.imag <= point.imag):
+            x = start.real + (point.imag - start.imag) / (end.imag - start.imag) * (
+                end.real - start.real
+            )
+            if x > point.real:
+                winding += 1 if end.imag > start.imag else -1
+    return winding != 0
+
+
+def timed(function: Callable[[], object]) -> Tuple[float, object]:
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    path = parse_path(PATHDEF)
+    rng = np.random.default_rng(0)
+    points = rng.uniform(0, 10500, 10000) + 1j * rng.uniform(0, 450, 10000)
+    print(f"{len(path)} segments, {len(points)} points")
+
+    seconds, result = timed(lambda: polygon(path))
+    edges: List[Tuple[complex, complex]] = result  # type: ignore[assignment]
+    seconds, result = timed(lambda: [brute_force(edges, p) for p in points[:100]])
+    sampled: List[bool] = result  # type: ignore[assignment]
+    exact = [path.contains(complex(p)) for p in points[:100]]
+    wrong = sum(s != e for s, e in zip(sampled, exact))
+    print(f"{'brute force':<20} {seconds / 100 * 1e3:>10.4f} ms {wrong:>6}")
+
+    seconds, _ = timed(lambda: [path.contains(complex(p)) for p in points])
+    print(f"{'contains()':<20} {seconds / len(points) * 1e3:>10.4f} ms")
+
+    seconds, _ = timed(lambda: path.contains_many(points))
+    print(f"{'contains_many()':<20} {seconds / len(points) * 1e3:>10.4f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Time to measure a large path again after editing one segment
+
+An interactive editor changes one segment at a time and then asks for points
+on the path. Only the changed segment should be measured again, so the time
+per edit should stay small as the path grows. Measuring a new copy of the
+path shows the cost of recalculating everything. Changing a segment of
+another, small path in place shouldn't cost the large path anything. The
+lengths are calculated with quadrature, as subdivision is too slow for paths
+this large.
+
+Run with: python benchmarks/bench_edit.py
+"""
+
+import timeit
+
+from svg.path import CubicBezier, Path
+from svg.path.path import QUADRATURE
+
+
+def make_path(count: int) -> Path:
+    return Path(
+        *(
+            CubicBezier(
+                complex(i, 0), complex(i, 5), complex(i + 1, 5), complex(i + 1, 0)
+            )
+            for i in range(count)
+        )
+    )
+
+
+def main() -> None:
+    print(f"{'segments':>9} {'edit (ms)':>10} {'other (ms)':>10} {'full (ms)':>10}")
+    for count in (1000, 10000, 50000):
+        path = make_path(count)
+        path.length(method=QUADRATURE)
+        path.boundingbox()
+        edits = 100
+
+        def edit() -> None:
+            for i in range(edits):
+                index = (i * 7919) % count
+                path[index] = CubicBezier(
+                    complex(index, 0),
+                    complex(index, i),
+                    complex(index + 1, i),
+                    complex(index + 1, 0),
+                )
+                path.point(0.5)
+                path.boundingbox()
+
+        seconds = min(timeit.repeat(edit, number=1, repeat=3)) / edits
+
+        other = make_path(10)
+        other.length(method=QUADRATURE)
+
+        def edit_other() -> None:
+            for i in range(edits):
+                other[5].control1 = complex(5, i)
+                path.point(0.5)
+                path.boundingbox()
+
+        others = min(timeit.repeat(edit_other, number=1, repeat=3)) / edits
+        full = timeit.timeit(lambda: Path(*path).length(method=QUADRATURE), number=1)
+        print(
+            f"{count:>9} {seconds * 1000:>10.3f} {others * 1000:>10.3f}"
+            f" {full * 1000:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
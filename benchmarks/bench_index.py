@@ -0,0 +1,110 @@
+"""Time to find the segments of many paths in a viewport or near a point
+
+Many small paths of cubic curves, quadratic curves, arcs and lines are
+spread over a map. SegmentIndex packs the bounding boxes of all their
+segments into an R-tree, and then finds the segments in a viewport, within a
+distance of a point, or nearest to a point, by only searching the nodes whose
+boxes are close enough. The brute force checks the bounding box of every
+segment, so it's only timed for the smaller maps.
+
+Run with: python benchmarks/bench_index.py
+"""
+
+import random
+import time
+from typing import List, Tuple
+
+from svg.path import Arc, CubicBezier, Line, Move, Path, PathSegment, QuadraticBezier
+from svg.path import SegmentIndex
+
+BRUTE_FORCE_LIMIT = 100000
+QUERIES = 100
+
+
+def shape(x: float, y: float) -> Path:
+    start = complex(x, y)
+    segments: List[PathSegment] = [
+        Move(start),
+        CubicBezier(start, start + 5 + 10j, start + 15 - 5j, start + 20),
+        QuadraticBezier(start + 20, start + 25 + 10j, start + 20 + 20j),
+        Arc(start + 20 + 20j, 10 + 5j, 30, False, True, start + 20j),
+        Line(start + 20j, start),
+    ]
+    return Path(*segments)
+
+
+def brute_force(paths: List[Path], box: Tuple[float, float, float, float]) -> int:
+    found = 0
+    for path in paths:
+        for segment in path:
+            if isinstance(segment, Move):
+                continue
+            left, top, right, bottom = segment.boundingbox()
+            if (
+                left <= box[2]
+                and right >= box[0]
+                and top <= box[3]
+                and bottom >= box[1]
+            ):
+                found += 1
+    return found
+
+
+def main() -> None:
+    random.seed(0)
+    print(
+        f"{'segments':>10} {'build (s)':>10} {'viewport (ms)':>14} {'radius (ms)':>12} "
+        f"{'nearest (ms)':>13} {'edit (ms)':>10} {'brute (ms)':>11}"
+    )
+    for count in (10000, 100000, 1000000):
+        side = (count / 4) ** 0.5 * 40
+        paths = [
+            shape(random.uniform(0, side), random.uniform(0, side))
+            for _ in range(count // 4)
+        ]
+        points = [
+            complex(random.uniform(0, side), random.uniform(0, side))
+            for _ in range(QUERIES)
+        ]
+        boxes = [(p.real, p.imag, p.real + 200, p.imag + 150) for p in points]
+
+        start = time.perf_counter()
+        index = SegmentIndex(paths)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for box in boxes:
+            index.query(box)
+        viewport = (time.perf_counter() - start) / QUERIES * 1e3
+
+        start = time.perf_counter()
+        for point in points:
+            index.query_radius(point, 10)
+        radius = (time.perf_counter() - start) / QUERIES * 1e3
+
+        start = time.perf_counter()
+        for point in points:
+            index.nearest(point, 5)
+        nearest = (time.perf_counter() - start) / QUERIES * 1e3
+
+        # Move a segment of each of some paths, and index it again
+        start = time.perf_counter()
+        for path_id, point in enumerate(points):
+            index.path(path_id)[4] = Line(point, index.path(path_id)[4].end)
+            index.replace(path_id, 4)
+        edit = (time.perf_counter() - start) / QUERIES * 1e3
+
+        line = (
+            f"{count:>10} {build:>10.3f} {viewport:>14.4f} {radius:>12.4f} "
+            f"{nearest:>13.4f} {edit:>10.4f}"
+        )
+        if count <= BRUTE_FORCE_LIMIT:
+            start = time.perf_counter()
+            for box in boxes[:10]:
+                brute_force(paths, box)
+            line += f" {(time.perf_counter() - start) / 10 * 1e3:>11.4f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
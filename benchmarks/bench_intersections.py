@@ -0,0 +1,86 @@
+"""Time to intersect two paths
+
+Two wavy paths, one along the x axis and one along the y axis, made of
+cubic curves, quadratic curves, arcs and lines, cross each other in a
+grid. Path.intersections() only intersects the pairs of segments whose
+bounding boxes overlap. The pairs are found by searching the segment trees
+of both paths together. Trying all pairs of segments takes quadratic time,
+so it's only timed for the smaller paths.
+
+Run with: python benchmarks/bench_intersections.py
+"""
+
+import time
+from typing import List
+
+from svg.path import Arc, CubicBezier, Line, Move, Path, PathSegment, QuadraticBezier
+from svg.path.path import intersections
+
+ALL_PAIRS_LIMIT = 1000
+
+
+def wave(count: int, rows: int, vertical: bool) -> Path:
+    """Rows of wavy segments, swapped to columns when vertical"""
+    segments: List[PathSegment] = []
+    per_row = count // rows
+    for row in range(rows):
+        y = row * 10.0
+        start = complex(0, y)
+        segments.append(Move(start))
+        for i in range(per_row):
+            end = complex((i + 1) * 3.0, y)
+            kind = i % 4
+            if kind == 0:
+                segment: PathSegment = CubicBezier(
+                    start, start + 1 + 4j, end - 1 - 4j, end
+                )
+            elif kind == 1:
+                segment = QuadraticBezier(start, start + 1.5 + 4j, end)
+            elif kind == 2:
+                segment = Arc(start, 2 + 3j, 0, False, True, end)
+            else:
+                segment = Line(start, end)
+            segments.append(segment)
+            start = end
+    if vertical:
+        for segment in segments:
+            segment.start = complex(segment.start.imag, segment.start.real)
+            segment.end = complex(segment.end.imag, segment.end.real)
+            if isinstance(segment, CubicBezier):
+                segment.control1 = complex(segment.control1.imag, segment.control1.real)
+                segment.control2 = complex(segment.control2.imag, segment.control2.real)
+            elif isinstance(segment, QuadraticBezier):
+                segment.control = complex(segment.control.imag, segment.control.real)
+            elif isinstance(segment, Arc):
+                segment.sweep = False
+    return Path(*segments)
+
+
+def all_pairs(path1: Path, path2: Path) -> int:
+    return sum(
+        len(intersections(segment1, segment2))
+        for segment1 in path1
+        for segment2 in path2
+    )
+
+
+def main() -> None:
+    print(
+        f"{'segments':>10} {'intersections':>14} {'tree (s)':>10} {'all pairs (s)':>14}"
+    )
+    for count, rows in ((200, 2), (1000, 5), (10000, 20), (40000, 40)):
+        path1 = wave(count, rows, vertical=False)
+        path2 = wave(count, rows, vertical=True)
+        start = time.perf_counter()
+        found = path1.intersections(path2)
+        tree = time.perf_counter() - start
+        line = f"{count:>10} {len(found):>14} {tree:>10.3f}"
+        if count <= ALL_PAIRS_LIMIT:
+            start = time.perf_counter()
+            all_pairs(path1, path2)
+            line += f" {time.perf_counter() - start:>14.3f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
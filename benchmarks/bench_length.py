@@ -0,0 +1,55 @@
+"""Speed and accuracy of the curve length methods
+
+Compares the recursive subdivision with the adaptive Gauss-Legendre
+quadrature for a few cubic Bézier curves and elliptical arcs, at different
+error settings. The reference length is a composite Gauss-Legendre
+quadrature over many small intervals.
+
+Run with: python benchmarks/bench_length.py
+"""
+
+import timeit
+from math import radians
+
+from svg.path import Arc, CubicBezier
+from svg.path.path import NonLinear, QUADRATURE, SUBDIVISION, _gauss_length
+
+CURVES = {
+    "cubic": CubicBezier(300 + 100j, 100 + 100j, 200 + 200j, 200 + 300j),
+    "cubic s-bend": CubicBezier(600 + 500j, 600 + 350j, 900 + 650j, 900 + 500j),
+    "cubic cusp": CubicBezier(0j, 100 + 100j, 0 + 100j, 100 + 0j),
+    "ellipse arc": Arc(0j, 100 + 50j, 30, True, False, 20 + 10j),
+}
+
+
+def reference_length(curve: NonLinear, intervals: int = 10000) -> float:
+    length = sum(
+        _gauss_length(curve, i / intervals, (i + 1) / intervals)
+        for i in range(intervals)
+    )
+    if isinstance(curve, Arc):
+        length *= abs(radians(curve.delta))
+    return length
+
+
+def main() -> None:
+    print(
+        f"{'curve':<14} {'error':>7} {'method':<12} {'time (ms)':>10} {'abs error':>10}"
+    )
+    for name, curve in CURVES.items():
+        reference = reference_length(curve)
+        for error in (1e-4, 1e-8, 1e-12):
+            for method in (SUBDIVISION, QUADRATURE):
+                number = 3 if method == SUBDIVISION else 100
+                seconds = timeit.timeit(
+                    lambda: curve.length(error=error, method=method), number=number
+                )
+                difference = abs(curve.length(error=error, method=method) - reference)
+                print(
+                    f"{name:<14} {error:>7.0e} {method:<12} "
+                    f"{seconds / number * 1000:>10.3f} {difference:>10.1e}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Memory used per segment, with and without slots
+
+The segment classes use __slots__. Subclassing them without __slots__ gives
+each instance a __dict__ again, which is how they were stored before, so the
+difference is the saving per segment. The sizes include the complex numbers
+and other values each segment holds.
+
+Run with: python benchmarks/bench_memory.py
+"""
+
+import gc
+import tracemalloc
+from typing import Any, Callable, Dict, Type
+
+from svg.path import Arc, Close, CubicBezier, Line, Move, QuadraticBezier
+from svg.path.path import PathSegment
+
+COUNT = 100000
+
+FACTORIES: Dict[Type[Any], Callable[[Type[Any], int], PathSegment]] = {
+    Line: lambda cls, i: cls(complex(i, 1), complex(i, 2)),
+    Close: lambda cls, i: cls(complex(i, 1), complex(i, 2)),
+    Move: lambda cls, i: cls(complex(i, 1)),
+    CubicBezier: lambda cls, i: cls(
+        complex(i, 1), complex(i, 2), complex(i, 3), complex(i, 4)
+    ),
+    QuadraticBezier: lambda cls, i: cls(complex(i, 1), complex(i, 2), complex(i, 3)),
+    Arc: lambda cls, i: cls(complex(i, 1), 50 + 30j, 20.5, 0, 1, complex(i, 80)),
+}
+
+
+def bytes_per_segment(
+    cls: Type[Any], factory: Callable[[Type[Any], int], PathSegment]
+) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    segments = [factory(cls, i) for i in range(COUNT)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del segments
+    return (after - before) / COUNT
+
+
+def main() -> None:
+    print(f"{'segment':<16} {'__dict__':>10} {'slots':>10} {'saved':>10}")
+    for cls, factory in FACTORIES.items():
+        # A subclass without __slots__ has a __dict__, like before
+        unslotted = type(cls.__name__, (cls,), {})
+        with_dict = bytes_per_segment(unslotted, factory)
+        slotted = bytes_per_segment(cls, factory)
+        print(
+            f"{cls.__name__:<16} {with_dict:>10.1f} {slotted:>10.1f} "
+            f"{with_dict - slotted:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
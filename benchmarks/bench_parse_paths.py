@@ -0,0 +1,68 @@
+"""Time to parse many path definitions with parse_paths()
+
+Each path definition is parsed on its own, so the work spreads over a
+process pool, and the speedup is limited by the number of CPU cores and by
+making the segment objects from the packed paths in the main process. The
+time with one worker is the time of parsing serially in this process.
+
+The second table compares sending a chunk of paths back packed, which is
+then unpacked into segment objects, with pickling the segment objects.
+
+Run with: python benchmarks/bench_parse_paths.py
+"""
+
+import os
+import pickle
+import timeit
+
+from svg.path import parse_path, parse_paths
+from svg.path.parser import _parse_packed
+
+COUNT = 20000
+
+
+def make_pathdefs(count: int) -> list:
+    return [
+        f"M {i % 500},{i % 300} c 1.5,-2 4,-3 6,-1 s 4,3 6,1 l {i % 7},{i % 11} "
+        f"q 2,4 5,3 t 4,0 a 5,3 30 0 1 8,2 h -{i % 13} v 5 z"
+        for i in range(count)
+    ]
+
+
+def main() -> None:
+    pathdefs = make_pathdefs(COUNT)
+    cores = os.cpu_count() or 1
+    print(f"{COUNT} paths, {cores} CPU cores")
+    print(f"{'workers':>8} {'time (s)':>9} {'speedup':>8}")
+    serial = 0.0
+    for workers in sorted({1, 2, 4, cores}):
+        elapsed = min(
+            timeit.repeat(
+                lambda: parse_paths(pathdefs, workers=workers), number=1, repeat=3
+            )
+        )
+        if workers == 1:
+            serial = elapsed
+        print(f"{workers:>8} {elapsed:>9.3f} {serial / elapsed:>7.2f}x")
+
+    chunk = pathdefs[:256]
+    packed = _parse_packed(chunk)
+    paths = [parse_path(pathdef) for pathdef in chunk]
+    print()
+    print(f"{'256 paths':>9} {'pickle (ms)':>12} {'load (ms)':>10} {'bytes':>8}")
+    packed_data = pickle.dumps(packed)
+    paths_data = pickle.dumps(paths)
+    for name, value, data, load in (
+        ("packed", packed, packed_data, lambda: pickle.loads(packed_data).unpack()),
+        ("segments", paths, paths_data, lambda: pickle.loads(paths_data)),
+    ):
+        dump_time = min(timeit.repeat(lambda: pickle.dumps(value), number=10, repeat=3))
+        load_time = min(timeit.repeat(load, number=10, repeat=3))
+        print(
+            f"{name:>9} {dump_time * 100:>12.2f} {load_time * 100:>10.2f}"
+            f" {len(data):>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Time to parse one large path definition with parse_path(workers=...)
+
+The path definition is split at Move commands, and the parts are parsed in
+a process pool. The speedup is limited by the number of CPU cores and by
+making the segment objects from the packed parts in the main process. The
+time with one worker is the time of parsing serially in this process.
+
+Run with: python benchmarks/bench_parse_split.py
+"""
+
+import os
+import timeit
+
+from svg.path import parse_path
+
+SUBPATHS = 20000
+
+
+def make_pathdef(count: int) -> str:
+    # Alternating absolute and relative subpaths, all of them closed
+    return " ".join(
+        f"M {i % 500},{i % 300} c 1.5,-2 4,-3 6,-1 s 4,3 6,1 l {i % 7},{i % 11} z "
+        f"m 3,2 q 2,4 5,3 t 4,0 a 5,3 30 0 1 8,2 h -{i % 13} v 5 z"
+        for i in range(count // 2)
+    )
+
+
+def main() -> None:
+    pathdef = make_pathdef(SUBPATHS)
+    cores = os.cpu_count() or 1
+    print(f"{SUBPATHS} subpaths, {len(pathdef)} characters, {cores} CPU cores")
+    print(f"{'workers':>8} {'time (s)':>9} {'speedup':>8}")
+    serial = 0.0
+    for workers in sorted({1, 2, 4, cores}):
+        elapsed = min(
+            timeit.repeat(
+                lambda: parse_path(pathdef, workers=workers), number=1, repeat=3
+            )
+        )
+        if workers == 1:
+            serial = elapsed
+        print(f"{workers:>8} {elapsed:>9.3f} {serial / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
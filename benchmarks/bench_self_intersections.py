@@ -0,0 +1,95 @@
+"""Time to find where a path intersects itself
+
+One path is made of wavy rows and wavy columns of cubic curves, quadratic
+curves, arcs and lines, which cross each other in a grid. Path.self_intersections()
+splits the segments at their extrema and sweeps a line across the pieces, so
+it only intersects the segments that cross, and the ones that join. Trying
+all pairs of segments takes quadratic time, so it's only timed for the
+smaller paths.
+
+Run with: python benchmarks/bench_self_intersections.py
+"""
+
+import itertools
+import time
+from typing import List
+
+from svg.path import Arc, CubicBezier, Line, Move, Path, PathSegment, QuadraticBezier
+from svg.path.path import intersections
+
+ALL_PAIRS_LIMIT = 1000
+
+
+def flip(point: complex, vertical: bool) -> complex:
+    return complex(point.imag, point.real) if vertical else point
+
+
+def wave(segments: List[PathSegment], count: int, y: float, vertical: bool) -> None:
+    """Adds a row of wavy segments, or a column when vertical"""
+    start = complex(0, y)
+    segments.append(Move(flip(start, vertical)))
+    for i in range(count):
+        end = complex((i + 1) * 3.0, y)
+        kind = i % 4
+        if kind == 0:
+            segment: PathSegment = CubicBezier(
+                flip(start, vertical),
+                flip(start + 1 + 4j, vertical),
+                flip(end - 1 - 4j, vertical),
+                flip(end, vertical),
+            )
+        elif kind == 1:
+            segment = QuadraticBezier(
+                flip(start, vertical),
+                flip(start + 1.5 + 4j, vertical),
+                flip(end, vertical),
+            )
+        elif kind == 2:
+            segment = Arc(
+                flip(start, vertical),
+                2 + 3j,
+                0,
+                False,
+                not vertical,
+                flip(end, vertical),
+            )
+        else:
+            segment = Line(flip(start, vertical), flip(end, vertical))
+        segments.append(segment)
+        start = end
+
+
+def grid(count: int, rows: int) -> Path:
+    segments: List[PathSegment] = []
+    for vertical in (False, True):
+        for row in range(rows):
+            wave(segments, count // rows // 2, row * 10.0, vertical)
+    return Path(*segments)
+
+
+def all_pairs(path: Path) -> int:
+    return sum(
+        len(intersections(segment1, segment2))
+        for segment1, segment2 in itertools.combinations(path, 2)
+    )
+
+
+def main() -> None:
+    print(
+        f"{'segments':>10} {'intersections':>14} {'sweep (s)':>10} {'all pairs (s)':>14}"
+    )
+    for count, rows in ((200, 2), (1000, 5), (10000, 20), (40000, 40)):
+        path = grid(count, rows)
+        start = time.perf_counter()
+        found = path.self_intersections()
+        sweep = time.perf_counter() - start
+        line = f"{count:>10} {len(found):>14} {sweep:>10.3f}"
+        if count <= ALL_PAIRS_LIMIT:
+            start = time.perf_counter()
+            all_pairs(path)
+            line += f" {time.perf_counter() - start:>14.3f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""Parse time as a function of the length of implicit argument lists
+
+A single command followed by many implicit coordinate pairs is common in map
+and font data. The time per pair should stay constant as the list grows.
+
+Run with: python benchmarks/bench_tokenizer.py
+"""
+
+import timeit
+
+from svg.path import parse_path
+from svg.path.parser import _tokenize_path
+
+
+def make_path(pairs: int) -> str:
+    coordinates = " ".join(f"{i % 997}.5,{-i % 991}.25" for i in range(pairs))
+    return f"M 0,0 L {coordinates} z"
+
+
+def main() -> None:
+    print(f"{'pairs':>8} {'tokenize (s)':>14} {'parse (s)':>12} {'us/pair':>9}")
+    for pairs in (1000, 2000, 4000, 8000, 16000, 32000, 64000):
+        pathdef = make_path(pairs)
+        tokenize = min(
+            timeit.repeat(lambda: list(_tokenize_path(pathdef)), number=1, repeat=3)
+        )
+        parse = min(timeit.repeat(lambda: parse_path(pathdef), number=1, repeat=3))
+        print(
+            f"{pairs:>8} {tokenize:>14.4f} {parse:>12.4f} {parse / pairs * 1e6:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Time to apply an affine transformation to a path
+
+Path.transform() copies the segments and transforms their points, and for
+arcs the radius and rotation. transform_in_place() changes the segments
+instead of copying them. PathArray.transform() transforms the columns of
+all the segments together with NumPy.
+
+Run with: python benchmarks/bench_transform.py
+"""
+
+import time
+from typing import Callable
+
+from svg.path import parse_path
+from svg.path.array import PathArray
+
+REPEAT = 10
+MATRIX = [[0.8, -0.6, 10.0], [0.6, 0.8, -20.0]]
+PATHDEF = "M 100,200 C 100,100 250,100 250,200 S 400,300 400,200 " + " ".join(
+    f"Q {x + 50},{(x % 200) + 50} {x + 100},300 a 25,50 -30 0,1 50,-25 "
+    f"l 20,30 c 5,-10 10,-10 15,0"
+    for x in range(400, 400 + 2500 * 150, 150)
+)
+
+
+def timed(function: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        function()
+    return (time.perf_counter() - start) / REPEAT
+
+
+def main() -> None:
+    path = parse_path(PATHDEF)
+    path_array = PathArray.from_path(path)
+    print(f"{len(path)} segments")
+    seconds = timed(lambda: path.transform(MATRIX))
+    print(f"{'Path.transform()':<30} {seconds * 1e3:>10.3f} ms")
+    seconds = timed(lambda: path.transform_in_place(MATRIX))
+    print(f"{'Path.transform_in_place()':<30} {seconds * 1e3:>10.3f} ms")
+    seconds = timed(lambda: path_array.transform(MATRIX))
+    print(f"{'PathArray.transform()':<30} {seconds * 1e3:>10.3f} ms")
+    seconds = timed(lambda: path_array.transform_in_place(MATRIX))
+    print(f"{'PathArray.transform_in_place()':<30} {seconds * 1e3:>10.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
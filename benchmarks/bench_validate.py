@@ -0,0 +1,76 @@
+"""Time to validate path definitions compared to parsing them
+
+validate_path() checks the same grammar as parse_path() without making any
+segments. Path definitions where the numbers are separated by whitespace or
+commas are checked a whole path at a time. Minified ones, where a sign or a
+decimal point starts the next number, need an extra pass, and arcs with
+flags that aren't separated from the next number are checked one argument at
+a time, so they gain the least.
+
+Run with: python benchmarks/bench_validate.py
+"""
+
+import timeit
+
+from svg.path import parse_path
+from svg.path.parser import validate_path
+
+COUNT = 3000
+
+
+def polyline() -> str:
+    coordinates = " ".join(f"{i % 997}.5,{-i % 991}.25" for i in range(COUNT * 7))
+    return f"M 0,0 L {coordinates} z"
+
+
+def commands() -> str:
+    return (
+        "M 0 0 "
+        + " ".join(
+            f"C {i} 1.5 {i + 1} 2.5 {i + 2} 0 A 3 4 15 0 1 {i} {i / 3:.3f} "
+            f"q 1 2 3 4 h 5 v 6 t 7 8 s 1 2 3 4"
+            for i in range(COUNT)
+        )
+        + " z"
+    )
+
+
+def minified() -> str:
+    return (
+        "M0 0"
+        + "".join(
+            f"c{i}-1.5-{i + 1}.5.5-{i + 2} 0q1 2 3 4h5v6t7 8s1 2 3 4"
+            for i in range(COUNT)
+        )
+        + "z"
+    )
+
+
+def minified_arcs() -> str:
+    return (
+        "M0 0"
+        + "".join(
+            f"c{i}-1.5-{i + 1}.5.5-{i + 2} 0a3 4 15 01{i} {i / 3:.3f}"
+            for i in range(COUNT)
+        )
+        + "z"
+    )
+
+
+def main() -> None:
+    print(f"{'path':>14} {'parse (ms)':>11} {'validate (ms)':>14} {'speedup':>8}")
+    for make_path in (polyline, commands, minified, minified_arcs):
+        pathdef = make_path()
+        parse = min(timeit.repeat(lambda: parse_path(pathdef), number=1, repeat=5))
+        validate = min(
+            timeit.repeat(lambda: validate_path(pathdef), number=1, repeat=5)
+        )
+        name = make_path.__name__.replace("_", " ")
+        print(
+            f"{name:>14} {parse * 1000:>11.1f} {validate * 1000:>14.1f}"
+            f" {parse / validate:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
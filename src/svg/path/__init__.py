@@ -1,7 +1,8 @@
 from .path import Path, Move, Line, Arc, Close
 from .path import CubicBezier, QuadraticBezier
-from .path import PathSegment, Linear, NonLinear
-from .parser import parse_path
+from .path import PathSegment, Linear, NonLinear, intersections
+from .parser import parse_path, parse_paths, iterparse_path, PathParser
+from .index import SegmentIndex
 
 __all__ = (
     "Path",
@@ -14,5 +15,10 @@ __all__ = (
     "PathSegment",
     "Linear",
     "NonLinear",
+    "intersections",
     "parse_path",
+    "parse_paths",
+    "iterparse_path",
+    "PathParser",
+    "SegmentIndex",
 )
@@ -0,0 +1,387 @@
+# A spatial index of the segments of many paths, an R-tree of their
+# bounding boxes.
+
+from __future__ import annotations
+import heapq
+import math
+import weakref
+from typing import Dict, Iterable, List, Sequence, Set, Tuple, Union
+
+from .path import Box, Move, Path, PathSegment
+from .path import _box_distance, _box_union, _segment_box
+
+# The most children of a node of the R-tree
+NODE_CAPACITY = 16
+
+
+class _Entry:
+    """A segment in the index, with its bounding box"""
+
+    __slots__ = ("box", "path_id", "index", "parent")
+
+    def __init__(self, box: Box, path_id: int, index: int) -> None:
+        self.box = box
+        self.path_id = path_id
+        self.index = index
+        # The leaf the segment is in, or None when it's not in the tree
+        self.parent: Union[_Node, None] = None
+
+
+class _Node:
+    """A node of the R-tree, with entries in the leaves and nodes above"""
+
+    __slots__ = ("box", "children", "leaf", "parent")
+
+    def __init__(self, children: Sequence[Union[_Node, _Entry]], leaf: bool) -> None:
+        self.children = list(children)
+        self.leaf = leaf
+        self.parent: Union[_Node, None] = None
+        for child in self.children:
+            child.parent = self
+        self.box = _union(self.children)
+
+
+def _union(children: Sequence[Union[_Node, _Entry]]) -> Union[Box, None]:
+    box = None
+    for child in children:
+        box = _box_union(box, child.box)
+    return box
+
+
+def _center(child: Union[_Node, _Entry], axis: int) -> float:
+    """Twice the center of the box of a node or entry, along the x or y axis"""
+    box = child.box
+    assert box is not None
+    return box[axis] + box[axis + 2]
+
+
+def _area(box: Box) -> float:
+    return (box[2] - box[0]) * (box[3] - box[1])
+
+
+def _pack(
+    children: List[Union[_Node, _Entry]], leaf: bool, capacity: int
+) -> List[Union[_Node, _Entry]]:
+    """Packs boxes into nodes, sorting them into tiles of nearby boxes
+
+    This is Sort-Tile-Recursive: the boxes are sorted by x into vertical
+    slices, and each slice by y into nodes, so that the nodes overlap little.
+    """
+    if not children:
+        return []
+    count = math.ceil(len(children) / capacity)
+    per_slice = math.ceil(math.sqrt(count)) * capacity
+    children = sorted(children, key=lambda child: _center(child, 0))
+    nodes: List[Union[_Node, _Entry]] = []
+    for start in range(0, len(children), per_slice):
+        end = start + per_slice
+        part = sorted(children[start:end], key=lambda child: _center(child, 1))
+        for first in range(0, len(part), capacity):
+            last = first + capacity
+            nodes.append(_Node(part[first:last], leaf))
+    return nodes
+
+
+class SegmentIndex:
+    """A spatial index of the segments of many paths
+
+    The bounding boxes of the segments are kept in an R-tree, which is
+    loaded with Sort-Tile-Recursive packing from the paths it's created
+    with. Segments are found by their path id, the position of the path in
+    the paths given, or the id returned by add(), and their index in the
+    path. Moves are not indexed.
+
+    Changes to the attributes of the indexed segments are noticed by the
+    next query, which indexes only the changed segments again. Changes to
+    the paths are not noticed. Call insert(), delete() or replace() after
+    changing a path like with Path.insert(), del or assignment.
+    """
+
+    def __init__(
+        self, paths: Iterable[Path] = (), capacity: int = NODE_CAPACITY
+    ) -> None:
+        if capacity < 2:
+            raise ValueError("The capacity of the nodes must be at least 2")
+        self._capacity = capacity
+        self._paths: Dict[int, Path] = {}
+        self._entries: Dict[int, List[_Entry]] = {}
+        self._next_id = 0
+        self._count = 0
+        # The ids the paths were added with, by the id of the path
+        self._ids: Dict[int, List[int]] = {}
+        # The entries of the segments that changed since the last query
+        self._changed: Set[_Entry] = set()
+        indexed: List[Union[_Node, _Entry]] = []
+        for path in paths:
+            indexed.extend(self._add_path(path))
+        leaf = True
+        while len(indexed) > 1 or leaf:
+            indexed = _pack(indexed, leaf, capacity)
+            leaf = False
+        if indexed:
+            root = indexed[0]
+            assert isinstance(root, _Node)
+            self._root = root
+        else:
+            self._root = _Node([], leaf=True)
+
+    def __len__(self) -> int:
+        """The number of indexed segments"""
+        return self._count
+
+    def __repr__(self) -> str:
+        return f"SegmentIndex(<{len(self._paths)} paths, {self._count} segments>)"
+
+    def path(self, path_id: int) -> Path:
+        """Returns the path with the id"""
+        return self._paths[path_id]
+
+    def _add_path(self, path: Path) -> List[Union[_Node, _Entry]]:
+        """Adds a path, and returns the entries to put in the tree"""
+        path_id = self._next_id
+        self._next_id += 1
+        self._paths[path_id] = path
+        self._ids.setdefault(id(path), []).append(path_id)
+        # The path tells the index when its segments change
+        if path._indexes is None:
+            path._indexes = weakref.WeakSet()
+        path._indexes.add(self)
+        segments = path._segments
+        # The bounding boxes are cached by the path, and so only calculated once
+        boxes = path._calc_boxes()
+        entries = []
+        indexed: List[Union[_Node, _Entry]] = []
+        for index, (segment, box) in enumerate(zip(segments, boxes.values)):
+            assert box is not None
+            entry = _Entry(box, path_id, index)
+            entries.append(entry)
+            if not isinstance(segment, Move):
+                indexed.append(entry)
+        self._entries[path_id] = entries
+        self._count += len(indexed)
+        return indexed
+
+    def add(self, path: Path) -> int:
+        """Adds the segments of a path to the index, and returns its id"""
+        for entry in self._add_path(path):
+            assert isinstance(entry, _Entry)
+            self._insert(entry)
+        return self._next_id - 1
+
+    def remove(self, path_id: int) -> None:
+        """Removes the segments of a path from the index"""
+        for entry in self._entries.pop(path_id):
+            self._changed.discard(entry)
+            self._delete(entry)
+        path = self._paths.pop(path_id)
+        ids = self._ids[id(path)]
+        ids.remove(path_id)
+        if not ids:
+            del self._ids[id(path)]
+            assert path._indexes is not None
+            path._indexes.discard(self)
+
+    def insert(self, path_id: int, index: int) -> None:
+        """Indexes a segment inserted into a path with Path.insert()"""
+        entries = self._entries[path_id]
+        # Like list.insert()
+        if index < 0:
+            index = max(index + len(entries), 0)
+        index = min(index, len(entries))
+        entry = _Entry((0.0, 0.0, 0.0, 0.0), path_id, index)
+        entries.insert(index, entry)
+        for later in range(index + 1, len(entries)):
+            entries[later].index += 1
+        self._index(entry)
+
+    def delete(self, path_id: int, index: int) -> None:
+        """Removes a segment deleted from a path from the index"""
+        entries = self._entries[path_id]
+        index = range(len(entries))[index]
+        entry = entries.pop(index)
+        self._changed.discard(entry)
+        self._delete(entry)
+        for later in entries[index:]:
+            later.index -= 1
+
+    def replace(self, path_id: int, index: int) -> None:
+        """Indexes a segment again after it was replaced or changed"""
+        entries = self._entries[path_id]
+        entry = entries[range(len(entries))[index]]
+        self._changed.discard(entry)
+        self._delete(entry)
+        self._index(entry)
+
+    def _index(self, entry: _Entry) -> None:
+        """Puts an entry in the tree, unless its segment is a Move"""
+        segment = self._segment(entry)
+        if not isinstance(segment, Move):
+            entry.box = _segment_box(segment)
+            self._count += 1
+            self._insert(entry)
+
+    def _segment_changed(self, path: Path, positions: List[int]) -> None:
+        """Notes the entries of a segment that changed in a path"""
+        for path_id in self._ids.get(id(path), ()):
+            entries = self._entries[path_id]
+            for index in positions:
+                if index < len(entries):
+                    self._changed.add(entries[index])
+
+    def _refresh(self) -> None:
+        """Indexes the segments changed since the last query again"""
+        # In order, so the tree doesn't depend on where the entries are
+        changed = sorted(self._changed, key=lambda entry: (entry.path_id, entry.index))
+        for entry in changed:
+            self._delete(entry)
+            self._index(entry)
+        self._changed.clear()
+
+    def _segment(self, entry: _Entry) -> PathSegment:
+        return self._paths[entry.path_id]._segments[entry.index]
+
+    def _insert(self, entry: _Entry) -> None:
+        """Inserts an entry in the leaf whose box grows the least"""
+        box = entry.box
+        node = self._root
+        while not node.leaf:
+            best = None
+            for child in node.children:
+                assert isinstance(child, _Node) and child.box is not None
+                union = _box_union(child.box, box)
+                assert union is not None
+                key = (_area(union) - _area(child.box), _area(child.box))
+                if best is None or key < best[0]:
+                    best = key, child
+            assert best is not None
+            node = best[1]
+        node.children.append(entry)
+        entry.parent = node
+        parent: Union[_Node, None] = node
+        while parent is not None:
+            parent.box = _box_union(parent.box, box)
+            parent = parent.parent
+        while len(node.children) > self._capacity:
+            node = self._split(node)
+
+    def _split(self, node: _Node) -> _Node:
+        """Splits a node in two along its longer side, and returns the parent"""
+        box = node.box
+        assert box is not None
+        axis = 0 if box[2] - box[0] >= box[3] - box[1] else 1
+        children = sorted(node.children, key=lambda child: _center(child, axis))
+        half = len(children) // 2
+        sibling = _Node(children[half:], node.leaf)
+        node.children = children[:half]
+        node.box = _union(node.children)
+        parent = node.parent
+        if parent is None:
+            parent = self._root = _Node([node, sibling], leaf=False)
+        else:
+            parent.children.append(sibling)
+            sibling.parent = parent
+        return parent
+
+    def _delete(self, entry: _Entry) -> None:
+        """Removes an entry from the tree, and any nodes that become empty"""
+        node = entry.parent
+        if node is None:
+            return
+        node.children.remove(entry)
+        entry.parent = None
+        self._count -= 1
+        while not node.children and node.parent is not None:
+            node.parent.children.remove(node)
+            node = node.parent
+        parent: Union[_Node, None] = node
+        while parent is not None:
+            parent.box = _union(parent.children)
+            parent = parent.parent
+        while not self._root.leaf and len(self._root.children) == 1:
+            root = self._root.children[0]
+            assert isinstance(root, _Node)
+            root.parent = None
+            self._root = root
+
+    def query(self, box: Sequence[float]) -> List[Tuple[int, int]]:
+        """Returns the segments whose bounding boxes overlap a rectangle
+
+        The rectangle is in the format of [left, top, right, bottom], like
+        from boundingbox(). Returns the path id and the index in the path of
+        each segment, sorted.
+        """
+        self._refresh()
+        left, top, right, bottom = box
+        found = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            for child in node.children:
+                child_box = child.box
+                assert child_box is not None
+                if (
+                    child_box[0] <= right
+                    and child_box[2] >= left
+                    and child_box[1] <= bottom
+                    and child_box[3] >= top
+                ):
+                    if isinstance(child, _Entry):
+                        found.append((child.path_id, child.index))
+                    else:
+                        stack.append(child)
+        return sorted(found)
+
+    def query_radius(self, point: complex, radius: float) -> List[Tuple[int, int]]:
+        """Returns the segments that pass within a distance of a point
+
+        Only the segments whose bounding boxes are close enough are
+        measured, with closest_point(). Returns the path id and the index in
+        the path of each segment, sorted.
+        """
+        self._refresh()
+        found = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            for child in node.children:
+                assert child.box is not None
+                if _box_distance(child.box, point) > radius:
+                    continue
+                if isinstance(child, _Node):
+                    stack.append(child)
+                elif self._segment(child).closest_point(point)[2] <= radius:
+                    found.append((child.path_id, child.index))
+        return sorted(found)
+
+    def nearest(self, point: complex, count: int = 1) -> List[Tuple[int, int]]:
+        """Returns the segments nearest to a point, the nearest first
+
+        The nodes are searched in the order of the distance to their boxes,
+        and the distance to a segment is only measured when its box is the
+        nearest left, so the search stops when the segments found are nearer
+        than all the boxes. Returns the path id and the index in the path of
+        up to count segments.
+        """
+        self._refresh()
+        found: List[Tuple[int, int]] = []
+        # The distance, a tie breaker, whether the distance is measured, and
+        # the node or entry
+        queue: List[Tuple[float, int, bool, Union[_Node, _Entry]]] = []
+        if self._root.box is not None:
+            queue.append((_box_distance(self._root.box, point), 0, False, self._root))
+        counter = 1
+        while queue and len(found) < count:
+            distance, _, measured, item = heapq.heappop(queue)
+            if isinstance(item, _Node):
+                for child in item.children:
+                    assert child.box is not None
+                    distance = _box_distance(child.box, point)
+                    heapq.heappush(queue, (distance, counter, False, child))
+                    counter += 1
+            elif measured:
+                found.append((item.path_id, item.index))
+            else:
+                distance = self._segment(item).closest_point(point)[2]
+                heapq.heappush(queue, (distance, counter, True, item))
+                counter += 1
+        return found
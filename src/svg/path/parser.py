@@ -1,20 +1,52 @@
 # SVG Path specification parser
 
-from typing import Generator, Tuple, Union
+from array import array
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, compress, islice
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    FrozenSet,
+    Generator,
+    Iterable,
+    List,
+    NamedTuple,
+    Pattern,
+    Tuple,
+    Union,
+)
+import codecs
+import mmap
+import os
 import re
+import threading
 from svg.path import path
 
 COMMANDS = set("MmZzLlHhVvCcSsQqTtAa")
 UPPERCASE = set("MZLHVCSQTA")
 
 COMMAND_RE = re.compile(r"([MmZzLlHhVvCcSsQqTtAa])")
-FLOAT_RE = re.compile(rb"^[-+]?\d*\.?\d*(?:[eE][-+]?\d+)?")
+NUMBER_RE = re.compile(r"[-+]?\d*\.?\d*(?:[eE][-+]?\d+)?")
+# EBNF wsp:(#x20 | #x9 | #xD | #xA) + comma: 0x2C, between arguments
+SEPARATOR_RE = re.compile(r"[\s,]*")
+WHITESPACE_RE = re.compile(r"\s*")
+# Characters that can be a part of a number
+NUMBER_CHARACTERS = set("0123456789+-.eE")
+
+Token = Tuple[Union[str, complex, float, bool], ...]
 
 
 class InvalidPathError(ValueError):
     pass
 
 
+class _IncompletePathError(InvalidPathError):
+    """The path definition ended in the middle of a command"""
+
+
 # The argument sequences from the grammar, made sane.
 # u: Non-negative number
 # s: Signed number or coordinate
@@ -34,123 +66,421 @@ ARGUMENT_SEQUENCE = {
 }
 
 
-def strip_array(arg_array: bytearray) -> None:
-    """Strips whitespace and commas"""
-    # EBNF wsp:(#x20 | #x9 | #xD | #xA) + comma: 0x2C
-    while arg_array and arg_array[0] in (0x20, 0x9, 0xD, 0xA, 0x2C):
-        arg_array[0:1] = b""
+# A path definition can be a str, or any bytes-like object, which is then
+# scanned in place with bytes patterns.
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+PathDefinition = Union[str, Buffer]
+
+
+def _skip(pattern: "Pattern[Any]", pathdef: PathDefinition, pos: int) -> int:
+    match = pattern.match(pathdef, pos)
+    assert match is not None  # The patterns all match the empty string
+    return match.end()
+
 
+def _context(pathdef: PathDefinition, pos: int) -> str:
+    """The path definition from pos and a bit onwards, for error messages"""
+    end = pos + 20
+    context = pathdef[pos:end]
+    if isinstance(context, str):
+        return context
+    return bytes(context).decode("ascii", "replace")
 
-def pop_number(arg_array: bytearray) -> float:
-    res = FLOAT_RE.search(arg_array)
-    if not res or not res.group():
-        raise InvalidPathError(f"Expected a number, got '{arg_array}'.")
-    number = float(res.group())
-    start = res.start()
-    end = res.end()
-    arg_array[start:end] = b""
-    strip_array(arg_array)
 
-    return number
+class _Syntax:
+    """The patterns and characters of the grammar, as str or as bytes
 
+    Indexing a str gives a str, while indexing a bytes-like object gives an
+    int, so the commands and flags are looked up by whichever it is.
+    """
 
-def pop_unsigned_number(arg_array: bytearray) -> float:
-    number = pop_number(arg_array)
-    if number < 0:
-        raise InvalidPathError(f"Expected a non-negative number, got '{number}'.")
-    return number
+    def __init__(
+        self,
+        number_re: "Pattern[Any]",
+        separator_re: "Pattern[Any]",
+        whitespace_re: "Pattern[Any]",
+        move_re: "Pattern[Any]",
+        commands: Dict[Union[str, int], str],
+        flags: Dict[Union[str, int], bool],
+    ) -> None:
+        self.number_re = number_re
+        self.separator_re = separator_re
+        self.whitespace_re = whitespace_re
+        self.move_re = move_re
+        # The command letter, by character
+        self.commands = commands
+        self.flags = flags
+        self.readers: Dict[
+            str,
+            Callable[[PathDefinition, int], Tuple[Union[complex, float, bool], int]],
+        ] = {
+            "u": self.read_unsigned_number,
+            "s": self.read_number,
+            "c": self.read_coordinate_pair,
+            "f": self.read_flag,
+        }
 
+    # The readers below all take the path definition and a cursor position,
+    # and return the value read together with the position of the next
+    # argument. The definition itself is never modified or copied, so
+    # reading a long list of arguments is linear in the length of the list.
+
+    def read_number(self, pathdef: PathDefinition, pos: int) -> Tuple[float, int]:
+        match = self.number_re.match(pathdef, pos)
+        assert match is not None  # The pattern matches the empty string
+        end = match.end()
+        if pos == len(pathdef):
+            raise _IncompletePathError("Expected a number, got end of path.")
+        if end == pos:
+            raise InvalidPathError(
+                f"Expected a number, got '{_context(pathdef, pos)}'."
+            )
+        try:
+            number = float(match.group())
+        except ValueError as e:
+            # A lone sign or decimal point
+            raise InvalidPathError(
+                f"Expected a number, got '{_context(pathdef, pos)[:end - pos]}'."
+            ) from e
+        return number, _skip(self.separator_re, pathdef, end)
+
+    def read_unsigned_number(
+        self, pathdef: PathDefinition, pos: int
+    ) -> Tuple[float, int]:
+        number, pos = self.read_number(pathdef, pos)
+        if number < 0:
+            raise InvalidPathError(f"Expected a non-negative number, got '{number}'.")
+        return number, pos
+
+    def read_coordinate_pair(
+        self, pathdef: PathDefinition, pos: int
+    ) -> Tuple[complex, int]:
+        x, pos = self.read_number(pathdef, pos)
+        y, pos = self.read_number(pathdef, pos)
+        return complex(x, y), pos
+
+    def read_flag(self, pathdef: PathDefinition, pos: int) -> Tuple[bool, int]:
+        if pos == len(pathdef):
+            raise _IncompletePathError("Expected a flag, got end of path.")
+        flag = self.flags.get(pathdef[pos])
+        if flag is None:
+            raise InvalidPathError(
+                f"Expected a flag (0 or 1), got '{_context(pathdef, pos)[:1]}'."
+            )
+        return flag, _skip(self.separator_re, pathdef, pos + 1)
 
-def pop_coordinate_pair(arg_array: bytearray) -> complex:
-    x = pop_number(arg_array)
-    y = pop_number(arg_array)
-    return complex(x, y)
 
+# A Move command, and a Close command right before it
+MOVE_RE = re.compile(r"([Zz]\s*)?([Mm])")
 
-def pop_flag(arg_array: bytearray) -> Union[bool, None]:
-    flag = arg_array[0]
-    arg_array[0:1] = b""
-    strip_array(arg_array)
-    if flag == 48:  # ASCII 0
-        return False
-    if flag == 49:  # ASCII 1
-        return True
-    return None
+_TEXT = _Syntax(
+    NUMBER_RE,
+    SEPARATOR_RE,
+    WHITESPACE_RE,
+    MOVE_RE,
+    {command: command for command in COMMANDS},
+    {"0": False, "1": True},
+)
+_BINARY = _Syntax(
+    re.compile(NUMBER_RE.pattern.encode()),
+    re.compile(SEPARATOR_RE.pattern.encode()),
+    re.compile(WHITESPACE_RE.pattern.encode()),
+    re.compile(MOVE_RE.pattern.encode()),
+    {ord(command): command for command in COMMANDS},
+    {ord("0"): False, ord("1"): True},
+)
 
 
-FIELD_POPPERS = {
-    "u": pop_unsigned_number,
-    "s": pop_number,
-    "c": pop_coordinate_pair,
-    "f": pop_flag,
+def _syntax(pathdef: PathDefinition) -> _Syntax:
+    return _TEXT if isinstance(pathdef, str) else _BINARY
+
+
+def read_number(pathdef: PathDefinition, pos: int) -> Tuple[float, int]:
+    return _syntax(pathdef).read_number(pathdef, pos)
+
+
+def read_unsigned_number(pathdef: PathDefinition, pos: int) -> Tuple[float, int]:
+    return _syntax(pathdef).read_unsigned_number(pathdef, pos)
+
+
+def read_coordinate_pair(pathdef: PathDefinition, pos: int) -> Tuple[complex, int]:
+    return _syntax(pathdef).read_coordinate_pair(pathdef, pos)
+
+
+def read_flag(pathdef: PathDefinition, pos: int) -> Tuple[bool, int]:
+    return _syntax(pathdef).read_flag(pathdef, pos)
+
+
+FIELD_READERS: Dict[
+    str, Callable[[PathDefinition, int], Tuple[Union[complex, float, bool], int]]
+] = {
+    "u": read_unsigned_number,
+    "s": read_number,
+    "c": read_coordinate_pair,
+    "f": read_flag,
 }
 
 
-def _commandify_path(pathdef: str) -> Generator[Tuple[str, ...], None, None]:
-    """Splits path into commands and arguments"""
-    token: Union[Tuple[str, ...], None] = None
-    for x in COMMAND_RE.split(pathdef):
-        x = x.strip()
-        if x in COMMANDS:
-            if token is not None:
-                yield token
-            if x in ("z", "Z"):
-                # The end command takes no arguments, so add a blank one
-                token = (x, "")
+class _Tokenizer:
+    """Splits a path definition into one token per command
+
+    The tokenizer keeps the command whose arguments are being read between
+    calls to tokenize(), so a path definition can be tokenized piece by piece.
+    """
+
+    def __init__(self) -> None:
+        self.started = False
+        self.finished = False
+        self.command: Union[str, None] = None
+        self.implicit = False
+        # How far tokenize() got in the last path definition it was given
+        self.consumed = 0
+
+    def tokenize(
+        self, pathdef: PathDefinition, final: bool = True
+    ) -> Generator[Token, None, None]:
+        """Yields the tokens of a path definition, or part of one
+
+        This walks a cursor over the path definition once, so the time taken
+        is linear in the length of the path, no matter how many implicit
+        commands follow each command letter.
+
+        If final is False, the definition may end in the middle of a command.
+        That command is then left for the next call, and self.consumed is set
+        to where it starts in the definition.
+
+        The definition can be a str, or a bytes-like object such as bytes,
+        memoryview or mmap, which is read in place without being decoded.
+        """
+        if isinstance(pathdef, memoryview) and pathdef.format != "B":
+            pathdef = pathdef.cast("B")
+        syntax = _syntax(pathdef)
+        commands = syntax.commands
+        readers = syntax.readers
+        separator_re = syntax.separator_re
+        whitespace_re = syntax.whitespace_re
+        end = len(pathdef)
+        pos = 0
+        self.consumed = 0
+        while not self.finished:
+            command = self.command
+            if command is not None and self.implicit:
+                # Between arguments, that may have been split over two calls
+                pos = _skip(separator_re, pathdef, pos)
             else:
-                token = (x,)
-        elif x:
-            if token is None:
-                raise InvalidPathError(f"Path does not start with a command: {pathdef}")
-            token += (x,)
-    # Logically token cannot be None, but mypy cannot deduce this.
-    if token is not None:
-        yield token
-
-
-def _tokenize_path(
-    pathdef: str,
-) -> Generator[Tuple[Union[str, complex, float, bool, None], ...], None, None]:
-    for command, args in _commandify_path(pathdef):
-        # Shortcut this for the close command, that doesn't have arguments:
-        if command in ("z", "Z"):
-            yield (command,)
-            continue
+                pos = _skip(whitespace_re, pathdef, pos)
 
-        # For the rest of the commands, we parse the arguments and
-        # yield one command per full set of arguments
-        arg_sequence = ARGUMENT_SEQUENCE[command.upper()]
-        arguments = bytearray(args, "ascii")
-        implicit = False
-        while arguments:
-            command_arguments = []
-            for i, arg in enumerate(arg_sequence):
+            if command is None:
+                # Expecting a command
+                self.consumed = pos
+                if pos == end:
+                    break
+                command = commands.get(pathdef[pos])
+                if command is None:
+                    if not self.started:
+                        raise InvalidPathError(
+                            "Path does not start with a command: "
+                            f"{_context(pathdef, pos)}"
+                        )
+                    raise InvalidPathError(
+                        f"Invalid path element {_context(pathdef, pos)}"
+                    )
+                self.started = True
+                pos += 1
+                self.consumed = pos
+                if command in ("z", "Z"):
+                    # The close command doesn't have arguments
+                    yield (command,)
+                else:
+                    self.command = command
+                    self.implicit = False
+                continue
+
+            if pos == end and not final:
+                # Wait for more arguments
+                break
+
+            if pos == end or pathdef[pos] in commands:
+                if not self.implicit:
+                    raise InvalidPathError(
+                        f"Invalid path element {command}, missing arguments"
+                    )
+                self.command = None
+                continue
+
+            # Yield one command per full set of arguments
+            arg_start = pos
+            command_arguments: List[Union[complex, float, bool]] = []
+            for i, arg in enumerate(ARGUMENT_SEQUENCE[command.upper()]):
                 try:
-                    command_arguments.append(FIELD_POPPERS[arg](arguments))
+                    value, pos = readers[arg](pathdef, pos)
                 except InvalidPathError as e:
-                    if i == 0 and implicit:
-                        return  # Invalid character in path, treat like a comment
+                    if isinstance(e, _IncompletePathError) and not final:
+                        # Wait for the rest of the arguments
+                        return
+                    if i == 0 and self.implicit:
+                        # Invalid character in path, treat like a comment
+                        self.finished = True
+                        return
                     raise InvalidPathError(
-                        f"Invalid path element {command} {args}"
+                        f"Invalid path element {command} {_context(pathdef, arg_start)}"
                     ) from e
+                command_arguments.append(value)
 
+            self.consumed = pos
             yield (command,) + tuple(command_arguments)
-            implicit = True
+            self.implicit = True
 
             # Implicit Moveto commands should be treated as Lineto commands.
             if command == "m":
-                command = "l"
+                self.command = "l"
             elif command == "M":
-                command = "L"
+                self.command = "L"
+
+
+def _tokenize_path(pathdef: PathDefinition) -> Generator[Token, None, None]:
+    yield from _Tokenizer().tokenize(pathdef)
+
+
+class PathParser:
+    """An incremental path parser
+
+    Path definitions can be fed to the parser in chunks of str or bytes,
+    and the segments are returned as soon as each command is complete::
+
+        parser = PathParser()
+        for chunk in chunks:
+            for segment in parser.feed(chunk):
+                ...
+        for segment in parser.close():
+            ...
+
+    Only the incomplete command at the end of each chunk is kept between
+    calls, so the memory used depends on the chunk size, not on the size of
+    the path definition.
+    """
+
+    def __init__(self) -> None:
+        self._tokenizer = _Tokenizer()
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._segments: List[path.PathSegment] = []
+        self._current_pos = 0j
+        self._start_pos: Union[complex, None] = None
+        self._last_command = "No last command"
+        # The control point that the next S or T command reflects
+        self._last_control = 0j
+
+    def feed(self, data: Union[str, bytes]) -> List[path.PathSegment]:
+        """Parses a chunk of a path definition
+
+        Returns the segments for all commands that are complete so far.
+        """
+        if self._tokenizer.finished:
+            # The rest of the path definition is ignored, like a comment
+            return []
+        if isinstance(data, bytes):
+            data = self._decoder.decode(data)
+        buffer = self._buffer + data
+
+        # A number can continue in the next chunk, so only the path up to
+        # the last character that can't be a part of a number can be
+        # tokenized now.
+        end = len(buffer)
+        while end and buffer[end - 1] in NUMBER_CHARACTERS:
+            end -= 1
+        segments = self._parse(buffer[:end], final=False)
+        if self._tokenizer.finished:
+            self._buffer = ""
+        else:
+            consumed = self._tokenizer.consumed
+            self._buffer = buffer[consumed:]
+        return segments
+
+    def close(self) -> List[path.PathSegment]:
+        """Parses what is left of the path definition
 
+        Returns the segments for the remaining commands.
+        """
+        buffer = self._buffer + self._decoder.decode(b"", final=True)
+        self._buffer = ""
+        return self._parse(buffer, final=True)
 
-def parse_path(pathdef: str) -> path.Path:
-    segments = path.Path()
-    start_pos = None
-    last_command = "No last command"
-    current_pos = 0j
+    def _parse(self, pathdef: PathDefinition, final: bool) -> List[path.PathSegment]:
+        for token in self._tokenizer.tokenize(pathdef, final=final):
+            self._command(token)
+        segments = self._segments
+        self._segments = []
+        return segments
+
+    # The methods that add the segments. Subclasses can override these to
+    # store the segments in some other way than as segment objects.
+
+    def _add_move(self, to: complex, relative: bool) -> None:
+        self._segments.append(path.Move(to, relative=relative))
+
+    def _add_close(self, start: complex, end: complex, relative: bool) -> None:
+        self._segments.append(path.Close(start, end, relative=relative))
+
+    def _add_line(
+        self,
+        start: complex,
+        end: complex,
+        relative: bool,
+        vertical: bool = False,
+        horizontal: bool = False,
+    ) -> None:
+        self._segments.append(
+            path.Line(
+                start, end, relative=relative, vertical=vertical, horizontal=horizontal
+            )
+        )
+
+    def _add_cubic(
+        self,
+        start: complex,
+        control1: complex,
+        control2: complex,
+        end: complex,
+        relative: bool,
+        smooth: bool = False,
+    ) -> None:
+        self._segments.append(
+            path.CubicBezier(
+                start, control1, control2, end, relative=relative, smooth=smooth
+            )
+        )
+
+    def _add_quadratic(
+        self,
+        start: complex,
+        control: complex,
+        end: complex,
+        relative: bool,
+        smooth: bool = False,
+    ) -> None:
+        self._segments.append(
+            path.QuadraticBezier(start, control, end, relative=relative, smooth=smooth)
+        )
+
+    def _add_arc(
+        self,
+        start: complex,
+        radius: complex,
+        rotation: float,
+        arc: bool,
+        sweep: bool,
+        end: complex,
+        relative: bool,
+    ) -> None:
+        self._segments.append(
+            path.Arc(start, radius, rotation, arc, sweep, end, relative=relative)
+        )
+
+    def _command(self, token: Token) -> None:
+        current_pos = self._current_pos
+        start_pos = self._start_pos
 
-    for token in _tokenize_path(pathdef):
         command = token[0]
         assert isinstance(command, str)
         relative = command.islower()
@@ -162,14 +492,15 @@ def parse_path(pathdef: str) -> path.Path:
                 current_pos += pos
             else:
                 current_pos = pos
-            segments.append(path.Move(current_pos, relative=relative))
+            self._add_move(current_pos, relative)
             start_pos = current_pos
 
         elif command == "Z":
             # For Close commands the "relative" argument just preserves case,
             # it has no different in behavior.
-            assert isinstance(start_pos, complex)
-            segments.append(path.Close(current_pos, start_pos, relative=relative))
+            if start_pos is None:
+                raise InvalidPathError("Close command before the first Move command")
+            self._add_close(current_pos, start_pos, relative)
             current_pos = start_pos
 
         elif command == "L":
@@ -177,7 +508,7 @@ def parse_path(pathdef: str) -> path.Path:
             assert isinstance(pos, complex)
             if relative:
                 pos += current_pos
-            segments.append(path.Line(current_pos, pos, relative=relative))
+            self._add_line(current_pos, pos, relative)
             current_pos = pos
 
         elif command == "H":
@@ -186,9 +517,7 @@ def parse_path(pathdef: str) -> path.Path:
             if relative:
                 hpos += current_pos.real
             pos = complex(hpos, current_pos.imag)
-            segments.append(
-                path.Line(current_pos, pos, relative=relative, horizontal=True)
-            )
+            self._add_line(current_pos, pos, relative, horizontal=True)
             current_pos = pos
 
         elif command == "V":
@@ -197,9 +526,7 @@ def parse_path(pathdef: str) -> path.Path:
             if relative:
                 vpos += current_pos.imag
             pos = complex(current_pos.real, vpos)
-            segments.append(
-                path.Line(current_pos, pos, relative=relative, vertical=True)
-            )
+            self._add_line(current_pos, pos, relative, vertical=True)
             current_pos = pos
 
         elif command == "C":
@@ -215,11 +542,8 @@ def parse_path(pathdef: str) -> path.Path:
                 control2 += current_pos
                 end += current_pos
 
-            segments.append(
-                path.CubicBezier(
-                    current_pos, control1, control2, end, relative=relative
-                )
-            )
+            self._add_cubic(current_pos, control1, control2, end, relative)
+            self._last_control = control2
             current_pos = end
 
         elif command == "S":
@@ -234,23 +558,19 @@ def parse_path(pathdef: str) -> path.Path:
                 control2 += current_pos
                 end += current_pos
 
-            if last_command in "CS":
+            if self._last_command in "CS":
                 # The first control point is assumed to be the reflection of
                 # the second control point on the previous command relative
                 # to the current point.
-                assert isinstance(segments[-1], path.CubicBezier)
-                control1 = current_pos + current_pos - segments[-1].control2
+                control1 = current_pos + current_pos - self._last_control
             else:
                 # If there is no previous command or if the previous command
                 # was not an C, c, S or s, assume the first control point is
                 # coincident with the current point.
                 control1 = current_pos
 
-            segments.append(
-                path.CubicBezier(
-                    current_pos, control1, control2, end, relative=relative, smooth=True
-                )
-            )
+            self._add_cubic(current_pos, control1, control2, end, relative, smooth=True)
+            self._last_control = control2
             current_pos = end
 
         elif command == "Q":
@@ -263,9 +583,8 @@ def parse_path(pathdef: str) -> path.Path:
                 control += current_pos
                 end += current_pos
 
-            segments.append(
-                path.QuadraticBezier(current_pos, control, end, relative=relative)
-            )
+            self._add_quadratic(current_pos, control, end, relative)
+            self._last_control = control
             current_pos = end
 
         elif command == "T":
@@ -277,23 +596,19 @@ def parse_path(pathdef: str) -> path.Path:
             if relative:
                 end += current_pos
 
-            if last_command in "QT":
+            if self._last_command in "QT":
                 # The control point is assumed to be the reflection of
                 # the control point on the previous command relative
                 # to the current point.
-                assert isinstance(segments[-1], path.QuadraticBezier)
-                control = current_pos + current_pos - segments[-1].control
+                control = current_pos + current_pos - self._last_control
             else:
                 # If there is no previous command or if the previous command
                 # was not an Q, q, T or t, assume the first control point is
                 # coincident with the current point.
                 control = current_pos
 
-            segments.append(
-                path.QuadraticBezier(
-                    current_pos, control, end, smooth=True, relative=relative
-                )
-            )
+            self._add_quadratic(current_pos, control, end, relative, smooth=True)
+            self._last_control = control
             current_pos = end
 
         elif command == "A":
@@ -305,23 +620,735 @@ def parse_path(pathdef: str) -> path.Path:
             rotation = token[3]
             assert isinstance(rotation, float)
             arc = token[4]
-            assert isinstance(arc, (bool, int))
+            assert isinstance(arc, bool)
             sweep = token[5]
-            assert isinstance(sweep, (bool, int))
+            assert isinstance(sweep, bool)
             end = token[6]
             assert isinstance(end, complex)
 
             if relative:
                 end += current_pos
 
-            segments.append(
-                path.Arc(
-                    current_pos, radius, rotation, arc, sweep, end, relative=relative
+            self._add_arc(current_pos, radius, rotation, arc, sweep, end, relative)
+            current_pos = end
+
+        # Keep the state for the next command
+        self._current_pos = current_pos
+        self._start_pos = start_pos
+        self._last_command = command
+
+
+def iterparse_path(
+    chunks: Iterable[Union[str, bytes]],
+) -> Generator[path.PathSegment, None, None]:
+    """Parses a path definition given in chunks, yielding each segment"""
+    parser = PathParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+def _parse_segments(pathdef: PathDefinition) -> List[path.PathSegment]:
+    return PathParser()._parse(pathdef, final=True)
+
+
+# Segment kind codes, for the compact forms of paths
+MOVE = 0
+LINE = 1
+CUBIC = 2
+QUADRATIC = 3
+ARC = 4
+CLOSE = 5
+
+# Flag bits
+RELATIVE = 1
+SMOOTH = 2
+HORIZONTAL = 4
+VERTICAL = 8
+LARGE_ARC = 16
+SWEEP = 32
+
+
+class _PackedPaths:
+    """Paths packed into flat arrays, to send them between processes
+
+    Each segment has a kind and a set of flags, one byte each, and its
+    points as floats. This pickles to a small fraction of the size of the
+    segment objects, and much faster.
+    """
+
+    def __init__(self) -> None:
+        self.kinds = bytearray()
+        self.flags = bytearray()
+        self.values = array("d")
+        # The number of segments so far at the end of each path
+        self.ends = array("q")
+
+    def add_path(self, pathdef: PathDefinition, start: complex = 0j) -> bool:
+        """Parses a path definition into the packed paths
+
+        The path starts at start instead of at the origin, for a path
+        definition that was split off a larger one at a Move command.
+        Returns True if parsing stopped at an invalid character, which
+        the grammar treats as a comment running to the end of the path.
+        """
+        parser = _PackingParser(self)
+        parser._current_pos = start
+        parser._parse(pathdef, final=True)
+        self.ends.append(len(self.kinds))
+        return parser._tokenizer.finished
+
+    def add(self, kind: int, flags: int, *points: complex) -> None:
+        self.kinds.append(kind)
+        self.flags.append(flags)
+        values = self.values
+        for point in points:
+            values.append(point.real)
+            values.append(point.imag)
+
+    def unpack(self) -> List[path.Path]:
+        segments = self.segments()
+        paths = []
+        start = 0
+        for end in self.ends:
+            paths.append(path.Path(*segments[start:end]))
+            start = end
+        return paths
+
+    def segments(self) -> List[path.PathSegment]:
+        segments: List[path.PathSegment] = []
+        append = segments.append
+        values = self.values
+        i = 0
+        for kind, flags in zip(self.kinds, self.flags):
+            relative = bool(flags & RELATIVE)
+            start = complex(values[i], values[i + 1])
+            if kind == MOVE:
+                append(path.Move(start, relative=relative))
+                i += 2
+                continue
+            if kind == ARC:
+                radius = complex(values[i + 2], values[i + 3])
+                end = complex(values[i + 4], values[i + 5])
+                rotation = values[i + 6]
+                append(
+                    path.Arc(
+                        start,
+                        radius,
+                        rotation,
+                        bool(flags & LARGE_ARC),
+                        bool(flags & SWEEP),
+                        end,
+                        relative=relative,
+                    )
                 )
+                i += 7
+                continue
+            second = complex(values[i + 2], values[i + 3])
+            if kind == LINE:
+                append(
+                    path.Line(
+                        start,
+                        second,
+                        relative=relative,
+                        vertical=bool(flags & VERTICAL),
+                        horizontal=bool(flags & HORIZONTAL),
+                    )
+                )
+                i += 4
+            elif kind == CLOSE:
+                append(path.Close(start, second, relative=relative))
+                i += 4
+            elif kind == QUADRATIC:
+                end = complex(values[i + 4], values[i + 5])
+                append(
+                    path.QuadraticBezier(
+                        start,
+                        second,
+                        end,
+                        relative=relative,
+                        smooth=bool(flags & SMOOTH),
+                    )
+                )
+                i += 6
+            else:
+                control2 = complex(values[i + 4], values[i + 5])
+                end = complex(values[i + 6], values[i + 7])
+                append(
+                    path.CubicBezier(
+                        start,
+                        second,
+                        control2,
+                        end,
+                        relative=relative,
+                        smooth=bool(flags & SMOOTH),
+                    )
+                )
+                i += 8
+        return segments
+
+
+class _PackingParser(PathParser):
+    """A parser that packs the segments instead of making segment objects"""
+
+    def __init__(self, packed: _PackedPaths) -> None:
+        super().__init__()
+        self.packed = packed
+
+    def _add_move(self, to: complex, relative: bool) -> None:
+        self.packed.add(MOVE, RELATIVE if relative else 0, to)
+
+    def _add_close(self, start: complex, end: complex, relative: bool) -> None:
+        self.packed.add(CLOSE, RELATIVE if relative else 0, start, end)
+
+    def _add_line(
+        self,
+        start: complex,
+        end: complex,
+        relative: bool,
+        vertical: bool = False,
+        horizontal: bool = False,
+    ) -> None:
+        flags = RELATIVE if relative else 0
+        if horizontal:
+            flags |= HORIZONTAL
+        if vertical:
+            flags |= VERTICAL
+        self.packed.add(LINE, flags, start, end)
+
+    def _add_cubic(
+        self,
+        start: complex,
+        control1: complex,
+        control2: complex,
+        end: complex,
+        relative: bool,
+        smooth: bool = False,
+    ) -> None:
+        flags = (RELATIVE if relative else 0) | (SMOOTH if smooth else 0)
+        self.packed.add(CUBIC, flags, start, control1, control2, end)
+
+    def _add_quadratic(
+        self,
+        start: complex,
+        control: complex,
+        end: complex,
+        relative: bool,
+        smooth: bool = False,
+    ) -> None:
+        flags = (RELATIVE if relative else 0) | (SMOOTH if smooth else 0)
+        self.packed.add(QUADRATIC, flags, start, control, end)
+
+    def _add_arc(
+        self,
+        start: complex,
+        radius: complex,
+        rotation: float,
+        arc: bool,
+        sweep: bool,
+        end: complex,
+        relative: bool,
+    ) -> None:
+        flags = RELATIVE if relative else 0
+        if arc:
+            flags |= LARGE_ARC
+        if sweep:
+            flags |= SWEEP
+        self.packed.add(ARC, flags, start, radius, end)
+        self.packed.values.append(rotation)
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class PathCache:
+    """A thread-safe LRU cache of parsed path definitions
+
+    The paths returned share the segments with the cache, but a segment is
+    copied before the path hands it out, so changing a path, or the segments
+    you get from it, doesn't change the cache or the other paths.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        if maxsize < 1:
+            raise ValueError("The maximum size of the cache must be at least 1")
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._paths: OrderedDict[
+            Union[str, bytes], Tuple[Tuple[path.PathSegment, ...], FrozenSet[int]]
+        ] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def parse(self, pathdef: Union[str, bytes]) -> path.Path:
+        with self._lock:
+            entry = self._paths.get(pathdef)
+            if entry is not None:
+                self._paths.move_to_end(pathdef)
+                self._hits += 1
+
+        if entry is None:
+            # Parse without holding the lock, so other threads aren't blocked
+            segments = tuple(_parse_segments(pathdef))
+            entry = (segments, frozenset(id(each) for each in segments))
+            with self._lock:
+                self._misses += 1
+                self._paths[pathdef] = entry
+                self._paths.move_to_end(pathdef)
+                while len(self._paths) > self.maxsize:
+                    self._paths.popitem(last=False)
+                    self._evictions += 1
+
+        return path.Path._from_shared(*entry)
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(
+                self._hits,
+                self._misses,
+                self._evictions,
+                self.maxsize,
+                len(self._paths),
             )
-            current_pos = end
 
-        # Finish up the loop in preparation for next command
-        last_command = command
+    def clear(self) -> None:
+        """Empties the cache and resets the statistics"""
+        with self._lock:
+            self._paths.clear()
+            self._hits = self._misses = self._evictions = 0
+
+
+# The cache used by parse_path(), if enabled
+_cache: Union[PathCache, None] = None
+
+
+def enable_cache(maxsize: int = 1024) -> PathCache:
+    """Makes parse_path() cache the paths of the last maxsize path definitions
+
+    Returns the cache, which also has the statistics.
+    """
+    global _cache
+    _cache = PathCache(maxsize)
+    return _cache
+
+
+def disable_cache() -> None:
+    global _cache
+    _cache = None
+
+
+def cache_info() -> Union[CacheInfo, None]:
+    """The statistics of the parse_path() cache, or None if it's not enabled"""
+    cache = _cache
+    if cache is None:
+        return None
+    return cache.info()
+
+
+def parse_path(pathdef: PathDefinition, workers: int = 1) -> path.Path:
+    """Parses a path definition into a Path
+
+    The definition can be a str, or a bytes-like object such as bytes,
+    memoryview or mmap, which is scanned in place without being decoded.
+
+    With more than one worker, a large path definition is split into parts
+    at Move commands, and the parts are parsed in a pool of that many
+    processes. The result is the same as parsing it in one go.
+    """
+    if workers > 1:
+        return _parse_parallel(pathdef, workers)
+    cache = _cache
+    if cache is not None and isinstance(pathdef, (str, bytes)):
+        # Mutable definitions can change, so they are never cached
+        return cache.parse(pathdef)
+    return path.Path(*_parse_segments(pathdef))
+
+
+def _parse_packed(pathdefs: Iterable[Union[str, bytes]]) -> _PackedPaths:
+    packed = _PackedPaths()
+    for pathdef in pathdefs:
+        packed.add_path(pathdef)
+    return packed
+
+
+def parse_paths(
+    pathdefs: Iterable[Union[str, bytes]],
+    workers: Union[int, None] = None,
+    chunksize: int = 256,
+) -> List[path.Path]:
+    """Parses many path definitions, spread over a pool of processes
+
+    The path definitions are sent to the worker processes in chunks of
+    chunksize, and the paths come back packed into flat arrays, which
+    pickle much faster than the segments. The paths are returned in the
+    same order as the definitions. workers is the number of processes,
+    by default one per CPU. With a single worker, the paths are parsed in
+    this process.
+
+    As the worker processes may import the module that calls this, that
+    call must be guarded by ``if __name__ == "__main__"`` in scripts.
+    """
+    if chunksize < 1:
+        raise ValueError("The chunk size must be at least 1")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        return [parse_path(pathdef) for pathdef in pathdefs]
+
+    iterator = iter(pathdefs)
+    chunks = iter(lambda: list(islice(iterator, chunksize)), [])
+    paths: List[path.Path] = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for packed in executor.map(_parse_packed, chunks):
+            paths.extend(packed.unpack())
+    return paths
+
+
+def _split_at_moves(pathdef: PathDefinition, parts: int) -> List[Tuple[int, complex]]:
+    """Finds where to split a path definition, to parse the parts separately
+
+    A part can start at an absolute Move command, as that sets the current
+    position. It can also start at a relative Move command right after a
+    Close command, as the current position is then the start of the previous
+    subpath. Reading the first coordinate pair of each Move command is
+    enough to follow those starts from one subpath to the next.
+
+    Returns where each part starts in the definition, and the current
+    position there, aiming for parts of about the same length.
+    """
+    syntax = _syntax(pathdef)
+    size = len(pathdef)
+    first_command = _skip(syntax.whitespace_re, pathdef, 0)
+    splits = [(0, 0j)]
+    # The start of the current subpath, if it's known
+    subpath_start: Union[complex, None] = None
+    for match in syntax.move_re.finditer(pathdef):
+        pos = match.start(2)
+        try:
+            offset: Union[complex, None] = syntax.read_coordinate_pair(
+                pathdef, _skip(syntax.whitespace_re, pathdef, pos + 1)
+            )[0]
+        except InvalidPathError:
+            offset = None
+
+        # The current position right before the Move command, if it matters
+        current: Union[complex, None] = None
+        if match.group(2) in ("M", b"M") or pos == first_command:
+            current = 0j
+        elif match.group(1) is not None:
+            current = subpath_start
+
+        if offset is None or current is None:
+            subpath_start = None
+        elif match.group(2) in ("M", b"M"):
+            subpath_start = offset
+        else:
+            subpath_start = current + offset
+
+        if current is not None and pos >= len(splits) * size / parts:
+            splits.append((pos, current))
+    return splits
+
+
+def _parse_part(pathdef: PathDefinition, start: complex) -> Tuple[_PackedPaths, bool]:
+    packed = _PackedPaths()
+    finished = packed.add_path(pathdef, start)
+    return packed, finished
+
+
+def _parse_parallel(pathdef: PathDefinition, workers: int) -> path.Path:
+    # A few parts per worker, to even out the differences between them
+    splits = _split_at_moves(pathdef, workers * 4)
+    if len(splits) == 1:
+        return path.Path(*_parse_segments(pathdef))
+
+    ends = [pos for pos, _ in splits[1:]] + [len(pathdef)]
+    parts: List[Union[str, bytes]] = []
+    for (pos, _), end in zip(splits, ends):
+        part = pathdef[pos:end]
+        # Only str and bytes can be sent to the workers
+        parts.append(part if isinstance(part, (str, bytes)) else bytes(part))
+
+    segments: List[path.PathSegment] = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        starts = [start for _, start in splits]
+        for packed, finished in executor.map(_parse_part, parts, starts):
+            segments.extend(packed.segments())
+            if finished:
+                # The rest of the path definition is treated as a comment
+                break
+    return path.Path(*segments)
+
+
+class PathValidation(NamedTuple):
+    """The result of validate_path()
+
+    * ``offset``: The position of the first error in the path definition,
+      or None if the path definition is valid.
+    * ``message``: A description of the error, or None.
+    * ``counts``: How many segments of each type parse_path() makes from the
+      path definition, up to the error. The keys are the class names.
+    """
+
+    offset: Union[int, None]
+    message: Union[str, None]
+    counts: Dict[str, int]
+
+    @property
+    def valid(self) -> bool:
+        return self.offset is None
+
+
+# Regular expressions that match a full set of arguments for each command,
+# trailing separators included. A number must match everything that
+# read_number() would read, or backtracking could for example split "12"
+# into the two numbers "1" and "2", hence the lookaheads.
+_DIGITS = r"(?:\d+(?:\.\d*(?!\d)|(?![\d.]))|\.\d+(?!\d))"
+_ZERO = r"(?:0+(?:\.0*(?!\d)|(?![\d.]))|\.0+(?!\d))"
+_EXPONENT = r"(?:[eE][-+]?\d+(?!\d))?"
+_SEPARATOR = SEPARATOR_RE.pattern
+_FIELD_PATTERNS = {
+    # A radius may be minus zero, but nothing below that. Anything rarer
+    # is left to read_unsigned_number().
+    "u": rf"(?:\+?{_DIGITS}|-{_ZERO}){_EXPONENT}{_SEPARATOR}",
+    "s": rf"[-+]?{_DIGITS}{_EXPONENT}{_SEPARATOR}",
+    "c": rf"(?:[-+]?{_DIGITS}{_EXPONENT}{_SEPARATOR}){{2}}",
+    "f": rf"[01]{_SEPARATOR}",
+}
+_ARGUMENTS = {
+    command: "".join(_FIELD_PATTERNS[arg] for arg in sequence)
+    for command, sequence in ARGUMENT_SEQUENCE.items()
+}
+_ARGUMENTS_RE = {
+    command: re.compile(pattern) for command, pattern in _ARGUMENTS.items()
+}
+# Matches as many sets of arguments as possible in one go
+_ARGUMENT_LIST_RE = {
+    command: re.compile(f"(?:{pattern})*") for command, pattern in _ARGUMENTS.items()
+}
+
+# For the quick check of path definitions that only have numbers, whitespace
+# and commas between the commands.
+_SIMPLE_PATH_RE = re.compile(r"[-+.0-9eE \t\r\n,MmZzLlHhVvCcSsQqTtAa]*")
+_COMMA_FIRST_RE = re.compile(r"[MmZzLlHhVvCcSsQqTtAa][ \t\r\n]*,")
+_DECIMALS_RE = re.compile(r"(\.\d*)(?=\.)")
+# How many numbers there are in each set of arguments
+_NUMBER_COUNTS = {
+    command: sum(2 if arg == "c" else 1 for arg in ARGUMENT_SEQUENCE[command.upper()])
+    for command in COMMANDS
+}
+_FLAGS = {"0", "1"}
+_ARCS = {"A", "a"}
+# Consumes an iterator in C
+_discard: Deque[float] = deque(maxlen=0)
+
+_SEGMENT_TYPES = {
+    "M": path.Move.__name__,
+    "Z": path.Close.__name__,
+    "L": path.Line.__name__,
+    "H": path.Line.__name__,
+    "V": path.Line.__name__,
+    "C": path.CubicBezier.__name__,
+    "S": path.CubicBezier.__name__,
+    "Q": path.QuadraticBezier.__name__,
+    "T": path.QuadraticBezier.__name__,
+    "A": path.Arc.__name__,
+}
+
+
+def _validate_simple_path(pathdef: str) -> Union[PathValidation, None]:
+    """Checks a path definition with a few passes over the whole string
+
+    Once the numbers are split apart by whitespace, splitting each list of
+    arguments gives one number per string, and float() checks them in C.
+    This handles most valid path definitions. It returns None for anything
+    else, like errors or flags without whitespace between them, which must
+    be read one argument at a time to find out what is wrong.
+    """
+    if _SIMPLE_PATH_RE.fullmatch(pathdef) is None:
+        return None
+    start = pathdef.lstrip(" \t\r\n")[:1]
+    if start and start not in COMMANDS:
+        return None
+    if "," in pathdef:
+        if _COMMA_FIRST_RE.search(pathdef) is not None:
+            # Commas are only allowed between arguments
+            return None
+        pathdef = pathdef.replace(",", " ")
+    # A sign starts a new number, unless it's the sign of an exponent
+    for sign in "-+":
+        if sign in pathdef:
+            pathdef = pathdef.replace(sign, " " + sign)
+            pathdef = pathdef.replace("e " + sign, "e" + sign)
+            pathdef = pathdef.replace("E " + sign, "E" + sign)
+    result = _count_simple_arguments(pathdef)
+    if result is None and "." in pathdef:
+        # So does a second decimal point
+        result = _count_simple_arguments(_DECIMALS_RE.sub(r"\1 ", pathdef))
+    return result
+
+
+def _count_simple_arguments(pathdef: str) -> Union[PathValidation, None]:
+    """Counts the segments, if all numbers are separated by whitespace"""
+    parts = COMMAND_RE.split(pathdef)
+    commands = parts[1::2]
+    arguments = list(map(str.split, parts[2::2]))
+    try:
+        _discard.extend(map(float, chain.from_iterable(arguments)))
+    except ValueError:
+        return None
+
+    # There are usually only a few different commands and argument counts,
+    # so check those instead of each command.
+    counts: Dict[str, int] = {}
+    for (command, numbers), repeats in Counter(
+        zip(commands, map(len, arguments))
+    ).items():
+        per_set = _NUMBER_COUNTS[command]
+        if per_set:
+            sets, remainder = divmod(numbers, per_set)
+            if remainder or not sets:
+                return None
+        elif numbers:
+            return None
+        else:
+            sets = 1
+        segment_type = _SEGMENT_TYPES[command.upper()]
+        if command in "Mm":
+            # Implicit Moveto commands are Lineto commands.
+            counts[segment_type] = counts.get(segment_type, 0) + repeats
+            segment_type = path.Line.__name__
+            sets -= 1
+        counts[segment_type] = counts.get(segment_type, 0) + sets * repeats
+
+    first_close = min(_index(commands, "Z"), _index(commands, "z"))
+    if first_close < min(_index(commands, "M"), _index(commands, "m")):
+        return None
+
+    arcs = list(
+        chain.from_iterable(compress(arguments, map(_ARCS.__contains__, commands)))
+    )
+    if not _FLAGS.issuperset(arcs[3::7]) or not _FLAGS.issuperset(arcs[4::7]):
+        return None
+    if "-" in "".join(arcs[0::7] + arcs[1::7]):
+        return None
+
+    return PathValidation(None, None, {k: v for k, v in counts.items() if v})
+
+
+def _index(commands: List[str], command: str) -> int:
+    try:
+        return commands.index(command)
+    except ValueError:
+        return len(commands)
+
+
+def _read_arguments(
+    pathdef: str, pos: int, command: str
+) -> Tuple[int, int, Union[str, None]]:
+    """Reads one set of arguments with the field readers
+
+    Returns the index of the field with an error, the position of the error
+    and the error message. If there is no error, the message is None and the
+    position is that of the next set of arguments.
+    """
+    for field, arg in enumerate(ARGUMENT_SEQUENCE[command]):
+        readers = (read_number, read_number) if arg == "c" else (FIELD_READERS[arg],)
+        for reader in readers:
+            try:
+                _, next_pos = reader(pathdef, pos)
+            except InvalidPathError as e:
+                return field, pos, str(e)
+            pos = next_pos
+    return 0, pos, None
+
+
+def _count_arguments(
+    pathdef: str, pos: int, command: str
+) -> Tuple[int, int, Union[str, None]]:
+    """Counts the sets of arguments of a command
+
+    Returns the number of sets of arguments, where the next command starts
+    and None, or, if the arguments are invalid, the number of valid sets,
+    where the error is and the error message.
+    """
+    end = len(pathdef)
+    argument_list = _ARGUMENT_LIST_RE[command].match
+    arguments = _ARGUMENTS_RE[command].findall
+    sets = 0
+    while True:
+        match = argument_list(pathdef, pos)
+        assert match is not None  # The pattern matches the empty string
+        if match.end() != pos:
+            sets += len(arguments(pathdef, pos, match.end()))
+            pos = match.end()
+        if pos == end or pathdef[pos] in COMMANDS:
+            if not sets:
+                return 0, pos, f"Invalid path element {command}, missing arguments"
+            return sets, pos, None
+
+        # Something the regular expressions don't handle, like a negative
+        # radius or an error, so let the readers have a go.
+        field, pos, message = _read_arguments(pathdef, pos, command)
+        if message is None:
+            sets += 1
+        elif sets and field == 0:
+            # Invalid character in path, treated like a comment, so the rest
+            # of the path definition is ignored.
+            return sets, end, None
+        else:
+            return sets, pos, f"Invalid path element {command}: {message}"
+
+
+def validate_path(pathdef: str) -> PathValidation:
+    """Checks a path definition without parsing it into segments
+
+    This follows the same grammar as parse_path(), so parse_path() raises an
+    InvalidPathError exactly when the result isn't valid. No segments are
+    made, and in most path definitions whole lists of arguments are checked
+    at once, so this is much faster than parsing.
+    """
+    result = _validate_simple_path(pathdef)
+    if result is not None:
+        return result
+
+    counts: Dict[str, int] = {}
+    end = len(pathdef)
+    pos = _skip(WHITESPACE_RE, pathdef, 0)
+    while pos < end:
+        command = pathdef[pos]
+        if command not in COMMANDS:
+            if counts:
+                error = f"Invalid path element {_context(pathdef, pos)}"
+            else:
+                error = "Path does not start with a command"
+            return PathValidation(pos, error, counts)
+        command = command.upper()
+        if command == "Z":
+            if path.Move.__name__ not in counts:
+                error = "Close command before the first Move command"
+                return PathValidation(pos, error, counts)
+            counts[path.Close.__name__] = counts.get(path.Close.__name__, 0) + 1
+            pos = _skip(WHITESPACE_RE, pathdef, pos + 1)
+            continue
+
+        pos = _skip(WHITESPACE_RE, pathdef, pos + 1)
+        sets, pos, message = _count_arguments(pathdef, pos, command)
+        segment_type = _SEGMENT_TYPES[command]
+        if command == "M" and sets:
+            # Implicit Moveto commands are Lineto commands.
+            counts[segment_type] = counts.get(segment_type, 0) + 1
+            segment_type = path.Line.__name__
+            sets -= 1
+        if sets:
+            counts[segment_type] = counts.get(segment_type, 0) + sets
+        if message is not None:
+            return PathValidation(pos, message, counts)
 
-    return segments
+    return PathValidation(None, None, counts)
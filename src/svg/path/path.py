@@ -1,17 +1,101 @@
 from __future__ import annotations
-from math import sqrt, cos, sin, acos, degrees, radians, log, pi
-from typing import overload, Iterable, List, Tuple, Union, TYPE_CHECKING
-from bisect import bisect
+from math import sqrt, cos, sin, acos, atan, atan2, ceil, degrees, radians, log, pi
+from typing import (
+    overload,
+    Any,
+    Dict,
+    FrozenSet,
+    Generic,
+    Iterable,
+    List,
+    NamedTuple,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+    TYPE_CHECKING,
+)
+from bisect import bisect, bisect_left, bisect_right, insort
+from heapq import heappop, heappush
 from abc import ABC, abstractmethod
+import copy
 import math
+import sys
+import weakref
 
 from collections.abc import MutableSequence
 
+if TYPE_CHECKING:
+    # NumPy is optional, and only needed for the methods working on arrays
+    import numpy as np
+    import numpy.typing as npt
+
+    from .index import SegmentIndex
+
 # This file contains classes for the different types of SVG path segments as
 # well as a Path object that contains a sequence of path segments.
 
 MIN_DEPTH = 5
 ERROR = 1e-12
+# The maximum recursion depth for quadrature_length()
+MAX_QUADRATURE_DEPTH = 40
+# The smallest relative error quadrature_length() tries to reach
+QUADRATURE_PRECISION = 64 * sys.float_info.epsilon
+# The number of intervals in the arc length table of each curve
+LENGTH_TABLE_INTERVALS = 16
+# The maximum number of Newton iterations when inverting the arc length
+MAX_NEWTON_ITERATIONS = 10
+# The number of parts a segment is sampled in when finding the closest point
+CLOSEST_POINT_SAMPLES = 32
+# The maximum number of iterations in t_at_length(), including bisections
+MAX_T_AT_LENGTH_ITERATIONS = 100
+# The default maximum distance between a curve and its flattened polyline
+FLATTEN_TOLERANCE = 0.1
+# The maximum subdivision depth when flattening Bezier curves
+MAX_FLATTEN_DEPTH = 24
+# The maximum number of iterations when finding a root of a polynomial
+MAX_ROOT_ITERATIONS = 100
+# Coefficients this much smaller than the largest are treated as zero
+POLYNOMIAL_PRECISION = 1e-14
+# Points this much closer than the size of the segments are the same point
+INTERSECTION_PRECISION = 1e-9
+# Curves are split until they are this flat, relative to their length
+INTERSECTION_FLATNESS = 1e-3
+# The maximum subdivision depth when intersecting curves
+MAX_INTERSECTION_DEPTH = 48
+# The maximum number of Newton iterations when refining an intersection
+MAX_INTERSECTION_ITERATIONS = 50
+
+# Methods for calculating the length of curves
+SUBDIVISION = "subdivision"
+QUADRATURE = "quadrature"
+
+# Fill rules, like the fill-rule property of SVG
+NONZERO = "nonzero"
+EVENODD = "evenodd"
+
+
+def _gauss_legendre_nodes(n: int) -> List[Tuple[float, float]]:
+    """The nodes and weights of n-point Gauss-Legendre quadrature on [-1, 1]"""
+    nodes = []
+    for i in range(1, n + 1):
+        # Initial guess, then Newton's method on the Legendre polynomial P_n
+        x = cos(pi * (i - 0.25) / (n + 0.5))
+        for _ in range(100):
+            p0, p1 = 1.0, x
+            for k in range(2, n + 1):
+                p0, p1 = p1, ((2 * k - 1) * x * p1 - (k - 1) * p0) / k
+            dp = n * (x * p1 - p0) / (x * x - 1)
+            dx = p1 / dp
+            x -= dx
+            if abs(dx) < 1e-16:
+                break
+        nodes.append((x, 2 / ((1 - x * x) * dp * dp)))
+    return nodes
+
+
+GAUSS_LEGENDRE = _gauss_legendre_nodes(10)
 
 
 def _find_solutions_for_bezier(c2: float, c1: float, c0: float) -> List[float]:
@@ -69,6 +153,191 @@ def _find_solutions_for_arc(a: float, b: float, c: float, d: float) -> List[floa
     return t_list
 
 
+def _evaluate(coefficients: Sequence[float], x: float) -> float:
+    """Evaluates a polynomial with Horner's rule
+
+    The coefficients are in the order of increasing powers.
+    """
+    result = 0.0
+    for coefficient in reversed(coefficients):
+        result = result * x + coefficient
+    return result
+
+
+def _trim(coefficients: Sequence[float]) -> List[float]:
+    """Removes the highest powers of a polynomial that are negligible"""
+    coefficients = list(coefficients)
+    largest = max((abs(c) for c in coefficients), default=0.0)
+    while coefficients and abs(coefficients[-1]) <= largest * POLYNOMIAL_PRECISION:
+        coefficients.pop()
+    return coefficients
+
+
+def _root_bound(coefficients: Sequence[float]) -> float:
+    """A bound of the absolute value of the real roots of a polynomial"""
+    coefficients = _trim(coefficients)
+    if len(coefficients) < 2:
+        return 0.0
+    leading = abs(coefficients[-1])
+    return 1 + max(abs(c) / leading for c in coefficients[:-1])
+
+
+def _real_roots(coefficients: Sequence[float], low: float, high: float) -> List[float]:
+    """Finds the real roots of a polynomial between low and high
+
+    The coefficients are in the order of increasing powers. The roots of the
+    derivative split the interval into parts where the polynomial is
+    monotonic, so each part has at most one root. It's found with Newton's
+    method, falling back to bisection when a step would leave the part.
+    """
+    coefficients = _trim(coefficients)
+    degree = len(coefficients) - 1
+    if degree < 1:
+        # A constant has no roots, or is zero everywhere
+        return []
+    if degree == 1:
+        root = -coefficients[0] / coefficients[1]
+        return [root] if low <= root <= high else []
+
+    derivative = [i * c for i, c in enumerate(coefficients)][1:]
+    bounds = [low] + _real_roots(derivative, low, high) + [high]
+    roots = []
+    for start, end in zip(bounds, bounds[1:]):
+        start_value = _evaluate(coefficients, start)
+        end_value = _evaluate(coefficients, end)
+        if start_value == 0:
+            roots.append(start)
+        elif end_value != 0 and (start_value < 0) != (end_value < 0):
+            roots.append(_bracketed_root(coefficients, derivative, start, end))
+    if _evaluate(coefficients, high) == 0:
+        roots.append(high)
+    return roots
+
+
+def _bracketed_root(
+    coefficients: Sequence[float], derivative: Sequence[float], low: float, high: float
+) -> float:
+    """Finds the root of a polynomial that changes sign between low and high"""
+    low_negative = _evaluate(coefficients, low) < 0
+    x = (low + high) / 2
+    for _ in range(MAX_ROOT_ITERATIONS):
+        value = _evaluate(coefficients, x)
+        if value == 0:
+            break
+        if (value < 0) == low_negative:
+            low = x
+        else:
+            high = x
+        slope = _evaluate(derivative, x)
+        new_x = x - value / slope if slope != 0 else low
+        if not low < new_x < high:
+            new_x = (low + high) / 2
+        if new_x == x:
+            break
+        x = new_x
+    return x
+
+
+def _closest_on_line(
+    start: complex, end: complex, point: complex
+) -> Tuple[float, complex, float]:
+    """The position, point and distance on a line that is closest to a point"""
+    direction = end - start
+    length_sq = direction.real**2 + direction.imag**2
+    if length_sq == 0:
+        return 0.0, start, abs(point - start)
+    offset = point - start
+    t = (offset.real * direction.real + offset.imag * direction.imag) / length_sq
+    t = min(max(0.0, t), 1.0)
+    closest = end if t == 1.0 else start + direction * t
+    return t, closest, abs(point - closest)
+
+
+def _closest_sampled(
+    curve: PathSegment, point: complex
+) -> Tuple[float, complex, float]:
+    """The position, point and distance on any segment closest to a point
+
+    The segment is sampled at evenly spaced positions, and the samples
+    closer than their neighbours are refined to where the line from the
+    point to the segment is perpendicular to the tangent. The refinement
+    takes secant steps on the dot product of the line and the tangent,
+    starting with a Gauss-Newton step, and falls back to bisection when a
+    step would leave the interval known to contain the position.
+    """
+    count = CLOSEST_POINT_SAMPLES
+    points = [curve.start]
+    points += [curve.point(i / count) for i in range(1, count)]
+    points.append(curve.end)
+    distances = [abs(point - each) for each in points]
+
+    best = min(
+        ((i / count, points[i], distances[i]) for i in range(count + 1)),
+        key=lambda each: each[2],
+    )
+    for i in range(count + 1):
+        if (i > 0 and distances[i - 1] < distances[i]) or (
+            i < count and distances[i + 1] < distances[i]
+        ):
+            continue
+        low = max(i - 1, 0) / count
+        high = min(i + 1, count) / count
+        pos = i / count
+        previous = None
+        for _ in range(MAX_ROOT_ITERATIONS):
+            offset = curve.point(pos) - point
+            tangent = curve.tangent(pos)
+            dot = offset.real * tangent.real + offset.imag * tangent.imag
+            if dot > 0:
+                high = pos
+            elif dot < 0:
+                low = pos
+            else:
+                break
+            if previous is not None and previous[1] != dot:
+                slope = (dot - previous[1]) / (pos - previous[0])
+            else:
+                slope = tangent.real**2 + tangent.imag**2
+            previous = (pos, dot)
+            new_pos = pos - dot / slope if slope else low
+            if not low < new_pos < high:
+                new_pos = (low + high) / 2
+            if new_pos == pos:
+                break
+            pos = new_pos
+        closest = curve.point(pos)
+        distance = abs(point - closest)
+        if distance < best[2]:
+            best = (pos, closest, distance)
+    return best
+
+
+def _closest_on_bezier(
+    curve: NonLinear, coefficients: Sequence[complex], point: complex
+) -> Tuple[float, complex, float]:
+    """The position, point and distance on a Bezier curve closest to a point
+
+    The coefficients are those of the curve as a polynomial in the position,
+    in the order of increasing powers. The distance is the smallest at one
+    of the ends, or where the line from the point to the curve is
+    perpendicular to the tangent, where the dot product of them is zero.
+    """
+    offset = [coefficients[0] - point] + list(coefficients[1:])
+    tangent = [i * c for i, c in enumerate(offset)][1:]
+    dot = [0.0] * (len(offset) + len(tangent) - 1)
+    for i, a in enumerate(offset):
+        for j, b in enumerate(tangent):
+            dot[i + j] += a.real * b.real + a.imag * b.imag
+
+    best = (0.0, curve.start, abs(point - curve.start))
+    for pos in _real_roots(dot, 0.0, 1.0) + [1.0]:
+        closest = curve.point(pos)
+        distance = abs(point - closest)
+        if distance < best[2]:
+            best = (pos, closest, distance)
+    return best
+
+
 def segment_length(
     curve: NonLinear,
     start: float,
@@ -99,9 +368,272 @@ def segment_length(
     return length2
 
 
+def _gauss_length(curve: PathSegment, start: float, end: float) -> float:
+    """Integrates the length of the tangent between start and end"""
+    half = (end - start) / 2
+    mid = start + half
+    return half * sum(
+        weight * abs(curve.tangent(mid + half * node))
+        for node, weight in GAUSS_LEGENDRE
+    )
+
+
+def quadrature_length(
+    curve: PathSegment,
+    start: float,
+    end: float,
+    estimate: float,
+    error: float,
+    depth: int,
+) -> float:
+    """Calculates the length with adaptive Gauss-Legendre quadrature
+
+    The estimate is the integral over the whole interval. If the integrals of
+    each half doesn't add up to the estimate within the error, each half is
+    integrated separately.
+    """
+    mid = (start + end) / 2
+    first_half = _gauss_length(curve, start, mid)
+    second_half = _gauss_length(curve, mid, end)
+    length = first_half + second_half
+    difference = abs(length - estimate)
+    # Differences at the precision of the floats are rounding errors, and
+    # subdividing further will not make them smaller.
+    if (
+        difference > error
+        and difference > QUADRATURE_PRECISION * abs(length)
+        and depth < MAX_QUADRATURE_DEPTH
+    ):
+        depth += 1
+        error /= 2
+        return quadrature_length(
+            curve, start, mid, first_half, error, depth
+        ) + quadrature_length(curve, mid, end, second_half, error, depth)
+    return length
+
+
+def _curve_length(curve: NonLinear, error: float, min_depth: int, method: str) -> float:
+    """The length of a curve with the selected method"""
+    if method == SUBDIVISION:
+        start_point = curve.point(0)
+        end_point = curve.point(1)
+        return segment_length(curve, 0, 1, start_point, end_point, error, min_depth, 0)
+    if method == QUADRATURE:
+        return quadrature_length(curve, 0, 1, _gauss_length(curve, 0, 1), error, 0)
+    raise ValueError(f"Unknown length method {method!r}")
+
+
+def _segment_distance(point: complex, start: complex, end: complex) -> float:
+    """The distance from a point to the line segment between start and end"""
+    direction = end - start
+    length_sq = direction.real**2 + direction.imag**2
+    if length_sq == 0:
+        return abs(point - start)
+    offset = point - start
+    t = (offset.real * direction.real + offset.imag * direction.imag) / length_sq
+    return abs(offset - direction * min(max(t, 0.0), 1.0))
+
+
+def _flatten_bezier(controls: List[complex], tolerance: float) -> List[complex]:
+    """Flattens a Bezier curve of any degree into a polyline
+
+    The curve lies within the convex hull of its control points, so when all
+    control points are within the tolerance of the chord, so is the curve.
+    Otherwise the curve is split in half with de Casteljau's algorithm, which
+    subdivides the bends more than the straight parts.
+
+    Returns the points after the start point.
+    """
+    points = []
+    stack = [(controls, 0)]
+    while stack:
+        controls, depth = stack.pop()
+        start, end = controls[0], controls[-1]
+        if depth >= MAX_FLATTEN_DEPTH or all(
+            _segment_distance(control, start, end) <= tolerance
+            for control in controls[1:-1]
+        ):
+            points.append(end)
+            continue
+
+        first = [start]
+        second = [end]
+        while len(controls) > 1:
+            controls = [(a + b) / 2 for a, b in zip(controls, controls[1:])]
+            first.append(controls[0])
+            second.append(controls[-1])
+        # The second half goes on the stack first, so it's handled last
+        stack.append((second[::-1], depth + 1))
+        stack.append((first, depth + 1))
+    return points
+
+
+def _flatten_curve(curve: PathSegment, tolerance: float) -> List[complex]:
+    """Flattens any segment into a polyline, by its points
+
+    The parts of the segment are split in half until the middle of each is
+    within the tolerance of its chord. They are always split MIN_DEPTH
+    times first, so that a curve that bends both ways isn't taken for a
+    straight line from the middle point alone.
+
+    Returns the points after the start point.
+    """
+    points = []
+    stack = [(0.0, 1.0, curve.start, curve.end, 0)]
+    while stack:
+        start, end, start_point, end_point, depth = stack.pop()
+        mid = (start + end) / 2
+        mid_point = curve.point(mid)
+        if depth >= MAX_FLATTEN_DEPTH or (
+            depth >= MIN_DEPTH
+            and _segment_distance(mid_point, start_point, end_point) <= tolerance
+        ):
+            points.append(end_point)
+            continue
+        # The second half goes on the stack first, so it's handled last
+        stack.append((mid, end, mid_point, end_point, depth + 1))
+        stack.append((start, mid, start_point, mid_point, depth + 1))
+    return points
+
+
+# An affine transformation matrix of two rows of three, [[a, c, e], [b, d, f]]
+Matrix = Sequence[Sequence[float]]
+# The numbers of a matrix, in the order of the SVG matrix() transform
+Affine = Tuple[float, float, float, float, float, float]
+
+Segment = TypeVar("Segment", bound="PathSegment")
+
+
+def _affine(matrix: Matrix) -> Affine:
+    """The numbers of a matrix, a, b, c, d, e, f like in SVG"""
+    rows = [[float(number) for number in row] for row in matrix]
+    if len(rows) != 2 or len(rows[0]) != 3 or len(rows[1]) != 3:
+        raise ValueError("An affine matrix has two rows of three numbers")
+    (a, c, e), (b, d, f) = rows
+    return a, b, c, d, e, f
+
+
+def _apply(affine: Affine, point: complex) -> complex:
+    a, b, c, d, e, f = affine
+    x = point.real
+    y = point.imag
+    return complex(a * x + c * y + e, b * x + d * y + f)
+
+
+def _transform_radius(
+    affine: Affine, radius: complex, rotation: float
+) -> Tuple[complex, float]:
+    """The radius and rotation of an ellipse after a transformation
+
+    The transformed ellipse is the unit circle scaled by the radius, rotated
+    and transformed, E = M R D. Its radii are the square roots of the
+    eigenvalues of E E^T, and its rotation the angle of the eigenvector of
+    the largest.
+    """
+    a, b, c, d, _, _ = affine
+    rx = radius.real
+    ry = radius.imag
+    cosr = cos(radians(rotation))
+    sinr = sin(radians(rotation))
+    # The columns of E
+    ux = rx * (a * cosr + c * sinr)
+    uy = rx * (b * cosr + d * sinr)
+    vx = ry * (c * cosr - a * sinr)
+    vy = ry * (d * cosr - b * sinr)
+    # E E^T is [[p, q], [q, r]]
+    p = ux * ux + vx * vx
+    q = ux * uy + vx * vy
+    r = uy * uy + vy * vy
+    large = (p + r + math.hypot(p - r, 2 * q)) / 2
+    # The product of the eigenvalues is the determinant, which is exactly
+    # zero for an arc that is a straight line
+    determinant = (a * d - b * c) * rx * ry
+    small = determinant * determinant / large if large else 0.0
+    angle = degrees(atan2(2 * q, p - r) / 2)
+    return complex(sqrt(large), sqrt(small)), angle
+
+
 class PathSegment(ABC):
-    start: complex
-    end: complex
+    # Segments use slots instead of a __dict__, as paths can have very many.
+    # The start and end are properties, so that the curves can clear what
+    # they calculated from them when they change, and so that the paths
+    # they are in can update their caches.
+    __slots__ = ("_start", "_end", "relative", "_owners")
+
+    relative: bool
+    # Weak references to the paths with caches that have the segment, or
+    # one reference when there is only one, or None
+    _owners: Union[weakref.ref[Path], List[weakref.ref[Path]], None]
+
+    def _changed(self) -> None:
+        # Subclasses that don't call the __init__() of the segment classes
+        # have no owners until they are in a path
+        owners = getattr(self, "_owners", None)
+        if owners is None:
+            return
+        for owner in owners if isinstance(owners, list) else [owners]:
+            path = owner()
+            if path is not None:
+                path._segment_changed(self)
+
+    def _add_owner(self, owner: weakref.ref[Path]) -> None:
+        owners = getattr(self, "_owners", None)
+        if owners is None:
+            self._owners = owner
+        elif isinstance(owners, list):
+            # Forget the paths that are gone
+            owners[:] = [each for each in owners if each() is not None]
+            owners.append(owner)
+        else:
+            self._owners = [owners, owner]
+
+    def _remove_owner(self, owner: weakref.ref[Path]) -> None:
+        """Removes a path, once for each time it was added"""
+        owners = getattr(self, "_owners", None)
+        if owners is owner:
+            self._owners = None
+        elif isinstance(owners, list):
+            for i, each in enumerate(owners):
+                if each is owner:
+                    del owners[i]
+                    break
+
+    def __getstate__(self) -> Tuple[Union[Dict[str, Any], None], Dict[str, Any]]:
+        # The paths of a segment don't have its copies
+        slots = {}
+        for cls in type(self).__mro__:
+            for name in cls.__dict__.get("__slots__", ()):
+                if name != "_owners" and hasattr(self, name):
+                    slots[name] = getattr(self, name)
+        return getattr(self, "__dict__", None), slots
+
+    def __setstate__(
+        self, state: Tuple[Union[Dict[str, Any], None], Dict[str, Any]]
+    ) -> None:
+        attributes, slots = state
+        if attributes:
+            self.__dict__.update(attributes)
+        for name, value in slots.items():
+            setattr(self, name, value)
+        self._owners = None
+
+    @property
+    def start(self) -> complex:
+        return self._start
+
+    @start.setter
+    def start(self, start: complex) -> None:
+        self._start = start
+        self._changed()
+
+    @property
+    def end(self) -> complex:
+        return self._end
+
+    @end.setter
+    def end(self, end: complex) -> None:
+        self._end = end
+        self._changed()
 
     @abstractmethod
     def _d(self, previous: PathSegment) -> str:
@@ -119,13 +651,109 @@ class PathSegment(ABC):
         on the path as expressed as a floating point number between 0 (start) and 1 (end).
         """
 
+    def point_many(self, positions: npt.ArrayLike) -> npt.NDArray[np.complex128]:
+        """Returns the points for an array of positions, as an array of complex
+
+        This requires NumPy.
+        """
+        import numpy as np
+
+        pos = np.asarray(positions, dtype=np.float64)
+        return np.array([self.point(p) for p in pos.flat], dtype=np.complex128).reshape(
+            pos.shape
+        )
+
+    def tangent_many(self, positions: npt.ArrayLike) -> npt.NDArray[np.complex128]:
+        """Returns the tangents for an array of positions, as an array of complex
+
+        This requires NumPy.
+        """
+        import numpy as np
+
+        pos = np.asarray(positions, dtype=np.float64)
+        return np.array(
+            [self.tangent(p) for p in pos.flat], dtype=np.complex128
+        ).reshape(pos.shape)
+
+    def t_at_length(self, length: float, error: float = ERROR) -> float:
+        """Returns the position in the segment at a length from the start
+
+        This is the inverse of the length up to a position. It uses Newton's
+        method on the length of the tangent, and falls back to bisection when
+        a step would leave the interval known to contain the position.
+        """
+        total = self.length(error=error, method=QUADRATURE)
+        if length <= 0 or total == 0:
+            return 0.0
+        if length >= total:
+            return 1.0
+
+        scale = _tangent_scale(self)
+        # The error of the integral of the unscaled tangent
+        tangent_error = error / scale
+        low, high = 0.0, 1.0
+        pos = length / total
+        estimate = _gauss_length(self, 0, pos)
+        current = scale * quadrature_length(self, 0, pos, estimate, tangent_error, 0)
+        for _ in range(MAX_T_AT_LENGTH_ITERATIONS):
+            difference = current - length
+            if abs(difference) <= error:
+                break
+            if difference > 0:
+                high = pos
+            else:
+                low = pos
+            speed = scale * abs(self.tangent(pos))
+            if speed == 0:
+                new_pos = (low + high) / 2
+            else:
+                new_pos = pos - difference / speed
+                if not low < new_pos < high:
+                    new_pos = (low + high) / 2
+            # Add the length between the old and the new position, which is
+            # negative if the new position is before the old one.
+            estimate = _gauss_length(self, pos, new_pos)
+            current += scale * quadrature_length(
+                self, pos, new_pos, estimate, tangent_error, 0
+            )
+            pos = new_pos
+        return pos
+
+    def flatten(
+        self, tolerance: float = FLATTEN_TOLERANCE
+    ) -> npt.NDArray[np.complex128]:
+        """Returns a polyline approximating the segment, as an array of complex
+
+        The polyline starts and ends at the start and end of the segment, and
+        no point on the segment is further away from it than the tolerance.
+        Curves get more points where they bend more.
+
+        The segment classes flatten themselves from their control points or
+        angles, and this only uses point(), for other subclasses.
+
+        This requires NumPy.
+        """
+        import numpy as np
+
+        points = [self.start] + _flatten_curve(self, tolerance)
+        return np.array(points, dtype=np.complex128)
+
     @abstractmethod
-    def length(self, error: float = ERROR, min_depth: int = MIN_DEPTH) -> float:
+    def length(
+        self,
+        error: float = ERROR,
+        min_depth: int = MIN_DEPTH,
+        method: str = SUBDIVISION,
+    ) -> float:
         """Returns the length of a path.
 
         The CubicBezier and Arc lengths are non-exact and iterative and you can select to
         either do the calculations until a maximum error has been achieved, or a minimum
         number of iterations.
+
+        The method is either SUBDIVISION, which approximates the curve with straight
+        lines, or QUADRATURE, which integrates the tangent with adaptive Gauss-Legendre
+        quadrature. QUADRATURE is much faster, and min_depth is ignored.
         """
 
     # TODO: It would be more appropriate to have a return type of:
@@ -134,6 +762,31 @@ class PathSegment(ABC):
     def boundingbox(self) -> List[float]:
         """Returns the bounding box of a path in the format of [left, top, right, bottom]"""
 
+    def closest_point(self, point: complex) -> Tuple[float, complex, float]:
+        """Returns the position, point and distance on the segment closest to a point
+
+        The position is a floating point number between 0 (start) and 1 (end).
+
+        The segment classes solve for the closest point, and this samples the
+        segment and refines the closest samples, for other subclasses.
+        """
+        return _closest_sampled(self, point)
+
+    def transform(self: Segment, matrix: Matrix) -> Segment:
+        """Returns a copy of the segment with an affine transformation applied
+
+        The matrix has two rows of three numbers, [[a, c, e], [b, d, f]],
+        which maps (x, y) to (a x + c y + e, b x + d y + f), like the
+        matrix(a, b, c, d, e, f) transform of SVG.
+        """
+        segment = copy.copy(self)
+        segment._transform(_affine(matrix))
+        return segment
+
+    def _transform(self, affine: Affine) -> None:
+        self.start = _apply(affine, self.start)
+        self.end = _apply(affine, self.end)
+
 
 class NonLinear(PathSegment):
     """A line that is not straight
@@ -141,6 +794,8 @@ class NonLinear(PathSegment):
     The base of Arc, QuadraticBezier and CubicBezier
     """
 
+    __slots__ = ()
+
 
 class Linear(PathSegment):
     """A straight line
@@ -148,10 +803,13 @@ class Linear(PathSegment):
     The base for Line() and Close().
     """
 
+    __slots__ = ()
+
     def __init__(self, start: complex, end: complex, relative: bool = False) -> None:
-        self.start = start
-        self.end = end
+        self._start = start
+        self._end = end
         self.relative = relative
+        self._owners = None
 
     def __ne__(self, other: object) -> bool:
         if not isinstance(other, Line):
@@ -159,18 +817,53 @@ class Linear(PathSegment):
         return not self == other
 
     def point(self, pos: float) -> complex:
-        distance = self.end - self.start
-        return self.start + distance * pos
+        distance = self._end - self._start
+        return self._start + distance * pos
 
     def tangent(self, pos: float) -> complex:
-        return self.end - self.start
+        return self._end - self._start
+
+    def point_many(self, positions: npt.ArrayLike) -> npt.NDArray[np.complex128]:
+        import numpy as np
+
+        pos = np.asarray(positions, dtype=np.float64)
+        return np.asarray(self._start + (self._end - self._start) * pos)
+
+    def tangent_many(self, positions: npt.ArrayLike) -> npt.NDArray[np.complex128]:
+        import numpy as np
+
+        pos = np.asarray(positions, dtype=np.float64)
+        return np.full(pos.shape, self._end - self._start, dtype=np.complex128)
 
-    def length(self, error: float = ERROR, min_depth: int = MIN_DEPTH) -> float:
-        distance = self.end - self.start
+    def flatten(
+        self, tolerance: float = FLATTEN_TOLERANCE
+    ) -> npt.NDArray[np.complex128]:
+        import numpy as np
+
+        return np.array([self._start, self._end], dtype=np.complex128)
+
+    def t_at_length(self, length: float, error: float = ERROR) -> float:
+        total = self.length()
+        if length <= 0 or total == 0:
+            return 0.0
+        return min(length / total, 1.0)
+
+    def length(
+        self,
+        error: float = ERROR,
+        min_depth: int = MIN_DEPTH,
+        method: str = SUBDIVISION,
+    ) -> float:
+        distance = self._end - self._start
         return sqrt(distance.real**2 + distance.imag**2)
 
+    def closest_point(self, point: complex) -> Tuple[float, complex, float]:
+        return _closest_on_line(self._start, self._end, point)
+
 
 class Line(Linear):
+    __slots__ = ("vertical", "horizontal")
+
     def __init__(
         self,
         start: complex,
@@ -179,23 +872,24 @@ class Line(Linear):
         vertical: bool = False,
         horizontal: bool = False,
     ) -> None:
-        self.start = start
-        self.end = end
+        self._start = start
+        self._end = end
         self.relative = relative
         self.vertical = vertical
         self.horizontal = horizontal
+        self._owners = None
 
     def __repr__(self) -> str:
-        return f"Line(start={self.start}, end={self.end})"
+        return f"Line(start={self._start}, end={self._end})"
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Line):
             return NotImplemented
-        return self.start == other.start and self.end == other.end
+        return self._start == other.start and self._end == other.end
 
     def _d(self, previous: PathSegment) -> str:
-        x = self.end.real
-        y = self.end.imag
+        x = self._end.real
+        y = self._end.imag
         if self.relative:
             x -= previous.end.real
             y -= previous.end.imag
@@ -218,20 +912,24 @@ class Line(Linear):
         return f"{cmd} {x:G},{y:G}"
 
     def is_vertical_from(self, previous: Line) -> bool:
-        return self.start == previous.end and self.start.real == self.end.real
+        return self._start == previous.end and self._start.real == self._end.real
 
     def is_horizontal_from(self, previous: Line) -> bool:
-        return self.start == previous.end and self.start.imag == self.end.imag
+        return self._start == previous.end and self._start.imag == self._end.imag
 
     def boundingbox(self) -> List[float]:
-        x_min = min(self.start.real, self.end.real)
-        x_max = max(self.start.real, self.end.real)
-        y_min = min(self.start.imag, self.end.imag)
-        y_max = max(self.start.imag, self.end.imag)
+        x_min = min(self._start.real, self._end.real)
+        x_max = max(self._start.real, self._end.real)
+        y_min = min(self._start.imag, self._end.imag)
+        y_max = max(self._start.imag, self._end.imag)
         return [x_min, y_min, x_max, y_max]
 
 
 class CubicBezier(NonLinear):
+    # The points are properties, so that changing them clears the cached
+    # coefficients, like in Arc.
+    __slots__ = ("_control1", "_control2", "smooth", "_coefficients")
+
     def __init__(
         self,
         start: complex,
@@ -241,12 +939,14 @@ class CubicBezier(NonLinear):
         relative: bool = False,
         smooth: bool = False,
     ):
-        self.start = start
-        self.control1 = control1
-        self.control2 = control2
-        self.end = end
+        self._start = start
+        self._control1 = control1
+        self._control2 = control2
+        self._end = end
         self.relative = relative
         self.smooth = smooth
+        self._owners = None
+        self._coefficients: Union[Tuple[complex, ...], None] = None
 
     def __repr__(self) -> str:
         return (
@@ -305,30 +1005,134 @@ class CubicBezier(NonLinear):
         self.control1 = previous.end - previous.control2 + self.start
         self.smooth = True
 
+    @property
+    def start(self) -> complex:
+        return self._start
+
+    @start.setter
+    def start(self, start: complex) -> None:
+        self._start = start
+        self._coefficients = None
+        self._changed()
+
+    @property
+    def control1(self) -> complex:
+        return self._control1
+
+    @control1.setter
+    def control1(self, control1: complex) -> None:
+        self._control1 = control1
+        self._coefficients = None
+        self._changed()
+
+    @property
+    def control2(self) -> complex:
+        return self._control2
+
+    @control2.setter
+    def control2(self, control2: complex) -> None:
+        self._control2 = control2
+        self._coefficients = None
+        self._changed()
+
+    @property
+    def end(self) -> complex:
+        return self._end
+
+    @end.setter
+    def end(self, end: complex) -> None:
+        self._end = end
+        self._coefficients = None
+        self._changed()
+
+    def _power_basis(self) -> Tuple[complex, ...]:
+        """The coefficients of the curve as a polynomial in pos
+
+        The polynomial is expanded both around the start and around the end,
+        and point() uses the one closest to the position. That keeps the
+        ends exact, and using the differences between the points avoids
+        rounding errors for curves far from the origin.
+
+        They are calculated when first needed, and again after a change.
+        """
+        coefficients = self._coefficients
+        if coefficients is None:
+            g0 = self._control1 - self._start
+            g1 = self._control2 - self._control1
+            g2 = self._end - self._control2
+            # Around the end, the cubic coefficient only changes sign
+            coefficients = self._coefficients = (
+                self._start,
+                3 * g0,
+                3 * (g1 - g0),
+                g2 - 2 * g1 + g0,
+                self._end,
+                -3 * g2,
+                3 * (g2 - g1),
+            )
+        return coefficients
+
     def point(self, pos: float) -> complex:
         """Calculate the x,y position at a certain position of the path"""
-        return (
-            ((1 - pos) ** 3 * self.start)
-            + (3 * (1 - pos) ** 2 * pos * self.control1)
-            + (3 * (1 - pos) * pos**2 * self.control2)
+        coefficients = self._coefficients
+        if coefficients is None:
+            coefficients = self._power_basis()
+        start, b, c, d, end, end_b, end_c = coefficients
+        if pos <= 0.5:
+            return start + pos * (b + pos * (c + pos * d))
+        pos = 1 - pos
+        return end + pos * (end_b + pos * (end_c - pos * d))
+
+    def tangent(self, pos: float) -> complex:
+        coefficients = self._coefficients
+        if coefficients is None:
+            coefficients = self._power_basis()
+        start, b, c, d, end, end_b, end_c = coefficients
+        if pos <= 0.5:
+            return b + pos * (2 * c + 3 * pos * d)
+        pos = 1 - pos
+        return -(end_b + pos * (2 * end_c - 3 * pos * d))
+
+    def point_many(self, positions: npt.ArrayLike) -> npt.NDArray[np.complex128]:
+        import numpy as np
+
+        pos = np.asarray(positions, dtype=np.float64)
+        inv = 1 - pos
+        return np.asarray(
+            (inv**3 * self.start)
+            + (3 * inv**2 * pos * self.control1)
+            + (3 * inv * pos**2 * self.control2)
             + (pos**3 * self.end)
         )
 
-    def tangent(self, pos: float) -> complex:
-        return (
-            -3 * (1 - pos) ** 2 * self.start
-            + 3 * (1 - pos) ** 2 * self.control1
-            - 6 * pos * (1 - pos) * self.control1
-            - 3 * pos**2 * self.control2
-            + 6 * pos * (1 - pos) * self.control2
-            + 3 * pos**2 * self.end
+    def tangent_many(self, positions: npt.ArrayLike) -> npt.NDArray[np.complex128]:
+        import numpy as np
+
+        pos = np.asarray(positions, dtype=np.float64)
+        inv = 1 - pos
+        return np.asarray(
+            3 * inv**2 * (self.control1 - self.start)
+            + 6 * inv * pos * (self.control2 - self.control1)
+            + 3 * pos**2 * (self.end - self.control2)
         )
 
-    def length(self, error: float = ERROR, min_depth: int = MIN_DEPTH) -> float:
+    def flatten(
+        self, tolerance: float = FLATTEN_TOLERANCE
+    ) -> npt.NDArray[np.complex128]:
+        import numpy as np
+
+        controls = [self.start, self.control1, self.control2, self.end]
+        points = [self.start] + _flatten_bezier(controls, tolerance)
+        return np.array(points, dtype=np.complex128)
+
+    def length(
+        self,
+        error: float = ERROR,
+        min_depth: int = MIN_DEPTH,
+        method: str = SUBDIVISION,
+    ) -> float:
         """Calculate the length of the path up to a certain position"""
-        start_point = self.point(0)
-        end_point = self.point(1)
-        return segment_length(self, 0, 1, start_point, end_point, error, min_depth, 0)
+        return _curve_length(self, error, min_depth, method)
 
     def boundingbox(self) -> List[float]:
         """Calculate the bounding box of a cubic Bezier curve.
@@ -337,27 +1141,17 @@ class CubicBezier(NonLinear):
 
         P(t)  = (1-t)^3 P0 + 3 t (1-t)^2 P1 + 3 t^2 (1-t) P2 + t^3 P_3
         P'(t) = 3(1-t)^2 (P1-P0) + 6(1-t)t (P2-P1) + 3 t^2 (P3 - P2)
-        """
-        g0 = self.control1 - self.start
-        g1 = self.control2 - self.control1
-        g2 = self.end - self.control2
 
-        c0 = 3 * g0
-        c1 = -6 * g0 + 6 * g1
-        c2 = 3 * g0 - 6 * g1 + 3 * g2
-
-        x_c0, x_c1, x_c2 = [c.real for c in [c0, c1, c2]]
-        y_c0, y_c1, y_c2 = [c.imag for c in [c0, c1, c2]]
-
-        x_cand = [0, 1] + _find_solutions_for_bezier(x_c2, x_c1, x_c0)
-        y_cand = [0, 1] + _find_solutions_for_bezier(y_c2, y_c1, y_c0)
-
-        x_coords = []
-        y_coords = []
-        for t in x_cand:
+        The coefficients of P'(t) as a polynomial come from the power basis.
+        """
+        x_turns, y_turns = self._turns()
+        # The ends are exact, so boxes of joined segments meet
+        x_coords = [self.start.real, self.end.real]
+        y_coords = [self.start.imag, self.end.imag]
+        for t in x_turns:
             p = self.point(t)
             x_coords.append(p.real)
-        for t in y_cand:
+        for t in y_turns:
             p = self.point(t)
             y_coords.append(p.imag)
 
@@ -365,8 +1159,31 @@ class CubicBezier(NonLinear):
         y_min, y_max = min(y_coords), max(y_coords)
         return [x_min, y_min, x_max, y_max]
 
+    def _turns(self) -> Tuple[List[float], List[float]]:
+        """The positions where P'(t) is zero in x, and in y"""
+        _, b, c, d, _, _, _ = self._power_basis()
+        c0 = b
+        c1 = 2 * c
+        c2 = 3 * d
+        return (
+            _find_solutions_for_bezier(c2.real, c1.real, c0.real),
+            _find_solutions_for_bezier(c2.imag, c1.imag, c0.imag),
+        )
+
+    def closest_point(self, point: complex) -> Tuple[float, complex, float]:
+        return _closest_on_bezier(self, self._power_basis()[:4], point)
+
+    def _transform(self, affine: Affine) -> None:
+        super()._transform(affine)
+        self.control1 = _apply(affine, self.control1)
+        self.control2 = _apply(affine, self.control2)
+
 
 class QuadraticBezier(NonLinear):
+    # The points are properties, so that changing them clears the cached
+    # coefficients, like in Arc.
+    __slots__ = ("_control", "smooth", "_coefficients")
+
     def __init__(
         self,
         start: complex,
@@ -375,11 +1192,13 @@ class QuadraticBezier(NonLinear):
         relative: bool = False,
         smooth: bool = False,
     ) -> None:
-        self.start = start
-        self.end = end
-        self.control = control
+        self._start = start
+        self._end = end
+        self._control = control
         self.relative = relative
         self.smooth = smooth
+        self._owners = None
+        self._coefficients: Union[Tuple[complex, ...], None] = None
 
     def __repr__(self) -> str:
         return (
@@ -434,23 +1253,108 @@ class QuadraticBezier(NonLinear):
         self.control = previous.end - previous.control + self.start
         self.smooth = True
 
+    @property
+    def start(self) -> complex:
+        return self._start
+
+    @start.setter
+    def start(self, start: complex) -> None:
+        self._start = start
+        self._coefficients = None
+        self._changed()
+
+    @property
+    def control(self) -> complex:
+        return self._control
+
+    @control.setter
+    def control(self, control: complex) -> None:
+        self._control = control
+        self._coefficients = None
+        self._changed()
+
+    @property
+    def end(self) -> complex:
+        return self._end
+
+    @end.setter
+    def end(self, end: complex) -> None:
+        self._end = end
+        self._coefficients = None
+        self._changed()
+
+    def _power_basis(self) -> Tuple[complex, ...]:
+        """The coefficients of the curve as a polynomial in pos
+
+        Like for CubicBezier, expanded both around the start and the end.
+        """
+        coefficients = self._coefficients
+        if coefficients is None:
+            g0 = self._control - self._start
+            g1 = self._end - self._control
+            # Around the end, the quadratic coefficient is the same
+            coefficients = self._coefficients = (
+                self._start,
+                2 * g0,
+                g1 - g0,
+                self._end,
+                -2 * g1,
+            )
+        return coefficients
+
     def point(self, pos: float) -> complex:
-        return (
-            (1 - pos) ** 2 * self.start
-            + 2 * (1 - pos) * pos * self.control
-            + pos**2 * self.end
-        )
+        coefficients = self._coefficients
+        if coefficients is None:
+            coefficients = self._power_basis()
+        start, b, c, end, end_b = coefficients
+        if pos <= 0.5:
+            return start + pos * (b + pos * c)
+        pos = 1 - pos
+        return end + pos * (end_b + pos * c)
 
     def tangent(self, pos: float) -> complex:
-        return (
-            self.start * (2 * pos - 2)
-            + (2 * self.end - 4 * self.control) * pos
-            + 2 * self.control
+        coefficients = self._coefficients
+        if coefficients is None:
+            coefficients = self._power_basis()
+        start, b, c, end, end_b = coefficients
+        if pos <= 0.5:
+            return b + 2 * pos * c
+        return -(end_b + 2 * (1 - pos) * c)
+
+    def point_many(self, positions: npt.ArrayLike) -> npt.NDArray[np.complex128]:
+        import numpy as np
+
+        pos = np.asarray(positions, dtype=np.float64)
+        inv = 1 - pos
+        return np.asarray(
+            inv**2 * self.start + 2 * inv * pos * self.control + pos**2 * self.end
+        )
+
+    def tangent_many(self, positions: npt.ArrayLike) -> npt.NDArray[np.complex128]:
+        import numpy as np
+
+        pos = np.asarray(positions, dtype=np.float64)
+        return 2 * (1 - pos) * (self.control - self.start) + 2 * pos * (
+            self.end - self.control
         )
 
-    def length(self, error: float = ERROR, min_depth: int = MIN_DEPTH) -> float:
-        a = self.start - 2 * self.control + self.end
-        b = 2 * (self.control - self.start)
+    def flatten(
+        self, tolerance: float = FLATTEN_TOLERANCE
+    ) -> npt.NDArray[np.complex128]:
+        import numpy as np
+
+        controls = [self.start, self.control, self.end]
+        points = [self.start] + _flatten_bezier(controls, tolerance)
+        return np.array(points, dtype=np.complex128)
+
+    def length(
+        self,
+        error: float = ERROR,
+        min_depth: int = MIN_DEPTH,
+        method: str = SUBDIVISION,
+    ) -> float:
+        # The coefficients of the power basis
+        _, b, a, _, _ = self._power_basis()
 
         try:
             # For an explanation of this case, see
@@ -488,25 +1392,17 @@ class QuadraticBezier(NonLinear):
 
         P(t)  = (1-t)^2 P0 + 2 t (1-t)^2 P1 + t^2 P2
         P'(t) = 2(1-t) (P1-P0) + 2t (P2-P1)
-        """
-        g0 = self.control - self.start
-        g1 = self.end - self.control
 
-        c0 = 2 * g0
-        c1 = -2 * g0 + 2 * g1
-
-        x_c0, x_c1 = [c.real for c in [c0, c1]]
-        y_c0, y_c1 = [c.imag for c in [c0, c1]]
-
-        x_cand = [0, 1] + _find_solutions_for_bezier(0, x_c1, x_c0)
-        y_cand = [0, 1] + _find_solutions_for_bezier(0, y_c1, y_c0)
-
-        x_coords = []
-        y_coords = []
-        for t in x_cand:
+        The coefficients of P'(t) as a polynomial come from the power basis.
+        """
+        x_turns, y_turns = self._turns()
+        # The ends are exact, so boxes of joined segments meet
+        x_coords = [self.start.real, self.end.real]
+        y_coords = [self.start.imag, self.end.imag]
+        for t in x_turns:
             p = self.point(t)
             x_coords.append(p.real)
-        for t in y_cand:
+        for t in y_turns:
             p = self.point(t)
             y_coords.append(p.imag)
 
@@ -514,8 +1410,43 @@ class QuadraticBezier(NonLinear):
         y_min, y_max = min(y_coords), max(y_coords)
         return [x_min, y_min, x_max, y_max]
 
+    def _turns(self) -> Tuple[List[float], List[float]]:
+        """The positions where P'(t) is zero in x, and in y"""
+        _, b, c, _, _ = self._power_basis()
+        c0 = b
+        c1 = 2 * c
+        return (
+            _find_solutions_for_bezier(0, c1.real, c0.real),
+            _find_solutions_for_bezier(0, c1.imag, c0.imag),
+        )
+
+    def closest_point(self, point: complex) -> Tuple[float, complex, float]:
+        return _closest_on_bezier(self, self._power_basis()[:3], point)
+
+    def _transform(self, affine: Affine) -> None:
+        super()._transform(affine)
+        self.control = _apply(affine, self.control)
+
 
 class Arc(NonLinear):
+    # The center parameterization is calculated by _parameterize() when it's
+    # first needed, so arcs that are only parsed and written out again never
+    # need it. The endpoint parameters are properties, so that changing them
+    # makes it calculated again.
+    __slots__ = (
+        "_radius",
+        "_rotation",
+        "_arc",
+        "_sweep",
+        "_parameterized",
+        "_center",
+        "_theta",
+        "_delta",
+        "_radius_scale",
+        "_cosr",
+        "_sinr",
+    )
+
     def __init__(
         self,
         start: complex,
@@ -529,15 +1460,15 @@ class Arc(NonLinear):
         """radius is complex, rotation is in degrees,
         large and sweep are 1 or 0 (True/False also work)"""
 
-        self.start = start
-        self.radius = radius
-        self.rotation = rotation
-        self.arc = bool(arc)
-        self.sweep = bool(sweep)
-        self.end = end
+        self._start = start
+        self._radius = radius
+        self._rotation = rotation
+        self._arc = bool(arc)
+        self._sweep = bool(sweep)
+        self._end = end
         self.relative = relative
-
-        self._parameterize()
+        self._owners = None
+        self._parameterized = False
 
     def __repr__(self) -> str:
         return (
@@ -573,29 +1504,118 @@ class Arc(NonLinear):
             f"{int(self.arc):d},{int(self.sweep):d} {end.real:G},{end.imag:G}"
         )
 
+    @property
+    def start(self) -> complex:
+        return self._start
+
+    @start.setter
+    def start(self, start: complex) -> None:
+        self._start = start
+        self._parameterized = False
+        self._changed()
+
+    @property
+    def end(self) -> complex:
+        return self._end
+
+    @end.setter
+    def end(self, end: complex) -> None:
+        self._end = end
+        self._parameterized = False
+        self._changed()
+
+    @property
+    def radius(self) -> complex:
+        return self._radius
+
+    @radius.setter
+    def radius(self, radius: complex) -> None:
+        self._radius = radius
+        self._parameterized = False
+        self._changed()
+
+    @property
+    def rotation(self) -> float:
+        return self._rotation
+
+    @rotation.setter
+    def rotation(self, rotation: float) -> None:
+        self._rotation = rotation
+        self._parameterized = False
+        self._changed()
+
+    @property
+    def arc(self) -> bool:
+        return self._arc
+
+    @arc.setter
+    def arc(self, arc: Union[bool, int]) -> None:
+        self._arc = bool(arc)
+        self._parameterized = False
+        self._changed()
+
+    @property
+    def sweep(self) -> bool:
+        return self._sweep
+
+    @sweep.setter
+    def sweep(self, sweep: Union[bool, int]) -> None:
+        self._sweep = bool(sweep)
+        self._parameterized = False
+        self._changed()
+
+    @property
+    def center(self) -> complex:
+        if not self._parameterized:
+            self._parameterize()
+        return self._center
+
+    @property
+    def theta(self) -> float:
+        """The angle of the start of the arc, in degrees"""
+        if not self._parameterized:
+            self._parameterize()
+        return self._theta
+
+    @property
+    def delta(self) -> float:
+        """The angle the arc spans, in degrees"""
+        if not self._parameterized:
+            self._parameterize()
+        return self._delta
+
+    @property
+    def radius_scale(self) -> float:
+        """How much the radius is scaled up to reach from the start to the end"""
+        if not self._parameterized:
+            self._parameterize()
+        return self._radius_scale
+
     def _parameterize(self) -> None:
         # Conversion from endpoint to center parameterization
         # http://www.w3.org/TR/SVG/implnote.html#ArcImplementationNotes
-        if self.start == self.end:
-            # This is equivalent of omitting the segment, so do nothing
+        cosr = self._cosr = cos(radians(self._rotation))
+        sinr = self._sinr = sin(radians(self._rotation))
+
+        if self._start == self._end or self._radius.real == 0 or self._radius.imag == 0:
+            # The arc is empty or a straight line, and has no center
+            self._center = (self._start + self._end) / 2
+            self._theta = 0.0
+            self._delta = 0.0
+            self._radius_scale = 1.0
+            self._parameterized = True
             return
 
-        if self.radius.real == 0 or self.radius.imag == 0:
-            # This should be treated as a straight line
-            return
-
-        cosr = cos(radians(self.rotation))
-        sinr = sin(radians(self.rotation))
-        dx = (self.start.real - self.end.real) / 2
-        dy = (self.start.imag - self.end.imag) / 2
+        dx = (self._start.real - self._end.real) / 2
+        dy = (self._start.imag - self._end.imag) / 2
         x1prim = cosr * dx + sinr * dy
         x1prim_sq = x1prim * x1prim
         y1prim = -sinr * dx + cosr * dy
         y1prim_sq = y1prim * y1prim
 
-        rx = self.radius.real
+        rx = self._radius.real
         rx_sq = rx * rx
-        ry = self.radius.imag
+        ry = self._radius.imag
         ry_sq = ry * ry
 
         # Correct out of range radii
@@ -606,90 +1626,176 @@ class Arc(NonLinear):
             ry *= radius_scale
             rx_sq = rx * rx
             ry_sq = ry * ry
-            self.radius_scale = radius_scale
+            self._radius_scale = radius_scale
         else:
             # SVG spec only scales UP
-            self.radius_scale = 1
+            self._radius_scale = 1
 
-        t1 = rx_sq * y1prim_sq
-        t2 = ry_sq * x1prim_sq
-        c = sqrt(abs((rx_sq * ry_sq - t1 - t2) / (t1 + t2)))
+        if self._radius_scale > 1:
+            # The ends are on opposite sides of the scaled ellipse
+            c = 0.0
+        else:
+            t1 = rx_sq * y1prim_sq
+            t2 = ry_sq * x1prim_sq
+            c = sqrt(abs((rx_sq * ry_sq - t1 - t2) / (t1 + t2)))
 
-        if self.arc == self.sweep:
+        if self._arc == self._sweep:
             c = -c
         cxprim = c * rx * y1prim / ry
         cyprim = -c * ry * x1prim / rx
 
-        self.center = complex(
-            (cosr * cxprim - sinr * cyprim) + ((self.start.real + self.end.real) / 2),
-            (sinr * cxprim + cosr * cyprim) + ((self.start.imag + self.end.imag) / 2),
+        self._center = complex(
+            (cosr * cxprim - sinr * cyprim) + ((self._start.real + self._end.real) / 2),
+            (sinr * cxprim + cosr * cyprim) + ((self._start.imag + self._end.imag) / 2),
         )
 
         ux = (x1prim - cxprim) / rx
         uy = (y1prim - cyprim) / ry
         vx = (-x1prim - cxprim) / rx
         vy = (-y1prim - cyprim) / ry
-        n = sqrt(ux * ux + uy * uy)
-        p = ux
-        theta = degrees(acos(p / n))
-        if uy < 0:
-            theta = -theta
-        self.theta = theta % 360
-
-        n = sqrt((ux * ux + uy * uy) * (vx * vx + vy * vy))
-        p = ux * vx + uy * vy
-        d = p / n
-        # In certain cases the above calculation can through inaccuracies
-        # become just slightly out of range, f ex -1.0000000000000002.
-        if d > 1.0:
-            d = 1.0
-        elif d < -1.0:
-            d = -1.0
-        delta = degrees(acos(d))
-        if (ux * vy - uy * vx) < 0:
-            delta = -delta
-        self.delta = delta % 360
-        if not self.sweep:
-            self.delta -= 360
+        # The arc tangent is accurate for all angles, unlike the arc cosine
+        self._theta = degrees(atan2(uy, ux)) % 360
+        delta = degrees(atan2(ux * vy - uy * vx, ux * vx + uy * vy))
+        self._delta = delta % 360
+        if not self._sweep:
+            self._delta -= 360
+        self._parameterized = True
 
     def point(self, pos: float) -> complex:
-        if self.start == self.end:
+        if self._start == self._end:
             # This is equivalent of omitting the segment
-            return self.start
+            return self._start
 
-        if self.radius.real == 0 or self.radius.imag == 0:
+        if self._radius.real == 0 or self._radius.imag == 0:
             # This should be treated as a straight line
-            distance = self.end - self.start
-            return self.start + distance * pos
+            distance = self._end - self._start
+            return self._start + distance * pos
 
-        angle = radians(self.theta + (self.delta * pos))
-        cosr = cos(radians(self.rotation))
-        sinr = sin(radians(self.rotation))
-        radius = self.radius * self.radius_scale
+        if not self._parameterized:
+            self._parameterize()
+        angle = radians(self._theta + (self._delta * pos))
+        cosr = self._cosr
+        sinr = self._sinr
+        radius = self._radius * self._radius_scale
 
         x = (
             cosr * cos(angle) * radius.real
             - sinr * sin(angle) * radius.imag
-            + self.center.real
+            + self._center.real
         )
         y = (
             sinr * cos(angle) * radius.real
             + cosr * sin(angle) * radius.imag
-            + self.center.imag
+            + self._center.imag
         )
         return complex(x, y)
 
     def tangent(self, pos: float) -> complex:
-        angle = radians(self.theta + (self.delta * pos))
-        cosr = cos(radians(self.rotation))
-        sinr = sin(radians(self.rotation))
-        radius = self.radius * self.radius_scale
+        if self._start == self._end:
+            # This is equivalent of omitting the segment
+            return 0j
+
+        if self._radius.real == 0 or self._radius.imag == 0:
+            # This should be treated as a straight line
+            return self._end - self._start
+
+        if not self._parameterized:
+            self._parameterize()
+        angle = radians(self._theta + (self._delta * pos))
+        cosr = self._cosr
+        sinr = self._sinr
+        radius = self._radius * self._radius_scale
+
+        # The derivative of point() by the angle
+        x = -cosr * sin(angle) * radius.real - sinr * cos(angle) * radius.imag
+        y = -sinr * sin(angle) * radius.real + cosr * cos(angle) * radius.imag
+        return complex(x, y)
+
+    def point_many(self, positions: npt.ArrayLike) -> npt.NDArray[np.complex128]:
+        import numpy as np
+
+        pos = np.asarray(positions, dtype=np.float64)
+        if self.start == self.end:
+            # This is equivalent of omitting the segment
+            return np.full(pos.shape, self.start, dtype=np.complex128)
 
-        x = cosr * cos(angle) * radius.real - sinr * sin(angle) * radius.imag
-        y = sinr * cos(angle) * radius.real + cosr * sin(angle) * radius.imag
-        return complex(x, y) * complex(0, 1)
+        if self.radius.real == 0 or self.radius.imag == 0:
+            # This should be treated as a straight line
+            return np.asarray(self.start + (self.end - self.start) * pos)
+
+        if not self._parameterized:
+            self._parameterize()
+        angle = np.radians(self._theta + (self._delta * pos))
+        cos_angle = np.cos(angle)
+        sin_angle = np.sin(angle)
+        cosr = self._cosr
+        sinr = self._sinr
+        radius = self._radius * self._radius_scale
+
+        x = cosr * cos_angle * radius.real - sinr * sin_angle * radius.imag
+        y = sinr * cos_angle * radius.real + cosr * sin_angle * radius.imag
+        return self._center + (x + 1j * y)
+
+    def tangent_many(self, positions: npt.ArrayLike) -> npt.NDArray[np.complex128]:
+        import numpy as np
+
+        pos = np.asarray(positions, dtype=np.float64)
+        if self.start == self.end:
+            return np.zeros(pos.shape, dtype=np.complex128)
+
+        if self.radius.real == 0 or self.radius.imag == 0:
+            return np.full(pos.shape, self.end - self.start, dtype=np.complex128)
+
+        if not self._parameterized:
+            self._parameterize()
+        angle = np.radians(self._theta + (self._delta * pos))
+        cos_angle = np.cos(angle)
+        sin_angle = np.sin(angle)
+        cosr = self._cosr
+        sinr = self._sinr
+        radius = self._radius * self._radius_scale
+
+        x = -cosr * sin_angle * radius.real - sinr * cos_angle * radius.imag
+        y = -sinr * sin_angle * radius.real + cosr * cos_angle * radius.imag
+        return np.asarray(x + 1j * y)
+
+    def flatten(
+        self, tolerance: float = FLATTEN_TOLERANCE
+    ) -> npt.NDArray[np.complex128]:
+        """Flattens the arc with evenly spaced angles
+
+        A chord spanning the angle a on a circle with the radius r is at most
+        r * (1 - cos(a / 2)) from the circle. Using the largest radius of the
+        ellipse gives the largest angle that keeps that within the tolerance.
+        """
+        import numpy as np
+
+        if self.start == self.end:
+            # This is equivalent of omitting the segment
+            return np.array([self.start], dtype=np.complex128)
+
+        if self.radius.real == 0 or self.radius.imag == 0:
+            # This should be treated as a straight line
+            return np.array([self.start, self.end], dtype=np.complex128)
 
-    def length(self, error: float = ERROR, min_depth: int = MIN_DEPTH) -> float:
+        radius = max(abs(self.radius.real), abs(self.radius.imag)) * self.radius_scale
+        if tolerance >= radius:
+            step = pi
+        else:
+            step = 2 * acos(1 - tolerance / radius)
+        count = max(math.ceil(abs(radians(self.delta)) / step), 1)
+        points = self.point_many(np.linspace(0.0, 1.0, count + 1))
+        # Make the ends exact
+        points[0] = self.start
+        points[-1] = self.end
+        return points
+
+    def length(
+        self,
+        error: float = ERROR,
+        min_depth: int = MIN_DEPTH,
+        method: str = SUBDIVISION,
+    ) -> float:
         """The length of an elliptical arc segment requires numerical
         integration, and in that case it's simpler to just do a geometric
         approximation, as for cubic bezier curves.
@@ -708,9 +1814,10 @@ class Arc(NonLinear):
             radius = self.radius.real * self.radius_scale
             return abs(radius * self.delta * pi / 180)
 
-        start_point = self.point(0)
-        end_point = self.point(1)
-        return segment_length(self, 0, 1, start_point, end_point, error, min_depth, 0)
+        if method == QUADRATURE:
+            scale = _tangent_scale(self)
+            return scale * _curve_length(self, error / scale, min_depth, method)
+        return _curve_length(self, error, min_depth, method)
 
     def boundingbox(self) -> List[float]:
         """Calculate the bounding box of an arc
@@ -728,9 +1835,43 @@ class Arc(NonLinear):
         where pos ranges from 0 to 1
         """
 
+        if self.start == self.end:
+            # This is equivalent of omitting the segment
+            return [self.start.real, self.start.imag] * 2
+
+        if self.radius.real == 0 or self.radius.imag == 0:
+            # This should be treated as a straight line
+            x_min = min(self.start.real, self.end.real)
+            x_max = max(self.start.real, self.end.real)
+            y_min = min(self.start.imag, self.end.imag)
+            y_max = max(self.start.imag, self.end.imag)
+            return [x_min, y_min, x_max, y_max]
+
+        x_turns, y_turns = self._turns()
+        # The ends are exact, so boxes of joined segments meet
+        x_coords = [self.start.real, self.end.real]
+        y_coords = [self.start.imag, self.end.imag]
+        for pos in x_turns:
+            p = self.point(pos)
+            x_coords.append(p.real)
+        for pos in y_turns:
+            p = self.point(pos)
+            y_coords.append(p.imag)
+
+        x_min, x_max = min(x_coords), max(x_coords)
+        y_min, y_max = min(y_coords), max(y_coords)
+        return [x_min, y_min, x_max, y_max]
+
+    def _turns(self) -> Tuple[List[float], List[float]]:
+        """The positions where x'(angle) is zero, and where y'(angle) is zero
+
+        The arc must be drawn, with a radius that isn't zero.
+        """
         # angle = radians(self.theta + (self.delta * pos))
-        cosr = cos(radians(self.rotation))
-        sinr = sin(radians(self.rotation))
+        if not self._parameterized:
+            self._parameterize()
+        cosr = self._cosr
+        sinr = self._sinr
         radius = self.radius * self.radius_scale
 
         x_a = -cosr * radius.real
@@ -743,21 +1884,97 @@ class Arc(NonLinear):
         y_c = radians(self.theta)
         y_d = radians(self.delta)
 
-        x_pos = [0, 1.0] + _find_solutions_for_arc(x_a, x_b, x_c, x_d)
-        y_pos = [0, 1.0] + _find_solutions_for_arc(y_a, y_b, y_c, y_d)
+        return (
+            _find_solutions_for_arc(x_a, x_b, x_c, x_d),
+            _find_solutions_for_arc(y_a, y_b, y_c, y_d),
+        )
 
-        x_coords = []
-        y_coords = []
-        for pos in x_pos:
-            p = self.point(pos)
-            x_coords.append(p.real)
-        for pos in y_pos:
-            p = self.point(pos)
-            y_coords.append(p.imag)
+    def closest_point(self, point: complex) -> Tuple[float, complex, float]:
+        """Returns the position, point and distance on the arc closest to a point
 
-        x_min, x_max = min(x_coords), max(x_coords)
-        y_min, y_max = min(y_coords), max(y_coords)
-        return [x_min, y_min, x_max, y_max]
+        In the coordinates of the ellipse, the distance is the smallest where
+        the line from the point is perpendicular to the ellipse, which is a
+        quartic equation in the tangent of half the angle. The angles of its
+        roots are refined with Newton's method, as the substitution loses
+        precision near a half turn.
+        """
+        if self._start == self._end:
+            # This is equivalent of omitting the segment
+            return 0.0, self._start, abs(point - self._start)
+
+        if self._radius.real == 0 or self._radius.imag == 0:
+            # This should be treated as a straight line
+            return _closest_on_line(self._start, self._end, point)
+
+        if not self._parameterized:
+            self._parameterize()
+        rx = self._radius.real * self._radius_scale
+        ry = self._radius.imag * self._radius_scale
+        offset = point - self._center
+        u = self._cosr * offset.real + self._sinr * offset.imag
+        v = -self._sinr * offset.real + self._cosr * offset.imag
+
+        # The derivative of half the squared distance by the angle is
+        # f(angle) = k sin(angle) cos(angle) + rx u sin(angle) - ry v cos(angle)
+        k = ry * ry - rx * rx
+        quartic = [-ry * v, 2 * k + 2 * rx * u, 0.0, -2 * k + 2 * rx * u, ry * v]
+        # The tangent of half the angle is infinite at a half turn
+        angles = [pi]
+        bound = _root_bound(quartic)
+        for root in _real_roots(quartic, -bound, bound):
+            angles.append(2 * atan(root))
+
+        best = (0.0, self._start, abs(point - self._start))
+        end = (1.0, self._end, abs(point - self._end))
+        if end[2] < best[2]:
+            best = end
+        for angle in angles:
+            for _ in range(MAX_NEWTON_ITERATIONS):
+                s = sin(angle)
+                c = cos(angle)
+                value = k * s * c + rx * u * s - ry * v * c
+                slope = k * (c * c - s * s) + rx * u * c + ry * v * s
+                if slope == 0:
+                    break
+                step = value / slope
+                angle -= step
+                if abs(step) < 1e-15:
+                    break
+
+            pos = self._position(angle)
+            if pos is None:
+                continue
+            closest = self.point(pos)
+            distance = abs(point - closest)
+            if distance < best[2]:
+                best = (pos, closest, distance)
+        return best
+
+    def _transform(self, affine: Affine) -> None:
+        super()._transform(affine)
+        self.radius, self.rotation = _transform_radius(
+            affine, self.radius, self.rotation
+        )
+        a, b, c, d, _, _ = affine
+        if a * d - b * c < 0:
+            # A reflection turns the arc the other way
+            self.sweep = not self.sweep
+
+    def _position(self, angle: float, slack: float = 0.0) -> Union[float, None]:
+        """The position of an angle in radians on the arc, or None if it's not on it
+
+        Angles up to the slack outside of the arc are moved to its ends.
+        """
+        if self._delta > 0:
+            pos = (degrees(angle) - self._theta) % 360 / self._delta
+        else:
+            pos = (self._theta - degrees(angle)) % 360 / -self._delta
+        if pos <= 1 + slack:
+            return min(pos, 1.0)
+        if pos - 360 / abs(self._delta) >= -slack:
+            # Just before the start
+            return 0.0
+        return None
 
 
 class Move(PathSegment):
@@ -765,17 +1982,20 @@ class Move(PathSegment):
     paths that consist of only move commands, which is valid, but pointless.
     """
 
+    __slots__ = ()
+
     def __init__(self, to: complex, relative: bool = False) -> None:
-        self.start = self.end = to
+        self._start = self._end = to
         self.relative = relative
+        self._owners = None
 
     def __repr__(self) -> str:
-        return "Move(to=%s)" % self.start
+        return "Move(to=%s)" % self._start
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Move):
             return NotImplemented
-        return self.start == other.start
+        return self._start == other.start
 
     def __ne__(self, other: object) -> bool:
         if not isinstance(other, Move):
@@ -784,8 +2004,8 @@ class Move(PathSegment):
 
     def _d(self, previous: PathSegment) -> str:
         cmd = "M"
-        x = self.end.real
-        y = self.end.imag
+        x = self._end.real
+        y = self._end.imag
         if self.relative:
             cmd = "m"
             if previous:
@@ -794,44 +2014,1440 @@ class Move(PathSegment):
         return f"{cmd} {x:G},{y:G}"
 
     def point(self, pos: float) -> complex:
-        return self.start
+        return self._start
 
     def tangent(self, pos: float) -> complex:
         return 0j
 
-    def length(self, error: float = ERROR, min_depth: int = MIN_DEPTH) -> float:
+    def point_many(self, positions: npt.ArrayLike) -> npt.NDArray[np.complex128]:
+        import numpy as np
+
+        pos = np.asarray(positions, dtype=np.float64)
+        return np.full(pos.shape, self._start, dtype=np.complex128)
+
+    def tangent_many(self, positions: npt.ArrayLike) -> npt.NDArray[np.complex128]:
+        import numpy as np
+
+        pos = np.asarray(positions, dtype=np.float64)
+        return np.zeros(pos.shape, dtype=np.complex128)
+
+    def flatten(
+        self, tolerance: float = FLATTEN_TOLERANCE
+    ) -> npt.NDArray[np.complex128]:
+        import numpy as np
+
+        return np.array([self._start], dtype=np.complex128)
+
+    def length(
+        self,
+        error: float = ERROR,
+        min_depth: int = MIN_DEPTH,
+        method: str = SUBDIVISION,
+    ) -> float:
         return 0
 
     def boundingbox(self) -> List[float]:
-        x_min = min(self.start.real, self.end.real)
-        x_max = max(self.start.real, self.end.real)
-        y_min = min(self.start.imag, self.end.imag)
-        y_max = max(self.start.imag, self.end.imag)
+        x_min = min(self._start.real, self._end.real)
+        x_max = max(self._start.real, self._end.real)
+        y_min = min(self._start.imag, self._end.imag)
+        y_max = max(self._start.imag, self._end.imag)
         return [x_min, y_min, x_max, y_max]
 
+    def closest_point(self, point: complex) -> Tuple[float, complex, float]:
+        return 0.0, self._start, abs(point - self._start)
+
 
 class Close(Linear):
     """Represents the closepath command"""
 
+    __slots__ = ()
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Close):
             return NotImplemented
-        return self.start == other.start and self.end == other.end
+        return self._start == other.start and self._end == other.end
 
     def __repr__(self) -> str:
-        return f"Close(start={self.start}, end={self.end})"
+        return f"Close(start={self._start}, end={self._end})"
 
     def _d(self, previous: PathSegment) -> str:
         return "z" if self.relative else "Z"
 
     def boundingbox(self) -> List[float]:
-        x_min = min(self.start.real, self.end.real)
-        x_max = max(self.start.real, self.end.real)
-        y_min = min(self.start.imag, self.end.imag)
-        y_max = max(self.start.imag, self.end.imag)
+        x_min = min(self._start.real, self._end.real)
+        x_max = max(self._start.real, self._end.real)
+        y_min = min(self._start.imag, self._end.imag)
+        y_max = max(self._start.imag, self._end.imag)
         return [x_min, y_min, x_max, y_max]
 
 
+Box = Tuple[float, float, float, float]
+
+
+def _cross(a: complex, b: complex) -> float:
+    return a.real * b.imag - a.imag * b.real
+
+
+def _drawn(segment: PathSegment) -> bool:
+    """Whether a segment draws anything, unlike moves and empty segments"""
+    if isinstance(segment, Move):
+        return False
+    if isinstance(segment, CubicBezier):
+        return not segment.start == segment.control1 == segment.control2 == segment.end
+    if isinstance(segment, QuadraticBezier):
+        return not segment.start == segment.control == segment.end
+    return segment.start != segment.end
+
+
+def _joins(segments: List[PathSegment]) -> List[Union[int, None]]:
+    """The index of the drawn segment that starts where each segment ends
+
+    Only segments in the same subpath are joined, including the last and
+    the first segment of a closed subpath. A curve that closes a subpath on
+    its own joins itself.
+    """
+    subpaths: List[List[int]] = [[]]
+    for index, segment in enumerate(segments):
+        if isinstance(segment, Move):
+            subpaths.append([])
+            continue
+        if _drawn(segment):
+            subpaths[-1].append(index)
+        if isinstance(segment, Close):
+            subpaths.append([])
+
+    following: List[Union[int, None]] = [None] * len(segments)
+    for indexes in subpaths:
+        for index, next_index in zip(indexes, indexes[1:] + indexes[:1]):
+            if segments[index].end == segments[next_index].start:
+                following[index] = next_index
+    return following
+
+
+def _straight(segment: PathSegment) -> Union[Tuple[complex, complex], None]:
+    """The ends of a segment that is a straight line, or None for a curve"""
+    if isinstance(segment, Linear) or (
+        isinstance(segment, Arc)
+        and (segment.radius.real == 0 or segment.radius.imag == 0)
+    ):
+        return segment.start, segment.end
+    return None
+
+
+def _derivative(segment: PathSegment, pos: float) -> complex:
+    """The derivative of the point of a segment by the position"""
+    if isinstance(segment, Arc) and _straight(segment) is None:
+        # The tangent of an arc is the derivative by the angle
+        return segment.tangent(pos) * radians(segment.delta)
+    return segment.tangent(pos)
+
+
+def _unique(
+    found: List[Tuple[float, float, complex]], precision: float
+) -> List[Tuple[float, float, complex]]:
+    """Sorts intersections by the first position, without duplicates
+
+    Intersections are the same when they are at nearly the same point, and
+    at nearly the same positions, as a curve can cross the same point twice.
+    Where curves touch, the point is only found to the square root of the
+    precision. Of the same intersections, the first one is kept.
+    """
+    slack = sqrt(INTERSECTION_PRECISION)
+    near = precision / slack
+    unique: List[Tuple[float, float, complex]] = []
+    for t1, t2, point in found:
+        if not any(
+            abs(point - other[2]) <= near
+            and abs(t1 - other[0]) <= slack
+            and abs(t2 - other[1]) <= slack
+            for other in unique
+        ):
+            unique.append((t1, t2, point))
+    unique.sort(key=lambda intersection: intersection[:2])
+    return unique
+
+
+def _ends_on(
+    segment1: PathSegment,
+    segment2: PathSegment,
+    box1: Box,
+    box2: Box,
+    precision: float,
+) -> List[Tuple[float, float, complex]]:
+    """The ends of either segment that are on the other segment"""
+    found = []
+    for t1, point in ((0.0, segment1.start), (1.0, segment1.end)):
+        if _box_distance(box2, point) <= precision:
+            t2, _, distance = segment2.closest_point(point)
+            if distance <= precision:
+                found.append((t1, t2, complex(point)))
+    for t2, point in ((0.0, segment2.start), (1.0, segment2.end)):
+        if _box_distance(box1, point) <= precision:
+            t1, _, distance = segment1.closest_point(point)
+            if distance <= precision:
+                found.append((t1, t2, complex(point)))
+    return _unique(found, precision)
+
+
+def _overlaps(
+    segment1: PathSegment,
+    segment2: PathSegment,
+    ends: List[Tuple[float, float, complex]],
+    precision: float,
+) -> bool:
+    """Whether two segments overlap between the ends that are on the other
+
+    Segments overlap when at least two ends of them are on the other
+    segment, and so are the points of the first segment between them.
+    """
+    if len(ends) < 2:
+        return False
+    low = ends[0][0]
+    high = ends[-1][0]
+    for i in range(1, 4):
+        point = segment1.point(low + (high - low) * i / 4)
+        if segment2.closest_point(point)[2] > precision:
+            return False
+    return True
+
+
+def _intersect_lines(
+    start1: complex, end1: complex, start2: complex, end2: complex
+) -> List[Tuple[float, float, complex]]:
+    direction1 = end1 - start1
+    direction2 = end2 - start2
+    denominator = _cross(direction1, direction2)
+    if abs(denominator) <= POLYNOMIAL_PRECISION * abs(direction1) * abs(direction2):
+        # Parallel lines only meet where they overlap
+        return []
+    offset = start2 - start1
+    t1 = _cross(offset, direction2) / denominator
+    t2 = _cross(offset, direction1) / denominator
+    slack = INTERSECTION_PRECISION
+    if -slack <= t1 <= 1 + slack and -slack <= t2 <= 1 + slack:
+        t1 = min(max(0.0, t1), 1.0)
+        t2 = min(max(0.0, t2), 1.0)
+        return [(t1, t2, complex(start1 + direction1 * t1))]
+    return []
+
+
+def _intersect_line_bezier(
+    start: complex, end: complex, curve: NonLinear
+) -> List[Tuple[float, float, complex]]:
+    """Intersects a line with a Bezier curve
+
+    The positions on the curve are the roots of a polynomial, the distance
+    of the curve from the line, in the coordinates of the curve's power
+    basis.
+    """
+    assert isinstance(curve, (CubicBezier, QuadraticBezier))
+    coefficients = curve._power_basis()[: 4 if isinstance(curve, CubicBezier) else 3]
+    direction = end - start
+    length_sq = direction.real**2 + direction.imag**2
+    polynomial = [_cross(coefficients[0] - start, direction)]
+    polynomial += [_cross(c, direction) for c in coefficients[1:]]
+
+    found = []
+    slack = INTERSECTION_PRECISION
+    for t2 in _real_roots(polynomial, -slack, 1 + slack):
+        t2 = min(max(0.0, t2), 1.0)
+        point = curve.point(t2)
+        offset = point - start
+        t1 = (offset.real * direction.real + offset.imag * direction.imag) / length_sq
+        if -slack <= t1 <= 1 + slack:
+            found.append((min(max(0.0, t1), 1.0), t2, point))
+    return found
+
+
+def _intersect_line_arc(
+    start: complex, end: complex, arc: Arc
+) -> List[Tuple[float, float, complex]]:
+    """Intersects a line with an arc
+
+    In coordinates where the ellipse is the unit circle the intersections
+    are the roots of a quadratic equation in the position on the line.
+    """
+    center = arc.center
+    rx = arc.radius.real * arc.radius_scale
+    ry = arc.radius.imag * arc.radius_scale
+    cosr = arc._cosr
+    sinr = arc._sinr
+
+    def unit(point: complex) -> complex:
+        offset = point - center
+        return complex(
+            (cosr * offset.real + sinr * offset.imag) / rx,
+            (-sinr * offset.real + cosr * offset.imag) / ry,
+        )
+
+    origin = unit(start)
+    direction = unit(end) - origin
+    a = direction.real**2 + direction.imag**2
+    b = 2 * (origin.real * direction.real + origin.imag * direction.imag)
+    c = origin.real**2 + origin.imag**2 - 1
+    discriminant = b * b - 4 * a * c
+    if discriminant < 0:
+        if discriminant < -POLYNOMIAL_PRECISION * (b * b + abs(4 * a * c)):
+            return []
+        # The line touches the ellipse
+        discriminant = 0.0
+    # The numerically stable form of the quadratic formula
+    q = -(b + math.copysign(sqrt(discriminant), b)) / 2
+    roots = [q / a]
+    if q != 0:
+        roots.append(c / q)
+
+    found = []
+    slack = INTERSECTION_PRECISION
+    for t1 in roots:
+        if not -slack <= t1 <= 1 + slack:
+            continue
+        t1 = min(max(0.0, t1), 1.0)
+        point = origin + direction * t1
+        t2 = arc._position(atan2(point.imag, point.real), slack)
+        if t2 is not None:
+            found.append((t1, t2, arc.point(t2)))
+    return found
+
+
+class _Piece:
+    """A part of a curve, with the positions of its ends and a convex hull of it"""
+
+    __slots__ = ("start", "end", "hull", "box", "chord", "deviation")
+
+    def __init__(self, start: float, end: float, hull: List[complex]) -> None:
+        self.start = start
+        self.end = end
+        self.hull = hull
+        xs = [point.real for point in hull]
+        ys = [point.imag for point in hull]
+        self.box = (min(xs), min(ys), max(xs), max(ys))
+        first = hull[0]
+        chord = hull[-1] - first
+        self.chord = abs(chord)
+        # How far the piece can be from the straight line between its ends
+        length_sq = chord.real * chord.real + chord.imag * chord.imag
+        deviation = 0.0
+        for point in hull[1:-1]:
+            offset = point - first
+            t = offset.real * chord.real + offset.imag * chord.imag
+            if 0 < t < length_sq:
+                distance = abs(offset.real * chord.imag - offset.imag * chord.real)
+                distance /= self.chord
+            else:
+                distance = _segment_distance(point, first, hull[-1])
+            if distance > deviation:
+                deviation = distance
+        self.deviation = deviation
+
+    def split(self, curve: PathSegment) -> Tuple[_Piece, _Piece]:
+        mid = (self.start + self.end) / 2
+        if isinstance(curve, Arc):
+            return _arc_piece(curve, self.start, mid), _arc_piece(curve, mid, self.end)
+        # Splits the control points of a Bezier curve with de Casteljau's algorithm
+        hull = self.hull
+        first = [hull[0]]
+        second = [hull[-1]]
+        while len(hull) > 1:
+            hull = [(a + b) / 2 for a, b in zip(hull, hull[1:])]
+            first.append(hull[0])
+            second.append(hull[-1])
+        return _Piece(self.start, mid, first), _Piece(mid, self.end, second[::-1])
+
+
+def _arc_piece(arc: Arc, start: float, end: float) -> _Piece:
+    """The part of an arc between two positions
+
+    The tangents at the ends of a part of less than a half turn meet at a
+    point, and the part is inside the triangle of the ends and that point.
+    """
+    mid = arc.point((start + end) / 2)
+    center = arc.center
+    corner = center + (mid - center) / cos(radians(arc.delta * (end - start) / 2))
+    return _Piece(start, end, [arc.point(start), corner, arc.point(end)])
+
+
+def _pieces(curve: PathSegment) -> List[_Piece]:
+    if isinstance(curve, Arc):
+        count = max(1, ceil(abs(curve.delta) / 90))
+        return [_arc_piece(curve, i / count, (i + 1) / count) for i in range(count)]
+    if isinstance(curve, CubicBezier):
+        hull = [curve.start, curve.control1, curve.control2, curve.end]
+    else:
+        assert isinstance(curve, QuadraticBezier)
+        hull = [curve.start, curve.control, curve.end]
+    return [_Piece(0.0, 1.0, hull)]
+
+
+def _segment_box(segment: PathSegment) -> Box:
+    x_min, y_min, x_max, y_max = segment.boundingbox()
+    return x_min, y_min, x_max, y_max
+
+
+def _boxes_overlap(box1: Box, box2: Box, slack: float = 0.0) -> bool:
+    return (
+        box1[0] <= box2[2] + slack
+        and box2[0] <= box1[2] + slack
+        and box1[1] <= box2[3] + slack
+        and box2[1] <= box1[3] + slack
+    )
+
+
+def _chord_closest(
+    start1: complex, end1: complex, start2: complex, end2: complex
+) -> Tuple[float, float, float]:
+    """The positions and distance where two line segments are the closest"""
+    direction1 = end1 - start1
+    direction2 = end2 - start2
+    denominator = _cross(direction1, direction2)
+    if denominator != 0:
+        offset = start2 - start1
+        t1 = _cross(offset, direction2) / denominator
+        t2 = _cross(offset, direction1) / denominator
+        if 0 <= t1 <= 1 and 0 <= t2 <= 1:
+            return t1, t2, 0.0
+    # Otherwise one of the ends is the closest to the other line
+    t2, _, distance = _closest_on_line(start2, end2, start1)
+    best = (0.0, t2, distance)
+    t2, _, distance = _closest_on_line(start2, end2, end1)
+    if distance < best[2]:
+        best = (1.0, t2, distance)
+    t1, _, distance = _closest_on_line(start1, end1, start2)
+    if distance < best[2]:
+        best = (t1, 0.0, distance)
+    t1, _, distance = _closest_on_line(start1, end1, end2)
+    if distance < best[2]:
+        best = (t1, 1.0, distance)
+    return best
+
+
+def _refine(
+    curve1: PathSegment, curve2: PathSegment, t1: float, t2: float
+) -> Tuple[float, float]:
+    """Refines the positions of an intersection of two curves with Newton's method"""
+    for _ in range(MAX_INTERSECTION_ITERATIONS):
+        difference = curve2.point(t2) - curve1.point(t1)
+        if difference == 0:
+            break
+        derivative1 = _derivative(curve1, t1)
+        derivative2 = -_derivative(curve2, t2)
+        determinant = _cross(derivative1, derivative2)
+        if determinant == 0:
+            break
+        step1 = _cross(difference, derivative2) / determinant
+        step2 = _cross(derivative1, difference) / determinant
+        new_t1 = min(max(0.0, t1 + step1), 1.0)
+        new_t2 = min(max(0.0, t2 + step2), 1.0)
+        if new_t1 == t1 and new_t2 == t2:
+            break
+        t1, t2 = new_t1, new_t2
+    return t1, t2
+
+
+def _intersect_curves(
+    curve1: PathSegment, curve2: PathSegment, precision: float
+) -> List[Tuple[float, float, complex]]:
+    """Intersects two curves by subdivision
+
+    Both curves are split into pieces with convex hulls, the control points
+    of Bezier curves and triangles around arcs. Pairs of pieces whose hulls
+    are too far apart to intersect are skipped, and the others are split
+    until both are nearly straight. Then the intersection of the straight
+    lines is refined with Newton's method.
+    """
+    found = []
+    stack = [
+        (piece1, piece2, 0) for piece1 in _pieces(curve1) for piece2 in _pieces(curve2)
+    ]
+    while stack:
+        piece1, piece2, depth = stack.pop()
+        if not _boxes_overlap(piece1.box, piece2.box, precision):
+            continue
+        # Each piece is within its deviation from the line between its ends
+        hull1 = piece1.hull
+        hull2 = piece2.hull
+        s1, s2, distance = _chord_closest(hull1[0], hull1[-1], hull2[0], hull2[-1])
+        if distance > piece1.deviation + piece2.deviation + precision:
+            continue
+
+        flat1 = piece1.deviation <= max(piece1.chord * INTERSECTION_FLATNESS, precision)
+        flat2 = piece2.deviation <= max(piece2.chord * INTERSECTION_FLATNESS, precision)
+        if (flat1 and flat2) or depth >= MAX_INTERSECTION_DEPTH:
+            t1 = piece1.start + s1 * (piece1.end - piece1.start)
+            t2 = piece2.start + s2 * (piece2.end - piece2.start)
+            t1, t2 = _refine(curve1, curve2, t1, t2)
+            point = curve1.point(t1)
+            if abs(point - curve2.point(t2)) <= precision:
+                found.append((t1, t2, point))
+            continue
+
+        box1 = piece1.box
+        box2 = piece2.box
+        size1 = max(box1[2] - box1[0], box1[3] - box1[1])
+        size2 = max(box2[2] - box2[0], box2[3] - box2[1])
+        if flat1 or (not flat2 and size2 > size1):
+            for half in piece2.split(curve2):
+                stack.append((piece1, half, depth + 1))
+        else:
+            for half in piece1.split(curve1):
+                stack.append((half, piece2, depth + 1))
+    return found
+
+
+def intersections(
+    segment1: PathSegment, segment2: PathSegment
+) -> List[Tuple[float, float, complex]]:
+    """Returns the points where two segments intersect
+
+    Returns a list of the position on the first segment, the position on
+    the second segment and the point, sorted by the position on the first
+    segment. Where the segments overlap, only the ends of the overlapping
+    part are returned. Move segments, lines and arcs that start and end at
+    the same point, and curves that are only a point, aren't drawn and don't
+    intersect anything.
+    """
+    if not _drawn(segment1) or not _drawn(segment2):
+        return []
+    return _intersect(
+        segment1, segment2, _segment_box(segment1), _segment_box(segment2)
+    )
+
+
+def _intersect(
+    segment1: PathSegment, segment2: PathSegment, box1: Box, box2: Box
+) -> List[Tuple[float, float, complex]]:
+    """Intersects two drawn segments, with their bounding boxes"""
+    if not _boxes_overlap(box1, box2):
+        return []
+    size = max(
+        max(box1[2], box2[2]) - min(box1[0], box2[0]),
+        max(box1[3], box2[3]) - min(box1[1], box2[1]),
+    )
+    precision = size * INTERSECTION_PRECISION
+
+    # The ends are found separately, as the other methods can miss them when
+    # the segments only touch, or overlap
+    ends = _ends_on(segment1, segment2, box1, box2, precision)
+    if _overlaps(segment1, segment2, ends, precision):
+        return ends
+
+    line1 = _straight(segment1)
+    line2 = _straight(segment2)
+    if line1 is not None and line2 is not None:
+        found = _intersect_lines(*line1, *line2)
+    elif line1 is not None or line2 is not None:
+        if line1 is not None:
+            line, curve, swapped = line1, segment2, False
+        else:
+            assert line2 is not None
+            line, curve, swapped = line2, segment1, True
+        if isinstance(curve, Arc):
+            found = _intersect_line_arc(*line, curve)
+        else:
+            assert isinstance(curve, NonLinear)
+            found = _intersect_line_bezier(*line, curve)
+        if swapped:
+            found = [(t2, t1, point) for t1, t2, point in found]
+    else:
+        found = _intersect_curves(segment1, segment2, precision)
+    return _unique(ends + found, precision)
+
+
+def _loop(curve: CubicBezier) -> Union[Tuple[float, float, complex], None]:
+    """The point where a cubic curve crosses itself, if it makes a loop
+
+    With P(t) = a + b t + c t^2 + d t^3, two positions s and t at the same
+    point satisfy (P(s) - P(t)) / (s - t) = b + c u + d (u^2 - v) = 0, where
+    u = s + t and v = s t. The cross product with d gives u, and then the dot
+    product gives v.
+    """
+    _, b, c, d, _, _, _ = curve._power_basis()
+    denominator = _cross(d, c)
+    if denominator == 0:
+        return None
+    u = -_cross(d, b) / denominator
+    v = u * u + ((c * u + b) * d.conjugate()).real / abs(d) ** 2
+    discriminant = u * u - 4 * v
+    if discriminant <= INTERSECTION_PRECISION:
+        # No loop, or a cusp
+        return None
+    root = sqrt(discriminant)
+    t1 = (u - root) / 2
+    t2 = (u + root) / 2
+    if t1 < 0 or t2 > 1:
+        return None
+    return t1, t2, curve.point(t1)
+
+
+def _monotone(segment: PathSegment) -> List[Tuple[float, complex]]:
+    """The positions and points of the ends of a segment, and of its extrema
+
+    Between them the segment only goes one way in x and in y.
+    """
+    positions = [0.0, 1.0]
+    if isinstance(segment, (CubicBezier, QuadraticBezier, Arc)) and (
+        _straight(segment) is None
+    ):
+        x_turns, y_turns = segment._turns()
+        positions = sorted(set(positions + x_turns + y_turns))
+    # The ends are exact, so pieces of joined segments meet
+    points = [segment.start] + [segment.point(t) for t in positions[1:-1]]
+    return list(zip(positions, points + [segment.end]))
+
+
+def _monotone_boxes(segment: PathSegment) -> List[Box]:
+    """The bounding boxes of the pieces of a segment between its extrema
+
+    Each piece only goes one way in x and in y, so the ends of a piece are
+    the corners of its bounding box.
+    """
+    ends = [point for _, point in _monotone(segment)]
+    return [
+        (
+            min(start.real, end.real),
+            min(start.imag, end.imag),
+            max(start.real, end.real),
+            max(start.imag, end.imag),
+        )
+        for start, end in zip(ends, ends[1:])
+    ]
+
+
+def _x_at(
+    segment: PathSegment,
+    y: float,
+    start: Tuple[float, complex],
+    end: Tuple[float, complex],
+) -> float:
+    """Where a piece of a segment between its extrema reaches a height
+
+    The piece goes from the position and point start to end, and y must be
+    between them. The height is solved for exactly: lines are linear,
+    Bezier curves are polynomials, and arcs are cosines of the angle.
+    """
+    (t0, point0), (t1, point1) = start, end
+    if _straight(segment) is not None:
+        return point0.real + (y - point0.imag) * (point1.real - point0.real) / (
+            point1.imag - point0.imag
+        )
+    if isinstance(segment, Arc):
+        # y = center + a cos(angle) + b sin(angle) = center + size cos(angle - phase)
+        radius = segment.radius * segment.radius_scale
+        a = segment._sinr * radius.real
+        b = segment._cosr * radius.imag
+        phase = atan2(b, a)
+        cosine = (y - segment.center.imag) / sqrt(a * a + b * b)
+        angle = acos(min(max(cosine, -1.0), 1.0))
+        found = [
+            position
+            for position in (
+                segment._position(phase + angle, INTERSECTION_PRECISION),
+                segment._position(phase - angle, INTERSECTION_PRECISION),
+            )
+            if position is not None
+        ]
+    else:
+        assert isinstance(segment, (CubicBezier, QuadraticBezier))
+        size = 4 if isinstance(segment, CubicBezier) else 3
+        coefficients = [c.imag for c in segment._power_basis()[:size]]
+        coefficients[0] -= y
+        found = _real_roots(coefficients, t0, t1)
+    if not found:
+        # Rounding can lose a root at the ends
+        found = [t0 if abs(point0.imag - y) <= abs(point1.imag - y) else t1]
+    # The root in the piece, or the closest one
+    t = min(found, key=lambda position: max(t0 - position, position - t1))
+    return segment.point(t).real
+
+
+def _winding(segment: PathSegment, point: complex) -> int:
+    """How many times a segment winds around a point
+
+    A ray from the point towards positive x is crossed upwards once for
+    every turn of the path around the point, more than downwards. Each
+    piece of the segment between its extrema can only cross it once. A
+    piece counts from the bottom of its height up to but not including the
+    top, so a ray through the point where two pieces meet crosses one.
+    """
+    winding = 0
+    ends = _monotone(segment)
+    for start, end in zip(ends, ends[1:]):
+        y0 = start[1].imag
+        y1 = end[1].imag
+        if not min(y0, y1) <= point.imag < max(y0, y1):
+            continue
+        x0 = start[1].real
+        x1 = end[1].real
+        if min(x0, x1) <= point.real and (
+            max(x0, x1) <= point.real
+            or _x_at(segment, point.imag, start, end) <= point.real
+        ):
+            continue
+        winding += 1 if y1 > y0 else -1
+    return winding
+
+
+def _winding_many(
+    segment: PathSegment,
+    xs: npt.NDArray[np.float64],
+    ys: npt.NDArray[np.float64],
+    indexes: npt.NDArray[np.intp],
+    winding: npt.NDArray[np.intp],
+) -> None:
+    """Adds how many times a segment winds around points to their winding
+
+    The points are in xs and ys, sorted by y, and their winding is at the
+    indexes. Like _winding(), but the points that reach each piece of the
+    segment are found by a binary search, and only the points inside the
+    box of a piece need to solve where it crosses their height.
+    """
+    import numpy as np
+
+    ends = _monotone(segment)
+    for start, end in zip(ends, ends[1:]):
+        y0 = start[1].imag
+        y1 = end[1].imag
+        first, last = np.searchsorted(ys, [min(y0, y1), max(y0, y1)])
+        if first == last:
+            continue
+        x = xs[first:last]
+        x0 = start[1].real
+        x1 = end[1].real
+        crossed = x < min(x0, x1)
+        inside = np.flatnonzero(~crossed & (x < max(x0, x1)))
+        if len(inside):
+            if _straight(segment) is not None:
+                y = ys[first:last][inside]
+                crossing = x0 + (y - y0) * (x1 - x0) / (y1 - y0)
+            else:
+                crossing = np.array(
+                    [
+                        _x_at(segment, y, start, end)
+                        for y in ys[first:last][inside].tolist()
+                    ]
+                )
+            crossed[inside] = x[inside] < crossing
+        winding[indexes[first:last][crossed]] += 1 if y1 > y0 else -1
+
+
+def _closings(segments: List[PathSegment]) -> List[Line]:
+    """The lines that close the subpaths that don't end where they start
+
+    A filled subpath is closed with a straight line, like with a Close.
+    """
+    closings = []
+    start: Union[complex, None] = None
+    current: Union[complex, None] = None
+    for segment in segments + [Move(0j)]:
+        if isinstance(segment, Move):
+            if start is not None and current is not None and current != start:
+                closings.append(Line(current, start))
+            start = current = segment.end
+            continue
+        if start is None:
+            start = segment.start
+        current = segment.end
+    return closings
+
+
+def _green(segment: PathSegment, origin: complex) -> Tuple[float, complex]:
+    """The signed area and first moment a segment adds around an origin
+
+    By Green's theorem, the area of a closed path is the integral of
+    (x y' - y x') / 2 along it, and the first moment, the integral of the
+    point over the area, is the integral of the point times (x y' - y x') / 3.
+    The point is taken relative to the origin, so a line back to the origin
+    adds nothing, and a subpath needs no closing line when the origin is
+    where it starts.
+    """
+    if not _drawn(segment):
+        return 0.0, 0j
+    if isinstance(segment, Arc) and _straight(segment) is None:
+        return _green_arc(segment, origin)
+    if isinstance(segment, CubicBezier):
+        coefficients = list(segment._power_basis()[:4])
+    elif isinstance(segment, QuadraticBezier):
+        coefficients = list(segment._power_basis()[:3])
+    else:
+        coefficients = [segment.start, segment.end - segment.start]
+    coefficients[0] -= origin
+
+    # The coefficients of x y' - y x', the imaginary part of conj(p) p'
+    cross = [0.0] * (2 * len(coefficients) - 2)
+    for i, a in enumerate(coefficients):
+        for j, b in enumerate(coefficients[1:], 1):
+            cross[i + j - 1] += j * _cross(a, b)
+    area = sum(c / (k + 1) for k, c in enumerate(cross)) / 2
+    moment = sum(
+        a * c / (i + k + 1)
+        for i, a in enumerate(coefficients)
+        for k, c in enumerate(cross)
+    )
+    return area, moment / 3
+
+
+def _green_arc(arc: Arc, origin: complex) -> Tuple[float, complex]:
+    """The signed area and first moment an arc adds around an origin
+
+    In the frame of the ellipse, the point is d + (rx cos(a), ry sin(a)),
+    where d is the center relative to the origin, and x y' - y x' is
+    rx ry + dx ry cos(a) + dy rx sin(a), which integrates in closed form.
+    """
+    radius = arc.radius * arc.radius_scale
+    rx = radius.real
+    ry = radius.imag
+    rotation = complex(cos(radians(arc.rotation)), sin(radians(arc.rotation)))
+    d = (arc.center - origin) / rotation
+    a0 = radians(arc.theta)
+    a1 = a0 + radians(arc.delta)
+
+    # The integrals of cos, sin, cos^2, sin^2 and sin cos over the arc
+    cos1 = sin(a1) - sin(a0)
+    sin1 = cos(a0) - cos(a1)
+    double = (sin(2 * a1) - sin(2 * a0)) / 4
+    cos2 = (a1 - a0) / 2 + double
+    sin2 = (a1 - a0) / 2 - double
+    sincos = (sin(a1) ** 2 - sin(a0) ** 2) / 2
+
+    k = rx * ry
+    a = d.real * ry
+    b = d.imag * rx
+    cross = k * (a1 - a0) + a * cos1 + b * sin1
+    moment = d * cross + complex(
+        rx * (k * cos1 + a * cos2 + b * sincos),
+        ry * (k * sin1 + a * sincos + b * sin2),
+    )
+    return cross / 2, moment * rotation / 3
+
+
+def _touch(box1: Box, box2: Box, slack: float) -> bool:
+    """Whether two boxes overlap at most around a point"""
+    return (
+        min(box1[2], box2[2]) - max(box1[0], box2[0]) <= slack
+        and min(box1[3], box2[3]) - max(box1[1], box2[1]) <= slack
+    )
+
+
+def _tree_nodes(low: int, high: int, count: int) -> List[int]:
+    """The nodes of a segment tree with count leaves that cover low to high"""
+    nodes = []
+    low += count
+    high += count + 1
+    while low < high:
+        if low & 1:
+            nodes.append(low)
+            low += 1
+        if high & 1:
+            high -= 1
+            nodes.append(high)
+        low //= 2
+        high //= 2
+    return nodes
+
+
+def _sweep(boxes: List[Box]) -> List[Tuple[int, int]]:
+    """Finds the pairs of boxes that overlap, with a line sweeping across them
+
+    The boxes are added to the line in the order of their left side, and
+    removed when the line has passed their right side. The boxes on the line
+    are kept in a segment tree over the vertical coordinates, to find the
+    boxes that contain the top of a new box, and in a list sorted by their
+    tops, to find the boxes whose top is inside the new box. That way a new
+    box only looks at the boxes it overlaps.
+    """
+    rank = {y: i for i, y in enumerate(sorted({y for b in boxes for y in b[1::2]}))}
+    count = len(rank)
+    tree: List[Set[int]] = [set() for _ in range(2 * count)]
+    tops: List[Tuple[int, int]] = []
+    passing: List[Tuple[float, int]] = []
+    pairs: List[Tuple[int, int]] = []
+    for index in sorted(range(len(boxes)), key=lambda i: boxes[i][0]):
+        left, top, right, bottom = boxes[index]
+        while passing and passing[0][0] < left:
+            _, old = heappop(passing)
+            old_top = rank[boxes[old][1]]
+            for node in _tree_nodes(old_top, rank[boxes[old][3]], count):
+                tree[node].discard(old)
+            del tops[bisect_left(tops, (old_top, old))]
+
+        low = rank[top]
+        high = rank[bottom]
+        node = low + count
+        while node:
+            pairs.extend((other, index) for other in tree[node])
+            node //= 2
+        first = bisect_right(tops, (low, len(boxes)))
+        last = bisect_right(tops, (high, len(boxes)))
+        pairs.extend((other, index) for _, other in tops[first:last])
+
+        for node in _tree_nodes(low, high, count):
+            tree[node].add(index)
+        insort(tops, (low, index))
+        heappush(passing, (right, index))
+    return pairs
+
+
+def _tangent_scale(segment: PathSegment) -> float:
+    """The factor between the length of the tangent and the speed along the segment
+
+    The tangent of an arc is the derivative by the angle, not by the position,
+    so it needs to be scaled by the angle the arc spans.
+    """
+    if (
+        isinstance(segment, Arc)
+        and segment.start != segment.end
+        and segment.radius.real != 0
+        and segment.radius.imag != 0
+    ):
+        return abs(radians(segment.delta))
+    return 1.0
+
+
+def _groups(indexes: npt.NDArray[np.intp]) -> List[npt.NDArray[np.intp]]:
+    """Splits the positions of an array of indexes into groups of equal indexes"""
+    import numpy as np
+
+    order = np.argsort(indexes, kind="stable")
+    splits = np.flatnonzero(np.diff(indexes[order])) + 1
+    return [group for group in np.split(order, splits) if len(group)]
+
+
+class _LengthTable:
+    """The cumulative length of a segment at evenly spaced positions
+
+    This is used to find the position in the segment at a certain distance
+    from the start, by interpolating in the table and refining the result
+    with Newton's method. The lengths are integrated with adaptive
+    quadrature within the error, and the total is the length of the
+    segment, so that the positions agree with length() and t_at_length().
+    """
+
+    def __init__(self, segment: PathSegment, error: float = ERROR) -> None:
+        self.segment = segment
+        self.error = error
+        self.scale = _tangent_scale(segment)
+        # The error of the integral of the unscaled tangent
+        self.tangent_error = error / self.scale
+        # Lines are already parameterized by length
+        self.linear = isinstance(segment, (Linear, Move))
+        if self.linear:
+            self.intervals = 1
+            self.lengths = [0.0, segment.length()]
+        else:
+            self.intervals = LENGTH_TABLE_INTERVALS
+            self.lengths = [0.0]
+            for i in range(self.intervals - 1):
+                start = i / self.intervals
+                end = (i + 1) / self.intervals
+                self.lengths.append(self.lengths[-1] + self._length(start, end))
+            self.lengths.append(segment.length(error=error, method=QUADRATURE))
+        self.length = self.lengths[-1]
+
+    def _length(self, start: float, end: float) -> float:
+        """The length of the segment between two positions"""
+        estimate = _gauss_length(self.segment, start, end)
+        return self.scale * quadrature_length(
+            self.segment, start, end, estimate, self.tangent_error, 0
+        )
+
+    def position(self, distance: float, error: float = ERROR) -> float:
+        """The position in the segment at the distance from the start"""
+        if distance <= 0 or self.length == 0:
+            return 0.0
+        if distance >= self.length:
+            return 1.0
+
+        i = min(bisect(self.lengths, distance), self.intervals) - 1
+        start = i / self.intervals
+        end = (i + 1) / self.intervals
+        interval_start = self.lengths[i]
+        interval_length = self.lengths[i + 1] - interval_start
+        pos = start + (end - start) * (distance - interval_start) / interval_length
+        if self.linear:
+            return pos
+
+        for _ in range(MAX_NEWTON_ITERATIONS):
+            length = interval_start + self._length(start, pos)
+            difference = length - distance
+            if abs(difference) <= error:
+                break
+            speed = self.scale * abs(self.segment.tangent(pos))
+            if speed == 0:
+                break
+            pos = min(max(pos - difference / speed, start), end)
+        return pos
+
+    def positions(
+        self, distances: npt.NDArray[np.float64], error: float = ERROR
+    ) -> npt.NDArray[np.float64]:
+        """The vectorized version of position()"""
+        import numpy as np
+
+        if self.length == 0:
+            return np.zeros(distances.shape, dtype=np.float64)
+
+        distances = np.clip(distances, 0.0, self.length)
+        lengths = np.array(self.lengths)
+        i = np.searchsorted(lengths, distances, side="right") - 1
+        np.clip(i, 0, self.intervals - 1, out=i)
+        start = i / self.intervals
+        interval_start = lengths[i]
+        interval_length = lengths[i + 1] - interval_start
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fraction = (distances - interval_start) / interval_length
+        pos = start + np.nan_to_num(fraction) / self.intervals
+        if self.linear:
+            return np.asarray(pos)
+
+        nodes, weights = np.array(GAUSS_LEGENDRE).T
+
+        def integral(
+            start: npt.NDArray[np.float64], end: npt.NDArray[np.float64]
+        ) -> npt.NDArray[np.float64]:
+            half = (end - start) / 2
+            samples = (start + half)[:, np.newaxis] + half[:, np.newaxis] * nodes
+            speeds = np.abs(self.segment.tangent_many(samples))
+            return np.asarray(half * (speeds @ weights))
+
+        for _ in range(MAX_NEWTON_ITERATIONS):
+            length = interval_start + self.scale * integral(start, pos)
+            difference = length - distances
+            if np.all(np.abs(difference) <= error):
+                break
+            speed = self.scale * np.abs(self.segment.tangent_many(pos))
+            step = np.divide(
+                difference, speed, out=np.zeros_like(difference), where=speed != 0
+            )
+            pos = np.clip(pos - step, start, start + 1 / self.intervals)
+
+        # A single rule is only accurate where the curve bends smoothly. Where
+        # the halves of the interval don't add up to the whole, the position
+        # is found again with the adaptive quadrature.
+        mid = (start + pos) / 2
+        halves = integral(start, mid) + integral(mid, pos)
+        inaccurate = np.abs(halves - integral(start, pos)) > self.tangent_error
+        for index in np.flatnonzero(inaccurate):
+            pos[index] = self.position(float(distances[index]), error)
+        return np.asarray(pos)
+
+
+T = TypeVar("T")
+
+
+def _box_union(box1: Union[Box, None], box2: Union[Box, None]) -> Union[Box, None]:
+    if box1 is None:
+        return box2
+    if box2 is None:
+        return box1
+    return (
+        min(box1[0], box2[0]),
+        min(box1[1], box2[1]),
+        max(box1[2], box2[2]),
+        max(box1[3], box2[3]),
+    )
+
+
+def _box_distance(box: Box, point: complex) -> float:
+    """The distance from a point to the nearest point in a box"""
+    dx = max(box[0] - point.real, 0.0, point.real - box[2])
+    dy = max(box[1] - point.imag, 0.0, point.imag - box[3])
+    return math.hypot(dx, dy)
+
+
+class ClosestPoint(NamedTuple):
+    """The point on a path closest to another point"""
+
+    # The index of the segment
+    segment: int
+    # The position in the segment, between 0 and 1
+    t: float
+    point: complex
+    distance: float
+
+
+class Intersection(NamedTuple):
+    """A point where two paths intersect"""
+
+    # The index of the segment and the position in it, in the first path
+    segment1: int
+    t1: float
+    # The index of the segment and the position in it, in the second path
+    segment2: int
+    t2: float
+    point: complex
+
+
+def _at_join(
+    segments: List[PathSegment],
+    joins: List[Union[int, None]],
+    index: int,
+    t: float,
+    precision: float,
+) -> Tuple[int, float]:
+    """Moves a point at the end of a segment to the start of the next
+
+    The point is at the end when it's nearly at the end position, or when
+    the segment doesn't go anywhere after it, as the position is only found
+    to the square root of the precision where a curve stops at its end.
+    """
+    join = joins[index]
+    if join is None or t < 1 - sqrt(INTERSECTION_PRECISION):
+        return index, t
+    segment = segments[index]
+    if (
+        t >= 1 - INTERSECTION_PRECISION
+        or abs(segment.point((t + 1) / 2) - segment.end) <= precision
+    ):
+        return join, 0.0
+    return index, t
+
+
+def _precision(box: Box) -> float:
+    """How close points in a box must be to be the same"""
+    return max(box[2] - box[0], box[3] - box[1]) * INTERSECTION_PRECISION
+
+
+def _add_unique(
+    found: Dict[Tuple[int, int], List[Intersection]], intersection: Intersection
+) -> None:
+    """Adds an intersection, unless it was found at nearly the same positions"""
+    same = found.setdefault((intersection.segment1, intersection.segment2), [])
+    if not any(
+        abs(intersection.t1 - known.t1) <= INTERSECTION_PRECISION
+        and abs(intersection.t2 - known.t2) <= INTERSECTION_PRECISION
+        for known in same
+    ):
+        same.append(intersection)
+
+
+def _sorted_intersections(
+    found: Dict[Tuple[int, int], List[Intersection]],
+) -> List[Intersection]:
+    return sorted(
+        (intersection for same in found.values() for intersection in same),
+        key=lambda intersection: intersection[:4],
+    )
+
+
+class _SegmentCache(ABC, Generic[T]):
+    """Values calculated for each segment of a path, and an aggregate of them
+
+    The values are only calculated when needed. When a segment is replaced
+    or changed, only its value is recalculated and the aggregate is updated
+    with it. Inserting or deleting segments moves the other values, so then
+    the aggregate is rebuilt, but still only the values of the new segments
+    are calculated.
+
+    Subclasses define how to calculate the value of a segment, and how to
+    build and update the aggregate.
+    """
+
+    def __init__(self, count: int) -> None:
+        self.values: List[Union[T, None]] = [None] * count
+        self.built = False
+        # Replaced segments, whose old values are still in the aggregate
+        self.changed: Set[int] = set()
+
+    @abstractmethod
+    def _calculate(self, segment: PathSegment) -> T:
+        """The value of a segment"""
+
+    @abstractmethod
+    def _build(self) -> None:
+        """Builds the aggregate from the values of all segments"""
+
+    @abstractmethod
+    def _update(self, index: int, old: T) -> None:
+        """Updates the aggregate after the value of a segment changed"""
+
+    def _invalidate(self) -> None:
+        # The indexes are about to move, so forget the replaced values now
+        for index in self.changed:
+            self.values[index] = None
+        self.changed.clear()
+        self.built = False
+
+    def replace(self, index: int) -> None:
+        index = range(len(self.values))[index]
+        if self.built:
+            self.changed.add(index)
+        else:
+            self.values[index] = None
+
+    def replace_slice(self, index: slice, count: int) -> None:
+        self._invalidate()
+        self.values[index] = [None] * count
+
+    def delete(self, index: Union[int, slice]) -> None:
+        self._invalidate()
+        del self.values[index]
+
+    def insert(self, index: int) -> None:
+        self._invalidate()
+        self.values.insert(index, None)
+
+    def refresh(self, segments: List[PathSegment]) -> None:
+        values = self.values
+        if not self.built:
+            for i, value in enumerate(values):
+                if value is None:
+                    values[i] = self._calculate(segments[i])
+            self._build()
+            self.built = True
+        for index in self.changed:
+            old = values[index]
+            assert old is not None
+            values[index] = self._calculate(segments[index])
+            self._update(index, old)
+        self.changed.clear()
+
+
+class _BoundingBoxes(_SegmentCache[Box]):
+    """The bounding boxes of the segments, and their union in a segment tree"""
+
+    def __init__(self, count: int) -> None:
+        super().__init__(count)
+        self.tree: List[Union[Box, None]] = []
+
+    def _calculate(self, segment: PathSegment) -> Box:
+        return _segment_box(segment)
+
+    def _build(self) -> None:
+        size = 1
+        while size < len(self.values):
+            size *= 2
+        padding: List[Union[Box, None]] = [None] * (size - len(self.values))
+        tree = self.tree = [None] * size + self.values + padding
+        for i in range(size - 1, 0, -1):
+            tree[i] = _box_union(tree[2 * i], tree[2 * i + 1])
+
+    def _update(self, index: int, old: Box) -> None:
+        tree = self.tree
+        i = len(tree) // 2 + index
+        tree[i] = self.values[index]
+        i //= 2
+        while i:
+            tree[i] = _box_union(tree[2 * i], tree[2 * i + 1])
+            i //= 2
+
+    def union(self, segments: List[PathSegment]) -> Union[Box, None]:
+        self.refresh(segments)
+        return self.tree[1]
+
+    def closest(
+        self, segments: List[PathSegment], point: complex
+    ) -> Union[ClosestPoint, None]:
+        """Finds the point on the segments closest to a point
+
+        The nodes of the tree are searched in the order of the distance to
+        their boxes, and the search stops when the closest box is further
+        away than the closest point found. Move segments are skipped, as
+        they aren't drawn.
+        """
+        best: Union[ClosestPoint, None] = None
+        if not segments:
+            return best
+        self.refresh(segments)
+        tree = self.tree
+        leaves = len(tree) // 2
+        heap = [(0.0, 1)]
+        while heap:
+            bound, node = heappop(heap)
+            if best is not None and bound > best.distance:
+                break
+            if node >= leaves:
+                index = node - leaves
+                segment = segments[index]
+                if isinstance(segment, Move):
+                    continue
+                t, closest, distance = segment.closest_point(point)
+                if best is None or distance < best.distance:
+                    best = ClosestPoint(index, t, closest, distance)
+                continue
+            for child in (2 * node, 2 * node + 1):
+                box = tree[child]
+                if box is not None:
+                    heappush(heap, (_box_distance(box, point), child))
+        return best
+
+    def overlapping(
+        self,
+        segments: List[PathSegment],
+        other: _BoundingBoxes,
+        other_segments: List[PathSegment],
+    ) -> List[Tuple[int, int]]:
+        """Finds the pairs of segments of two paths whose bounding boxes overlap
+
+        Both trees are searched together from the root, and when the boxes
+        of two nodes don't overlap, none of the pairs of their segments are
+        looked at.
+        """
+        self.refresh(segments)
+        other.refresh(other_segments)
+        tree1 = self.tree
+        tree2 = other.tree
+        leaves1 = len(tree1) // 2
+        leaves2 = len(tree2) // 2
+        pairs = []
+        stack = [(1, 1)]
+        while stack:
+            node1, node2 = stack.pop()
+            box1 = tree1[node1]
+            box2 = tree2[node2]
+            if box1 is None or box2 is None or not _boxes_overlap(box1, box2):
+                continue
+            leaf1 = node1 >= leaves1
+            leaf2 = node2 >= leaves2
+            if leaf1 and leaf2:
+                pairs.append((node1 - leaves1, node2 - leaves2))
+            elif leaf2 or (
+                not leaf1
+                and box1[2] - box1[0] + box1[3] - box1[1]
+                >= box2[2] - box2[0] + box2[3] - box2[1]
+            ):
+                # Splits the larger box
+                stack.append((2 * node1 + 1, node2))
+                stack.append((2 * node1, node2))
+            else:
+                stack.append((node1, 2 * node2 + 1))
+                stack.append((node1, 2 * node2))
+        return pairs
+
+    def winding(self, segments: List[PathSegment], point: complex) -> int:
+        """Counts how many times the segments wind around a point
+
+        Only the nodes of the tree whose boxes reach the ray from the point
+        towards positive x are searched.
+        """
+        self.refresh(segments)
+        tree = self.tree
+        leaves = len(tree) // 2
+        winding = 0
+        stack = [1]
+        while stack:
+            node = stack.pop()
+            box = tree[node]
+            if (
+                box is None
+                or box[2] <= point.real
+                or not box[1] <= point.imag <= box[3]
+            ):
+                continue
+            if node < leaves:
+                stack.append(2 * node + 1)
+                stack.append(2 * node)
+                continue
+            segment = segments[node - leaves]
+            if _drawn(segment):
+                winding += _winding(segment, point)
+        return winding
+
+
+class _CumulativeCache(_SegmentCache[T]):
+    """Segment values with a length, with the cumulative lengths in a Fenwick tree
+
+    The Fenwick tree finds the segment at a distance from the start of the
+    path, and updates the distances after a replaced segment, in O(log n).
+    """
+
+    def __init__(self, count: int) -> None:
+        super().__init__(count)
+        self.tree: List[float] = []
+
+    @abstractmethod
+    def _length(self, value: T) -> float:
+        """The length of the value of a segment"""
+
+    def _calculated_length(self, value: Union[T, None]) -> float:
+        # All the values are calculated before the tree is built
+        assert value is not None
+        return self._length(value)
+
+    def _build(self) -> None:
+        tree = self.tree = [0.0] + [self._calculated_length(v) for v in self.values]
+        count = len(self.values)
+        for i in range(1, count + 1):
+            parent = i + (i & -i)
+            if parent <= count:
+                tree[parent] += tree[i]
+
+    def _update(self, index: int, old: T) -> None:
+        new = self.values[index]
+        assert new is not None
+        difference = self._length(new) - self._length(old)
+        tree = self.tree
+        i = index + 1
+        while i < len(tree):
+            tree[i] += difference
+            i += i & -i
+
+    def lengths(self) -> List[float]:
+        return [self._calculated_length(v) for v in self.values]
+
+    def distance(self, count: int) -> float:
+        """The total length of the first count segments"""
+        tree = self.tree
+        total = 0.0
+        while count > 0:
+            total += tree[count]
+            count -= count & -count
+        return total
+
+    def total(self) -> float:
+        return self.distance(len(self.values))
+
+    def find(self, distance: float) -> Tuple[int, float]:
+        """The segment at a distance from the start, and the distance into it
+
+        This is the index of the first segment ending after the distance, or
+        the last segment if there are none.
+        """
+        tree = self.tree
+        last = len(self.values) - 1
+        index = 0
+        step = 1
+        while step * 2 <= last:
+            step *= 2
+        while step:
+            if index + step <= last and tree[index + step] <= distance:
+                index += step
+                distance -= tree[index]
+            step //= 2
+        return index, distance
+
+
+class _SegmentLengths(_CumulativeCache[float]):
+    """The lengths of the segments"""
+
+    def __init__(self, count: int, error: float, min_depth: int, method: str) -> None:
+        super().__init__(count)
+        self.error = error
+        self.min_depth = min_depth
+        self.method = method
+
+    def _calculate(self, segment: PathSegment) -> float:
+        return segment.length(
+            error=self.error, min_depth=self.min_depth, method=self.method
+        )
+
+    def _length(self, value: float) -> float:
+        return value
+
+
+class _LengthTables(_CumulativeCache[_LengthTable]):
+    """The arc length tables of the segments"""
+
+    def __init__(self, count: int, error: float) -> None:
+        super().__init__(count)
+        self.error = error
+
+    def _calculate(self, segment: PathSegment) -> _LengthTable:
+        return _LengthTable(segment, self.error)
+
+    def _length(self, value: _LengthTable) -> float:
+        return value.length
+
+
 if TYPE_CHECKING:
 
     class PathType(MutableSequence[PathSegment]):
@@ -848,10 +3464,118 @@ class Path(PathType):
 
     def __init__(self, *segments: PathSegment) -> None:
         self._segments: list[PathSegment] = list(segments)
+        # The total length, or None when it must be updated
         self._length: Union[float, None] = None
-        self._lengths: Union[List[float], None] = None
-        # Fractional distance from starting point through the end of each segment.
-        self._fractions: List[float] = []
+        # The method used to calculate the lengths of the curves
+        self._length_method = SUBDIVISION
+        # The caches of segment lengths, arc length tables and bounding boxes
+        # are created the first time they are needed, and then kept up to
+        # date as the path changes.
+        self._segment_lengths: Union[_SegmentLengths, None] = None
+        self._tables: Union[_LengthTables, None] = None
+        self._boxes: Union[_BoundingBoxes, None] = None
+        # The lines that close the subpaths when the path is filled
+        self._closing_lines: Union[List[Line], None] = None
+        # When the path has caches, its segments tell it when they change,
+        # through this reference to it. The indexes of the segments, by
+        # their id, are only found when one changes.
+        self._owner: Union[weakref.ref[Path], None] = None
+        self._positions: Union[Dict[int, List[int]], None] = None
+        # The segment indexes the path is in, which are told about changed
+        # segments in turn
+        self._indexes: Union[weakref.WeakSet[SegmentIndex], None] = None
+        # Segments shared with other paths, by id, and the tuple of them that
+        # keeps them alive. They are copied before they are handed out, so
+        # changing them doesn't change the other paths.
+        self._shared: FrozenSet[int] = frozenset()
+        self._shared_segments: Tuple[PathSegment, ...] = ()
+
+    @classmethod
+    def _from_shared(
+        cls, segments: Tuple[PathSegment, ...], ids: FrozenSet[int]
+    ) -> Path:
+        """Creates a path that shares the segments, copying them on access"""
+        path = cls(*segments)
+        path._shared = ids
+        path._shared_segments = segments
+        return path
+
+    def _unshare(self, index: int) -> PathSegment:
+        segment = self._segments[index]
+        if id(segment) in self._shared:
+            segment = self._segments[index] = copy.copy(segment)
+            if self._owner is not None:
+                segment._add_owner(self._owner)
+                self._positions = None
+        return segment
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The segments of a copy don't tell it when they change, so the
+        # caches are made again
+        state = self.__dict__.copy()
+        state.update(
+            _length=None,
+            _closing_lines=None,
+            _segment_lengths=None,
+            _tables=None,
+            _boxes=None,
+            _owner=None,
+            _positions=None,
+            _indexes=None,
+        )
+        return state
+
+    def _caches(self) -> List[_SegmentCache[Any]]:
+        return [
+            cache
+            for cache in (self._segment_lengths, self._tables, self._boxes)
+            if cache is not None
+        ]
+
+    def _track(self) -> None:
+        """Makes the segments tell the path when they change
+
+        This is done when the first cache is made, so that paths that are
+        only parsed and written out never need it. The segments shared with
+        other paths are copied before they can be changed.
+        """
+        if self._owner is not None:
+            return
+        self._owner = weakref.ref(self)
+        for segment in self._segments:
+            if id(segment) not in self._shared:
+                segment._add_owner(self._owner)
+
+    def _adopt(
+        self, added: Iterable[PathSegment], removed: Iterable[PathSegment]
+    ) -> None:
+        """Updates the owners of segments added to or removed from the path"""
+        owner = self._owner
+        if owner is None:
+            return
+        for segment in removed:
+            segment._remove_owner(owner)
+        for segment in added:
+            segment._add_owner(owner)
+
+    def _segment_changed(self, segment: PathSegment) -> None:
+        """Recalculates the cached values of a segment that changed"""
+        self._length = None
+        self._closing_lines = None
+        caches = self._caches()
+        if not caches and not self._indexes:
+            return
+        if self._positions is None:
+            self._positions = {}
+            for index, each in enumerate(self._segments):
+                self._positions.setdefault(id(each), []).append(index)
+        positions = self._positions.get(id(segment), [])
+        for index in positions:
+            for cache in caches:
+                cache.replace(index)
+        if self._indexes:
+            for segment_index in self._indexes:
+                segment_index._segment_changed(self, positions)
 
     @overload
     def __getitem__(self, index: int) -> PathSegment: ...
@@ -861,7 +3585,12 @@ class Path(PathType):
     def __getitem__(self, index: Union[int, slice]) -> Union[PathSegment, Path]:
         if isinstance(index, slice):
             res = self._segments[index]
-            return Path(*res)
+            path = Path(*res)
+            path._shared = self._shared
+            path._shared_segments = self._shared_segments
+            return path
+        if self._shared:
+            return self._unshare(index)
         return self._segments[index]
 
     @overload
@@ -878,11 +3607,35 @@ class Path(PathType):
         value: Union[PathSegment, Path, Iterable[PathSegment]],
     ) -> None:
         if isinstance(index, slice) and isinstance(value, Path):
-            self._segments[index] = value._segments
+            # Getting the segments from the path copies any shared segments
+            added = list(value) if value._shared else value._segments
+            removed = self._segments[index]
+            self._segments[index] = added
+            self._adopt(added, removed)
+            self._positions = None
+            for cache in self._caches():
+                cache.replace_slice(index, len(value))
         elif isinstance(index, slice) and isinstance(value, Iterable):
+            value = list(value)
+            removed = self._segments[index]
             self._segments[index] = value
+            self._adopt(value, removed)
+            self._positions = None
+            for cache in self._caches():
+                cache.replace_slice(index, len(value))
         elif isinstance(index, int) and isinstance(value, PathSegment):
+            removed_segment = self._segments[index]
             self._segments[index] = value
+            self._adopt([value], [removed_segment])
+            if self._positions is not None:
+                index = range(len(self._segments))[index]
+                positions = self._positions[id(removed_segment)]
+                positions.remove(index)
+                if not positions:
+                    del self._positions[id(removed_segment)]
+                self._positions.setdefault(id(value), []).append(index)
+            for cache in self._caches():
+                cache.replace(index)
         else:
             # If you assign a non-iterable to a slice, or an iterable to a single
             # location, this should raise an error.
@@ -893,14 +3646,26 @@ class Path(PathType):
                 " iterable of PathSegments to a slice."
             )
         self._length = None
+        self._closing_lines = None
 
     def __delitem__(self, index: Union[int, slice]) -> None:
+        removed = self._segments[index]
         del self._segments[index]
+        self._adopt([], removed if isinstance(removed, list) else [removed])
+        self._positions = None
         self._length = None
+        self._closing_lines = None
+        for cache in self._caches():
+            cache.delete(index)
 
     def insert(self, index: int, value: PathSegment) -> None:
         self._segments.insert(index, value)
+        self._adopt([value], [])
+        self._positions = None
         self._length = None
+        self._closing_lines = None
+        for cache in self._caches():
+            cache.insert(index)
 
     def reverse(self) -> None:
         # Reversing the order of a path would require reversing each element
@@ -936,33 +3701,67 @@ class Path(PathType):
         which case all lengths are zero.
         """
         self._calc_lengths()
-        assert self._lengths is not None
-        return self._lengths
+        assert self._segment_lengths is not None and self._length is not None
+        total = self._length
+        lengths = self._segment_lengths.lengths()
+        if total == 0:
+            return lengths
+        return [each / total for each in lengths]
 
-    def _calc_lengths(self, error: float = ERROR, min_depth: int = MIN_DEPTH) -> None:
-        if self._length is not None:
-            return
-
-        lengths = [
-            each.length(error=error, min_depth=min_depth) for each in self._segments
-        ]
-        self._length = sum(lengths)
-        if self._length == 0:
-            self._lengths = lengths
-        else:
-            self._lengths = [each / self._length for each in lengths]
-        # Calculate the fractional distance for each segment to use in point().
-        # Reset first: mutating the path only clears self._length, so a stale
-        # self._fractions from an earlier calculation would otherwise be
-        # appended to here, corrupting the segment lookup in _find_segment().
-        self._fractions = []
+    @property
+    def _fractions(self) -> List[float]:
+        """The fractional distance from the start through the end of each segment"""
+        fractions = []
         fraction = 0.0
-        for each in self._lengths:
+        for each in self.lengths:
             fraction += each
-            self._fractions.append(fraction)
+            fractions.append(fraction)
+        return fractions
+
+    def _calc_lengths(
+        self,
+        error: float = ERROR,
+        min_depth: int = MIN_DEPTH,
+        method: Union[str, None] = None,
+    ) -> None:
+        # Without a method, any previous calculation will do.
+        if self._length is not None and method in (None, self._length_method):
+            return
+
+        if method is None:
+            method = self._length_method
+        if self._segment_lengths is None or method != self._length_method:
+            self._track()
+            self._length_method = method
+            self._segment_lengths = _SegmentLengths(
+                len(self._segments), error, min_depth, method
+            )
+        # Only the lengths of new and changed segments are calculated
+        self._segment_lengths.refresh(self._segments)
+        self._length = self._segment_lengths.total()
+
+    def _calc_tables(self, error: float = ERROR) -> _LengthTables:
+        if self._tables is None or self._tables.error != error:
+            self._track()
+            self._tables = _LengthTables(len(self._segments), error)
+        self._tables.refresh(self._segments)
+        return self._tables
+
+    def _calc_boxes(self) -> _BoundingBoxes:
+        if self._boxes is None:
+            self._track()
+            self._boxes = _BoundingBoxes(len(self._segments))
+        self._boxes.refresh(self._segments)
+        return self._boxes
+
+    def _calc_closings(self) -> List[Line]:
+        if self._closing_lines is None:
+            self._track()
+            self._closing_lines = _closings(self._segments)
+        return self._closing_lines
 
     def _find_segment(
-        self, pos: float, error: float = ERROR
+        self, pos: float, error: float = ERROR, by_length: bool = False
     ) -> Tuple[PathSegment, float]:
         # Shortcuts
         if pos == 0.0:
@@ -973,32 +3772,255 @@ class Path(PathType):
         if pos == 1.0:
             return self._segments[-1], pos
 
+        if by_length:
+            tables = self._calc_tables(error)
+            i, distance = tables.find(pos * tables.total())
+            table = tables.values[i]
+            assert table is not None
+            return self._segments[i], table.position(distance, error)
+
         self._calc_lengths(error=error)
+        assert self._segment_lengths is not None and self._length is not None
 
         # Fix for paths of length 0 (i.e. points)
         if self._length == 0:
             return self._segments[0], 0.0
 
         # Find which segment the point we search for is located on:
-        i = bisect(self._fractions, pos)
-        if i == 0:
-            segment_pos = pos / self._fractions[0]
+        i, distance = self._segment_lengths.find(pos * self._length)
+        length = self._segment_lengths.values[i]
+        assert length is not None
+        if length == 0:
+            # Only rounding can end up here, at the end of the path
+            return self._segments[i], 1.0
+        return self._segments[i], distance / length
+
+    def point(
+        self, pos: float, error: float = ERROR, by_length: bool = False
+    ) -> complex:
+        """Returns the point at a position between 0 (start) and 1 (end)
+
+        The position is the fraction of the length of the path where the
+        segment is located, but in the segment it's the parameter of the curve,
+        so the points are not evenly spaced along curves. With by_length the
+        position is the fraction of the length of the path also inside the
+        segments.
+        """
+        segment, pos = self._find_segment(pos, error, by_length)
+        return segment.point(pos)
+
+    def tangent(
+        self, pos: float, error: float = ERROR, by_length: bool = False
+    ) -> complex:
+        segment, pos = self._find_segment(pos, error, by_length)
+        return segment.tangent(pos)
+
+    def _find_segments(
+        self,
+        positions: npt.NDArray[np.float64],
+        error: float = ERROR,
+        by_length: bool = False,
+    ) -> Tuple[npt.NDArray[np.intp], npt.NDArray[np.float64]]:
+        """The vectorized version of _find_segment()
+
+        Returns an array of segment indexes and an array of positions in
+        those segments.
+        """
+        import numpy as np
+
+        if by_length:
+            tables = self._calc_tables(error)
+            indexes, targets = self._search(tables, positions * tables.total())
+            segment_pos = np.empty(positions.shape, dtype=np.float64)
+            for group in _groups(indexes):
+                table = tables.values[indexes[group[0]]]
+                assert table is not None
+                segment_pos[group] = table.positions(targets[group], error)
+            return self._shortcuts(positions, indexes, segment_pos)
+
+        self._calc_lengths(error=error)
+        assert self._segment_lengths is not None and self._length is not None
+        if self._length == 0:
+            indexes = np.zeros(positions.shape, dtype=np.intp)
+            segment_pos = np.zeros(positions.shape, dtype=np.float64)
         else:
-            segment_pos = (pos - self._fractions[i - 1]) / (
-                self._fractions[i] - self._fractions[i - 1]
+            indexes, targets = self._search(
+                self._segment_lengths, positions * self._length
             )
-        return self._segments[i], segment_pos
+            lengths = np.array(self._segment_lengths.lengths())[indexes]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                # Only the positions at the end can end up on an empty
+                # segment, and they are handled by the shortcut below.
+                segment_pos = targets / lengths
+        return self._shortcuts(positions, indexes, segment_pos)
+
+    def _search(
+        self, cache: _CumulativeCache[Any], distances: npt.NDArray[np.float64]
+    ) -> Tuple[npt.NDArray[np.intp], npt.NDArray[np.float64]]:
+        """The vectorized version of _CumulativeCache.find()
+
+        Searching the cumulative lengths of all segments in one go is faster
+        than searching the Fenwick tree for each distance.
+        """
+        import numpy as np
 
-    def point(self, pos: float, error: float = ERROR) -> complex:
-        segment, pos = self._find_segment(pos, error)
+        ends = np.cumsum(cache.lengths())
+        indexes = np.searchsorted(ends, distances, side="right")
+        # Rounding can make the last distance slightly less than the total
+        np.minimum(indexes, len(ends) - 1, out=indexes)
+        starts = np.concatenate(([0.0], ends[:-1]))[indexes]
+        return indexes, distances - starts
+
+    def _shortcuts(
+        self,
+        positions: npt.NDArray[np.float64],
+        indexes: npt.NDArray[np.intp],
+        segment_pos: npt.NDArray[np.float64],
+    ) -> Tuple[npt.NDArray[np.intp], npt.NDArray[np.float64]]:
+        """Applies the shortcuts for the start and end, as in _find_segment()"""
+        first = 1 if isinstance(self._segments[0], Move) and len(self) > 1 else 0
+        at_start = positions == 0.0
+        indexes[at_start] = first
+        segment_pos[at_start] = 0.0
+        at_end = positions == 1.0
+        indexes[at_end] = len(self) - 1
+        segment_pos[at_end] = 1.0
+        return indexes, segment_pos
+
+    def _map_segments(
+        self, positions: npt.ArrayLike, method: str, error: float, by_length: bool
+    ) -> npt.NDArray[np.complex128]:
+        import numpy as np
+
+        pos = np.asarray(positions, dtype=np.float64)
+        indexes, segment_pos = self._find_segments(pos.ravel(), error, by_length)
+        result = np.empty(len(indexes), dtype=np.complex128)
+
+        # Call each segment once, with all positions that fall on it
+        for group in _groups(indexes):
+            segment = self._segments[indexes[group[0]]]
+            result[group] = getattr(segment, method)(segment_pos[group])
+        return result.reshape(pos.shape)
+
+    def point_many(
+        self, positions: npt.ArrayLike, error: float = ERROR, by_length: bool = False
+    ) -> npt.NDArray[np.complex128]:
+        """Returns the points for an array of positions, as an array of complex
+
+        This requires NumPy.
+        """
+        return self._map_segments(positions, "point_many", error, by_length)
+
+    def tangent_many(
+        self, positions: npt.ArrayLike, error: float = ERROR, by_length: bool = False
+    ) -> npt.NDArray[np.complex128]:
+        """Returns the tangents for an array of positions, as an array of complex
+
+        This requires NumPy.
+        """
+        return self._map_segments(positions, "tangent_many", error, by_length)
+
+    def _find_segment_at_distance(
+        self, distance: float, error: float = ERROR
+    ) -> Tuple[PathSegment, float]:
+        self._calc_lengths(error=error)
+        assert self._length is not None
+        if self._length == 0:
+            return self._segments[0], 0.0
+        if distance <= 0.0:
+            return self._find_segment(0.0)
+        if distance >= self._length:
+            return self._find_segment(1.0)
+
+        assert self._segment_lengths is not None
+        i, distance = self._segment_lengths.find(distance)
+        segment = self._segments[i]
+        return segment, segment.t_at_length(distance, error)
+
+    def point_at_distance(self, distance: float, error: float = ERROR) -> complex:
+        """Returns the point at a distance along the path from the start
+
+        Distances before the start or after the end of the path return the
+        start and end points.
+        """
+        segment, pos = self._find_segment_at_distance(distance, error)
         return segment.point(pos)
 
-    def tangent(self, pos: float, error: float = ERROR) -> complex:
-        segment, pos = self._find_segment(pos, error)
-        return segment.tangent(pos)
+    def point_at_distance_many(
+        self, distances: npt.ArrayLike, error: float = ERROR
+    ) -> npt.NDArray[np.complex128]:
+        """Returns the points for an array of distances, as an array of complex
+
+        This requires NumPy.
+        """
+        import numpy as np
+
+        dist = np.asarray(distances, dtype=np.float64)
+        flat = dist.ravel()
+        self._calc_lengths(error=error)
+        assert self._segment_lengths is not None and self._length is not None
+        if self._length == 0:
+            return np.full(dist.shape, self._segments[0].point(0.0), np.complex128)
+
+        positions = np.clip(flat / self._length, 0.0, 1.0)
+        indexes, targets = self._search(self._segment_lengths, flat)
+        segment_pos = np.array(
+            [self._segments[i].t_at_length(d, error) for i, d in zip(indexes, targets)],
+            dtype=np.float64,
+        )
+        indexes, segment_pos = self._shortcuts(positions, indexes, segment_pos)
 
-    def length(self, error: float = ERROR, min_depth: int = MIN_DEPTH) -> float:
-        self._calc_lengths(error, min_depth)
+        result = np.empty(len(indexes), dtype=np.complex128)
+        for group in _groups(indexes):
+            segment = self._segments[indexes[group[0]]]
+            result[group] = segment.point_many(segment_pos[group])
+        return result.reshape(dist.shape)
+
+    def flatten(
+        self, tolerance: float = FLATTEN_TOLERANCE
+    ) -> Tuple[npt.NDArray[np.complex128], npt.NDArray[np.intp]]:
+        """Returns polylines approximating the path
+
+        Returns an array of complex with the points of all subpaths, and an
+        array with the index of the first point of each subpath. Each Move
+        starts a new subpath, and so does the first segment after a Close. A
+        closed subpath ends with its first point.
+
+        This requires NumPy.
+        """
+        import numpy as np
+
+        parts = []
+        starts = []
+        count = 0
+        new_subpath = True
+        for segment in self._segments:
+            points = segment.flatten(tolerance)
+            if isinstance(segment, Move):
+                starts.append(count)
+                new_subpath = False
+            elif new_subpath:
+                starts.append(count)
+                new_subpath = False
+            else:
+                # The first point is the end of the previous segment
+                points = points[1:]
+            parts.append(points)
+            count += len(points)
+            if isinstance(segment, Close):
+                new_subpath = True
+
+        if not parts:
+            return np.zeros(0, dtype=np.complex128), np.zeros(0, dtype=np.intp)
+        return np.concatenate(parts), np.array(starts, dtype=np.intp)
+
+    def length(
+        self,
+        error: float = ERROR,
+        min_depth: int = MIN_DEPTH,
+        method: str = SUBDIVISION,
+    ) -> float:
+        self._calc_lengths(error, min_depth, method)
         # TODO: refactor code to avoid this mypy error:
         # Incompatible return value type (got "Optional[float]", expected "float")
         return self._length  # type: ignore[return-value]
@@ -1007,7 +4029,7 @@ class Path(PathType):
         parts = []
         previous_segment = None
 
-        for segment in self:
+        for segment in self._segments:
             # TODO: The `previous` argument in PathSegment._d(previous) cannot be
             #     None because it will crash at least in some cases like Line._d(None).
             # mypy error:
@@ -1018,17 +4040,359 @@ class Path(PathType):
 
         return " ".join(parts)
 
+    def transform(self, matrix: Matrix) -> Path:
+        """Returns a copy of the path with an affine transformation applied
+
+        The matrix has two rows of three numbers, like for
+        PathSegment.transform(). The radius, rotation and sweep of arcs are
+        changed so that they follow the transformed ellipse.
+        """
+        affine = _affine(matrix)
+        segments = []
+        for segment in self._segments:
+            segment = copy.copy(segment)
+            segment._transform(affine)
+            segments.append(segment)
+        return Path(*segments)
+
+    def transform_in_place(self, matrix: Matrix) -> None:
+        """Applies an affine transformation to the segments of the path
+
+        The segments are changed, except those shared with other paths,
+        which are copied first.
+        """
+        affine = _affine(matrix)
+        # All the segments change, so the caches are rebuilt when needed
+        self._length = None
+        self._closing_lines = None
+        self._segment_lengths = None
+        self._tables = None
+        self._boxes = None
+        for index in range(len(self._segments)):
+            segment = self._unshare(index) if self._shared else self._segments[index]
+            segment._transform(affine)
+        self._shared = frozenset()
+        self._shared_segments = ()
+
     def boundingbox(self) -> List[float]:
-        x_coords = []
-        y_coords = []
+        """Returns the bounding box of the path in the format of [left, top, right, bottom]
 
-        for e in self:
-            x_min, y_min, x_max, y_max = e.boundingbox()
-            x_coords.append(x_min)
-            x_coords.append(x_max)
-            y_coords.append(y_min)
-            y_coords.append(y_max)
+        The bounding boxes of the segments are cached, and only recalculated
+        for segments that have been replaced, inserted or changed since the
+        last call.
+        """
+        if not self._segments:
+            raise ValueError("An empty path has no bounding box")
+        boxes = self._calc_boxes()
+        box = boxes.union(self._segments)
+        assert box is not None
+        return list(box)
+
+    def closest_point(self, point: complex) -> ClosestPoint:
+        """Returns the point on the path that is closest to a point
+
+        Returns the index of the segment, the position in the segment, the
+        point and the distance to it. The bounding boxes of the segments are
+        used to skip the segments that can't have the closest point, and are
+        cached like for boundingbox().
+        """
+        boxes = self._calc_boxes()
+        closest = boxes.closest(self._segments, point)
+        if closest is None:
+            raise ValueError("A path without drawn segments has no closest point")
+        return closest
+
+    def closest_point_many(self, points: npt.ArrayLike) -> Tuple[
+        npt.NDArray[np.intp],
+        npt.NDArray[np.float64],
+        npt.NDArray[np.complex128],
+        npt.NDArray[np.float64],
+    ]:
+        """Returns the closest points on the path for an array of points
+
+        Returns arrays of the segment indexes, positions, closest points and
+        distances, in the shape of the array of points. This is a convenience
+        for NumPy code: each point is searched for like with closest_point(),
+        so it's no faster than calling that for each point.
+
+        This requires NumPy.
+        """
+        import numpy as np
+
+        query = np.asarray(points, dtype=np.complex128)
+        boxes = self._calc_boxes()
+        segments = self._segments
+        results: List[ClosestPoint] = []
+        for value in query.ravel().tolist():
+            best = boxes.closest(segments, value)
+            if best is None:
+                raise ValueError("A path without drawn segments has no closest point")
+            results.append(best)
+        columns = list(zip(*results)) or [(), (), (), ()]
+        indexes = np.array(columns[0], dtype=np.intp).reshape(query.shape)
+        positions = np.array(columns[1], dtype=np.float64).reshape(query.shape)
+        closest_points = np.array(columns[2], dtype=np.complex128).reshape(query.shape)
+        distances = np.array(columns[3], dtype=np.float64).reshape(query.shape)
+        return indexes, positions, closest_points, distances
+
+    def intersections(self, other: Path) -> List[Intersection]:
+        """Returns the points where the path intersects another path
+
+        Returns the index of the segment and the position in it for both
+        paths, and the point, sorted by the segments and positions. A point
+        where two segments join is returned once, for the segment that starts
+        there. The bounding boxes of the segments are used to skip the pairs
+        of segments that can't intersect, and are cached like for
+        boundingbox().
+        """
+        boxes = self._calc_boxes()
+        other_boxes = other._calc_boxes()
+        pairs = boxes.overlapping(self._segments, other_boxes, other._segments)
+        boxes1 = boxes.values
+        boxes2 = other_boxes.values
+        joins1 = _joins(self._segments)
+        joins2 = _joins(other._segments)
+        union = _box_union(boxes.tree[1], other_boxes.tree[1])
+        precision = 0.0 if union is None else _precision(union)
+
+        found: Dict[Tuple[int, int], List[Intersection]] = {}
+        for index1, index2 in pairs:
+            segment1 = self._segments[index1]
+            segment2 = other._segments[index2]
+            if not _drawn(segment1) or not _drawn(segment2):
+                continue
+            box1 = boxes1[index1]
+            box2 = boxes2[index2]
+            assert box1 is not None and box2 is not None
+            for t1, t2, point in _intersect(segment1, segment2, box1, box2):
+                _add_unique(
+                    found,
+                    Intersection(
+                        *_at_join(self._segments, joins1, index1, t1, precision),
+                        *_at_join(other._segments, joins2, index2, t2, precision),
+                        point,
+                    ),
+                )
+        return _sorted_intersections(found)
+
+    def self_intersections(self) -> List[Intersection]:
+        """Returns the points where the path crosses or touches itself
+
+        Returns the same as intersections(), with both segments in this path,
+        and the first one before the second one. The points where segments
+        join, including where a closed subpath ends, are not returned.
+
+        The drawn segments are split into pieces between their extrema, so
+        that each piece only goes one way in x and in y. A line sweeping
+        across the bounding boxes of the pieces finds the pairs of segments
+        that can intersect, and only those are intersected. A cubic curve
+        can also cross itself once, in a loop.
+        """
+        segments = self._segments
+        cache = self._calc_boxes()
+        union = cache.union(segments)
+        if union is None:
+            return []
+        boxes = cache.values
+        joins = _joins(segments)
+        precision = _precision(union)
+
+        owners = []
+        pieces: List[Box] = []
+        # The first and the last piece of each drawn segment
+        ends: Dict[int, Tuple[int, int]] = {}
+        for index, segment in enumerate(segments):
+            if not _drawn(segment):
+                continue
+            monotone = _monotone_boxes(segment)
+            ends[index] = (len(pieces), len(pieces) + len(monotone) - 1)
+            owners.extend([index] * len(monotone))
+            pieces.extend(monotone)
+        overlapping: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+        for piece1, piece2 in _sweep(
+            [
+                (
+                    left - precision,
+                    top - precision,
+                    right + precision,
+                    bottom + precision,
+                )
+                for left, top, right, bottom in pieces
+            ]
+        ):
+            if owners[piece1] > owners[piece2]:
+                piece1, piece2 = piece2, piece1
+            if owners[piece1] != owners[piece2]:
+                pair = (owners[piece1], owners[piece2])
+                overlapping.setdefault(pair, []).append((piece1, piece2))
+
+        candidates = []
+        for (index1, index2), overlaps in sorted(overlapping.items()):
+            if len(overlaps) == 1:
+                # Segments whose only overlapping pieces are the ones where
+                # they join, and only overlap at that point, don't intersect
+                piece1, piece2 = overlaps[0]
+                joined = (
+                    joins[index1] == index2
+                    and (piece1, piece2) == (ends[index1][1], ends[index2][0])
+                ) or (
+                    joins[index2] == index1
+                    and (piece1, piece2) == (ends[index1][0], ends[index2][1])
+                )
+                if joined and _touch(pieces[piece1], pieces[piece2], precision):
+                    continue
+            box1 = boxes[index1]
+            box2 = boxes[index2]
+            assert box1 is not None and box2 is not None
+            for t1, t2, point in _intersect(
+                segments[index1], segments[index2], box1, box2
+            ):
+                candidates.append((index1, t1, index2, t2, point))
+        for index, segment in enumerate(segments):
+            if isinstance(segment, CubicBezier):
+                loop = _loop(segment)
+                if loop is not None:
+                    candidates.append((index, loop[0], index, loop[1], loop[2]))
+
+        found: Dict[Tuple[int, int], List[Intersection]] = {}
+        for index1, t1, index2, t2, point in candidates:
+            first = _at_join(segments, joins, index1, t1, precision)
+            second = _at_join(segments, joins, index2, t2, precision)
+            if second < first:
+                first, second = second, first
+            if (
+                first[0] == second[0]
+                and second[1] - first[1] <= sqrt(INTERSECTION_PRECISION)
+                and abs(segments[first[0]].point((first[1] + second[1]) / 2) - point)
+                <= precision
+            ):
+                # Where two segments join, the curve doesn't go anywhere in between
+                continue
+            _add_unique(found, Intersection(*first, *second, point))
+        return _sorted_intersections(found)
+
+    def _moments(self) -> Tuple[List[float], List[complex]]:
+        """The signed area and first moment of each subpath"""
+        areas: List[float] = []
+        moments: List[complex] = []
+        origin = 0j
+        new_subpath = True
+        for segment in self._segments:
+            if isinstance(segment, Move) or new_subpath:
+                origin = segment.end if isinstance(segment, Move) else segment.start
+                areas.append(0.0)
+                moments.append(0j)
+                new_subpath = False
+            area, moment = _green(segment, origin)
+            areas[-1] += area
+            moments[-1] += moment + area * origin
+            if isinstance(segment, Close):
+                new_subpath = True
+        return areas, moments
+
+    def areas(self) -> List[float]:
+        """Returns the signed area of each subpath
+
+        Each Move starts a new subpath, and so does the first segment after
+        a Close, like for flatten(). Subpaths are closed with a straight
+        line, like when they are filled. The area is positive when the
+        subpath goes clockwise, with the y axis pointing down like in SVG,
+        and negative when it goes counterclockwise.
+
+        The areas are integrated in closed form with Green's theorem, without
+        flattening the curves.
+        """
+        return self._moments()[0]
 
-        x_min, x_max = min(x_coords), max(x_coords)
-        y_min, y_max = min(y_coords), max(y_coords)
-        return [x_min, y_min, x_max, y_max]
+    def area(self) -> float:
+        """Returns the signed area of the path, the sum of the subpath areas
+
+        A subpath going the other way around than the one it's inside cuts
+        a hole in it. Use abs() to get the area regardless of direction.
+        """
+        return sum(self.areas())
+
+    def centroid(self) -> complex:
+        """Returns the center of mass of the area of the path
+
+        The subpaths are weighted by their signed areas, so holes going the
+        other way around are cut out.
+        """
+        areas, moments = self._moments()
+        area = sum(areas)
+        if area == 0:
+            raise ValueError("A path without area has no centroid")
+        return sum(moments) / area
+
+    def is_clockwise(self) -> bool:
+        """Returns whether the path goes clockwise, with the y axis pointing down"""
+        return self.area() > 0
+
+    def contains(self, point: complex, fill_rule: str = NONZERO) -> bool:
+        """Returns whether a point is inside the filled path
+
+        The fill rule is "nonzero" or "evenodd", like the fill-rule of SVG.
+        Subpaths are closed with a straight line, like when they are filled.
+        The winding number of the path around the point is counted from
+        where the segments cross a ray from the point, which is solved for
+        exactly, without flattening the curves. The bounding boxes of the
+        segments are used to skip the segments the ray can't cross, and are
+        cached like for boundingbox(). A point on the outline of the path
+        can be inside or outside.
+        """
+        if fill_rule not in (NONZERO, EVENODD):
+            raise ValueError(f"Unknown fill rule {fill_rule}")
+        boxes = self._calc_boxes()
+        winding = boxes.winding(self._segments, point)
+        for line in self._calc_closings():
+            winding += _winding(line, point)
+        return winding != 0 if fill_rule == NONZERO else winding % 2 == 1
+
+    def contains_many(
+        self, points: npt.ArrayLike, fill_rule: str = NONZERO
+    ) -> npt.NDArray[np.bool_]:
+        """Returns whether each of an array of points is inside the filled path
+
+        Returns an array of booleans in the shape of the array of points.
+        Points outside the bounding box of the path are rejected at once. The
+        others are sorted by y, so that the points at the height of each
+        segment are found with a binary search.
+
+        This requires NumPy.
+        """
+        import numpy as np
+
+        if fill_rule not in (NONZERO, EVENODD):
+            raise ValueError(f"Unknown fill rule {fill_rule}")
+        query = np.asarray(points, dtype=np.complex128)
+        x = query.real.ravel()
+        y = query.imag.ravel()
+        winding = np.zeros(len(x), dtype=np.intp)
+        segments = self._segments
+        boxes = self._calc_boxes()
+        union = boxes.union(segments)
+        if union is not None:
+            indexes = np.flatnonzero(
+                (x >= union[0]) & (x <= union[2]) & (y >= union[1]) & (y <= union[3])
+            )
+            indexes = indexes[np.argsort(y[indexes], kind="stable")]
+            xs = x[indexes]
+            ys = y[indexes]
+            for segment, box in zip(segments, boxes.values):
+                assert box is not None
+                if not _drawn(segment):
+                    continue
+                first = np.searchsorted(ys, box[1])
+                last = np.searchsorted(ys, box[3], side="right")
+                if first == last or xs[first:last].min() >= box[2]:
+                    # No points at its height, or all of them right of it
+                    continue
+                _winding_many(segment, xs, ys, indexes, winding)
+            for line in self._calc_closings():
+                _winding_many(line, xs, ys, indexes, winding)
+        filled: npt.NDArray[np.bool_]
+        if fill_rule == NONZERO:
+            filled = winding != 0
+        else:
+            filled = winding % 2 == 1
+        return filled.reshape(query.shape)
@@ -0,0 +1,397 @@
+import math
+import unittest
+from typing import List
+
+import numpy as np
+
+from svg.path import Path, Move, Line, Arc, Close, CubicBezier, QuadraticBezier
+from svg.path import PathSegment
+from svg.path import parse_path
+from svg.path.array import PathArray, parse_path_array
+from svg.path import array
+
+PATHS = [
+    "M 100,100 L 300,100 L 200,300 z",
+    "M 100,200 C 100,100 250,100 250,200 S 400,300 400,200",
+    "M 200,300 Q 400,50 600,300 T 1000,300",
+    "m 5,1 v 7.344 a 3.574,3.574 0 0,0 3.5,8 h 6 V 1 Z",
+    "M 600,350 l 50,-25 a 25,25 -30 0,1 50,-25 l 50,-25 c 1,2 3,4 5,6 s 1,2 3,4",
+    "M 0,0 q 10,10 20,0 t 20,0 z m 10,10 L 20,20",
+]
+
+
+class PathArrayTest(unittest.TestCase):
+    def test_round_trip(self) -> None:
+        for pathdef in PATHS:
+            path = parse_path(pathdef)
+            path_array = PathArray.from_path(path)
+            self.assertEqual(len(path_array), len(path))
+            self.assertEqual(path_array.to_path(), path)
+            # The flags are kept, so the path definition is the same
+            self.assertEqual(path_array.d(), pathdef)
+
+    def test_parse(self) -> None:
+        for pathdef in PATHS:
+            path_array = parse_path_array(pathdef)
+            self.assertEqual(path_array, PathArray.from_path(parse_path(pathdef)))
+            self.assertEqual(path_array.d(), pathdef)
+
+    def test_columns(self) -> None:
+        path_array = PathArray.from_path(
+            Path(
+                Move(0j),
+                Line(0j, 10 + 0j),
+                CubicBezier(10 + 0j, 20 + 0j, 20 + 10j, 10 + 10j, smooth=True),
+                QuadraticBezier(10 + 10j, 5 + 15j, 0 + 10j, relative=True),
+                Arc(0 + 10j, 5 + 5j, 30, True, False, 0 + 5j),
+                Close(0 + 5j, 0j),
+            )
+        )
+        np.testing.assert_array_equal(
+            path_array.kinds,
+            [
+                array.MOVE,
+                array.LINE,
+                array.CUBIC,
+                array.QUADRATIC,
+                array.ARC,
+                array.CLOSE,
+            ],
+        )
+        np.testing.assert_array_equal(
+            path_array.flags, [0, 0, array.SMOOTH, array.RELATIVE, array.LARGE_ARC, 0]
+        )
+        self.assertEqual(path_array.control1[2], 20 + 0j)
+        self.assertEqual(path_array.control2[2], 20 + 10j)
+        self.assertEqual(path_array.control1[3], 5 + 15j)
+        self.assertEqual(path_array.radius[4], 5 + 5j)
+        self.assertEqual(path_array.rotation[4], 30)
+
+    def test_sequence(self) -> None:
+        path_array = parse_path_array(PATHS[0])
+        self.assertEqual(path_array[1], Line(100 + 100j, 300 + 100j))
+        self.assertEqual(path_array[-1], Close(200 + 300j, 100 + 100j))
+        self.assertEqual(len(path_array[1:3]), 2)
+        self.assertRaises(IndexError, path_array.__getitem__, 4)
+
+
+SEGMENTS = [
+    Move(10 + 10j),
+    Line(0j, 100 + 50j),
+    Close(100 + 50j, 0j),
+    CubicBezier(300 + 100j, 100 + 100j, 200 + 200j, 200 + 300j),
+    QuadraticBezier(200 + 300j, 400 + 50j, 600 + 300j),
+    Arc(0j, 100 + 50j, 30, False, True, 150 + 50j),
+    Arc(0j, 100 + 50j, 30, True, False, 150 + 50j),
+    Arc(0j, 0 + 50j, 30, True, False, 150 + 50j),
+]
+
+
+class PointManyTest(unittest.TestCase):
+    def test_segments(self) -> None:
+        positions = np.linspace(0, 1, 101)
+        for segment in SEGMENTS:
+            points = segment.point_many(positions)
+            tangents = segment.tangent_many(positions)
+            self.assertEqual(points.shape, positions.shape)
+            self.assertEqual(points.dtype, np.complex128)
+            np.testing.assert_allclose(
+                points, [segment.point(p) for p in positions], atol=1e-9
+            )
+            np.testing.assert_allclose(
+                tangents, [segment.tangent(p) for p in positions], atol=1e-9
+            )
+
+    def test_shape(self) -> None:
+        positions = np.linspace(0, 1, 12).reshape(3, 4)
+        for segment in SEGMENTS:
+            self.assertEqual(segment.point_many(positions).shape, (3, 4))
+            self.assertEqual(segment.tangent_many(positions).shape, (3, 4))
+        self.assertEqual(SEGMENTS[3].point_many([0.5]).shape, (1,))
+
+    def test_path(self) -> None:
+        path = parse_path(
+            "M 100,100 L 300,100 L 200,300 z m 10,10 C 100,100 250,100 250,200 "
+            "S 400,300 400,200 Q 400,50 600,300 T 1000,300 "
+            "A 25,25 -30 0,1 1050,250 M 0,0"
+        )
+        # Unsorted, and including the shortcuts for the start and end
+        positions = np.concatenate(([1.0, 0.0], np.random.default_rng(1).random(500)))
+        np.testing.assert_allclose(
+            path.point_many(positions), [path.point(p) for p in positions], atol=1e-9
+        )
+        np.testing.assert_allclose(
+            path.tangent_many(positions),
+            [path.tangent(p) for p in positions],
+            atol=1e-9,
+        )
+
+    def test_zero_length_path(self) -> None:
+        path = Path(Move(10 + 10j), Line(10 + 10j, 10 + 10j))
+        positions = np.array([0.0, 0.5, 1.0])
+        np.testing.assert_allclose(
+            path.point_many(positions), [path.point(p) for p in positions]
+        )
+
+    def test_path_by_length(self) -> None:
+        path = parse_path(
+            "M 100,100 L 300,100 L 200,300 z m 10,10 C 100,100 250,100 250,200 "
+            "S 400,300 400,200 Q 400,50 600,300 T 1000,300 "
+            "A 25,50 -30 0,1 1050,250 M 0,0"
+        )
+        positions = np.concatenate(([1.0, 0.0], np.random.default_rng(1).random(500)))
+        np.testing.assert_allclose(
+            path.point_many(positions, by_length=True),
+            [path.point(p, by_length=True) for p in positions],
+            atol=1e-9,
+        )
+        np.testing.assert_allclose(
+            path.tangent_many(positions, by_length=True),
+            [path.tangent(p, by_length=True) for p in positions],
+            atol=1e-9,
+        )
+
+        # Almost a cusp, where the positions are found with adaptive quadrature
+        path = Path(Move(0j), QuadraticBezier(0j, 100 + 1j, 1 + 0j))
+        np.testing.assert_allclose(
+            path.point_many(positions, by_length=True),
+            path.point_at_distance_many(positions * path.length()),
+            atol=1e-9,
+        )
+
+    def test_path_at_distance(self) -> None:
+        path = parse_path(
+            "M 100,100 L 300,100 L 200,300 z m 10,10 C 100,100 250,100 250,200 "
+            "S 400,300 400,200 Q 400,50 600,300 T 1000,300 "
+            "A 25,50 -30 0,1 1050,250 M 0,0"
+        )
+        length = path.length()
+        distances = np.concatenate(
+            (
+                [-1.0, 0.0, length, length + 1],
+                np.random.default_rng(1).random(200) * length,
+            )
+        ).reshape(4, 51)
+        points = path.point_at_distance_many(distances)
+        self.assertEqual(points.shape, (4, 51))
+        np.testing.assert_allclose(
+            points.ravel(),
+            [path.point_at_distance(d) for d in distances.ravel()],
+            atol=1e-9,
+        )
+
+
+def _distance(point: complex, polyline: np.ndarray) -> float:
+    """The distance from a point to the closest line in a polyline"""
+    starts = polyline[:-1]
+    directions = polyline[1:] - starts
+    lengths = np.maximum(np.abs(directions) ** 2, 1e-300)
+    t = np.clip(((point - starts) * directions.conjugate()).real / lengths, 0, 1)
+    return float(np.min(np.abs(point - (starts + directions * t))))
+
+
+class Wave(PathSegment):
+    """A segment that only has the methods a subclass must have"""
+
+    __slots__ = ()
+
+    def __init__(self, start: complex, end: complex) -> None:
+        self._start = start
+        self._end = end
+        self.relative = False
+
+    def _d(self, previous: PathSegment) -> str:
+        return ""
+
+    def point(self, pos: float) -> complex:
+        # Two bumps, so the middle point is on the chord
+        bump = 20j * math.sin(2 * math.pi * pos)
+        return self.start + (self.end - self.start) * (pos + bump / 100)
+
+    def tangent(self, pos: float) -> complex:
+        bump = 40j * math.pi * math.cos(2 * math.pi * pos)
+        return (self.end - self.start) * (1 + bump / 100)
+
+    def length(
+        self, error: float = 1e-12, min_depth: int = 5, method: str = "subdivision"
+    ) -> float:
+        return 0.0
+
+    def boundingbox(self) -> List[float]:
+        return []
+
+
+class FlattenTest(unittest.TestCase):
+    def test_segments(self) -> None:
+        for segment in (
+            CubicBezier(0j, 100j, 100 + 100j, 100 + 0j),
+            CubicBezier(0j, 300 + 100j, -200 + 100j, 100 + 0j),
+            QuadraticBezier(0j, 50 + 80j, 100 + 0j),
+            Arc(0j, 50 + 30j, 20, 1, 0, 80 + 10j),
+        ):
+            for tolerance in (1, 0.1, 0.01):
+                polyline = segment.flatten(tolerance)
+                self.assertEqual(polyline[0], segment.start)
+                self.assertEqual(polyline[-1], segment.end)
+                samples = segment.point_many(np.linspace(0, 1, 500))
+                for point in samples:
+                    self.assertLessEqual(_distance(point, polyline), tolerance)
+            # A smaller tolerance gives more points
+            self.assertLess(len(segment.flatten(1)), len(segment.flatten(0.01)))
+
+        line = Line(0j, 100 + 100j)
+        np.testing.assert_array_equal(line.flatten(), [0j, 100 + 100j])
+        np.testing.assert_array_equal(Move(1j).flatten(), [1j])
+
+    def test_other_segment(self) -> None:
+        # Other subclasses of PathSegment are flattened by their points
+        wave = Wave(0j, 100 + 0j)
+        for tolerance in (1, 0.1, 0.01):
+            polyline = wave.flatten(tolerance)
+            self.assertEqual(polyline[0], 0j)
+            self.assertEqual(polyline[-1], 100 + 0j)
+            for point in wave.point_many(np.linspace(0, 1, 500)):
+                self.assertLessEqual(_distance(point, polyline), tolerance)
+        np.testing.assert_array_equal(Move(1j).flatten(), [1j])
+
+    def test_curvature(self) -> None:
+        # The points are dense in the tight bend and sparse in the straight parts
+        curve = CubicBezier(0j, 1000 + 0j, 1000 + 0j, 1000 + 1000j)
+        polyline = curve.flatten(0.1)
+        chords = np.abs(np.diff(polyline))
+        bend = np.abs(polyline[1:] - curve.point(0.5)) < 100
+        self.assertLess(chords[bend].max(), chords[~bend].max())
+
+    def test_path(self) -> None:
+        path = parse_path(
+            "M 0,0 L 10,0 C 10,10 20,10 20,0 Z L 5,5 "
+            "M 100,100 A 5,3 0 0,1 130,100 M 0,0"
+        )
+        points, starts = path.flatten(0.1)
+        subpaths = np.split(points, starts[1:])
+        self.assertEqual(len(subpaths), 4)
+        # The closed subpath ends where it starts
+        self.assertEqual(subpaths[0][0], 0j)
+        self.assertEqual(subpaths[0][1], 10 + 0j)
+        self.assertEqual(subpaths[0][-2], 20 + 0j)
+        self.assertEqual(subpaths[0][-1], 0j)
+        # After the close a new subpath starts at the same point
+        np.testing.assert_array_equal(subpaths[1], [0j, 5 + 5j])
+        self.assertEqual(subpaths[2][0], 100 + 100j)
+        self.assertEqual(subpaths[2][-1], 130 + 100j)
+        np.testing.assert_array_equal(subpaths[3], [0j])
+
+        points, starts = Path().flatten()
+        self.assertEqual(len(points), 0)
+        self.assertEqual(len(starts), 0)
+
+
+class ClosestPointManyTest(unittest.TestCase):
+    def test_path(self) -> None:
+        for pathdef in PATHS:
+            path = parse_path(pathdef)
+            x, y = np.meshgrid(np.linspace(0, 1000, 11), np.linspace(0, 400, 9))
+            points = x + 1j * y
+            indexes, positions, closest, distances = path.closest_point_many(points)
+            self.assertEqual(indexes.shape, points.shape)
+            self.assertEqual(closest.shape, points.shape)
+            for i, point in enumerate(points.flat):
+                expected = path.closest_point(complex(point))
+                self.assertEqual(distances.flat[i], expected.distance)
+                # Ties at shared vertices may be found on either segment
+                self.assertAlmostEqual(abs(closest.flat[i] - point), distances.flat[i])
+                segment = path[int(indexes.flat[i])]
+                self.assertAlmostEqual(
+                    segment.point(positions.flat[i]), closest.flat[i], places=5
+                )
+
+    def test_other_segment(self) -> None:
+        # Other subclasses of PathSegment are sampled and refined
+        wave = Wave(0j, 100 + 0j)
+        dense = wave.point_many(np.linspace(0, 1, 100001))
+        for point in (50 + 0j, 25 - 30j, 80 + 5j, -10 + 10j, 120 - 1j, 30 + 40j):
+            pos, closest, distance = wave.closest_point(point)
+            self.assertAlmostEqual(closest, wave.point(pos))
+            self.assertAlmostEqual(distance, abs(point - closest))
+            self.assertAlmostEqual(distance, np.abs(dense - point).min(), places=5)
+        self.assertEqual(wave.closest_point(-10 + 0j), (0.0, 0j, 10.0))
+
+    def test_no_segments(self) -> None:
+        with self.assertRaises(ValueError):
+            Path(Move(0j)).closest_point_many([0j, 1j])
+        indexes, positions, closest, distances = Path(Move(0j)).closest_point_many([])
+        self.assertEqual(len(distances), 0)
+
+
+class ContainsManyTest(unittest.TestCase):
+    def test_path(self) -> None:
+        for pathdef in PATHS:
+            path = parse_path(pathdef)
+            x, y = np.meshgrid(np.linspace(0, 1000, 41), np.linspace(0, 400, 33))
+            points = x + 1j * y
+            for fill_rule in ("nonzero", "evenodd"):
+                filled = path.contains_many(points, fill_rule=fill_rule)
+                self.assertEqual(filled.shape, points.shape)
+                expected = [
+                    path.contains(complex(point), fill_rule=fill_rule)
+                    for point in points.flat
+                ]
+                self.assertEqual(filled.ravel().tolist(), expected)
+
+    def test_no_segments(self) -> None:
+        self.assertEqual(Path(Move(0j)).contains_many([0j, 1j]).tolist(), [False] * 2)
+        self.assertEqual(len(Path().contains_many([])), 0)
+        with self.assertRaises(ValueError):
+            Path().contains_many([0j], fill_rule="winding")
+
+
+class AreaManyTest(unittest.TestCase):
+    def test_paths(self) -> None:
+        paths = [parse_path(pathdef) for pathdef in PATHS]
+        paths.append(parse_path("M 0,50 A 50,50 0 0,1 100,50 A 50,50 0 0,1 0,50 Z"))
+        paths.append(parse_path("M 0,0 A 0,50 0 0,1 0,100 L 100,50 z m 10,0 h 1 v 1"))
+        paths.append(Path())
+        arrays = [PathArray.from_path(path) for path in paths]
+        areas = array.area_many(arrays)
+        centroids = array.centroid_many(arrays)
+        self.assertEqual(areas.shape, (len(paths),))
+        for path, area, centroid in zip(paths, areas, centroids):
+            self.assertAlmostEqual(area, path.area())
+            if path.area() == 0:
+                self.assertTrue(np.isnan(centroid))
+            else:
+                self.assertAlmostEqual(centroid, path.centroid())
+
+    def test_no_paths(self) -> None:
+        self.assertEqual(len(array.area_many([])), 0)
+        self.assertEqual(len(array.centroid_many([])), 0)
+
+
+class TransformTest(unittest.TestCase):
+    def test_paths(self) -> None:
+        matrices = [
+            [[1.0, 0.0, 10.0], [0.0, 1.0, 20.0]],
+            [[0.0, -1.0, 0.0], [1.0, 0.0, 0.0]],
+            [[-2.0, 0.3, 5.0], [0.1, 1.5, -3.0]],
+        ]
+        for pathdef in PATHS:
+            path = parse_path(pathdef)
+            path_array = PathArray.from_path(path)
+            for matrix in matrices:
+                transformed = path_array.transform(matrix).to_path()
+                expected = path.transform(matrix)
+                for segment, expected_segment in zip(transformed, expected):
+                    self.assertEqual(type(segment), type(expected_segment))
+                    for pos in (0.0, 0.3, 0.5, 1.0):
+                        self.assertAlmostEqual(
+                            segment.point(pos), expected_segment.point(pos)
+                        )
+            self.assertEqual(path_array, PathArray.from_path(path))
+
+    def test_in_place(self) -> None:
+        path_array = parse_path_array("M 0,0 Q 5,10 10,0 A 5,10 0 0,1 20,0 Z")
+        part = path_array[1:3]
+        part.transform_in_place([[1, 0, 0], [0, -1, 0]])
+        self.assertEqual(path_array.end.tolist(), [0j, 10 + 0j, 20 + 0j, 0j])
+        self.assertEqual(path_array.control1.tolist(), [0j, 5 - 10j, 0j, 0j])
+        self.assertEqual(path_array.flags[2] & array.SWEEP, 0)
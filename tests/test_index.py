@@ -0,0 +1,122 @@
+import unittest
+
+from svg.path import Line, Move, Path, SegmentIndex, parse_path
+
+
+def grid() -> SegmentIndex:
+    # Squares of 10 by 10, one path for each, 20 apart
+    paths = [
+        parse_path(f"M {x},{y} h 10 v 10 h -10 z")
+        for y in range(0, 100, 20)
+        for x in range(0, 100, 20)
+    ]
+    return SegmentIndex(paths, capacity=4)
+
+
+class SegmentIndexTest(unittest.TestCase):
+    def test_query(self) -> None:
+        index = grid()
+        self.assertEqual(len(index), 100)
+        # The right side of the first square, and the left of the next
+        self.assertEqual(index.query([8, 2, 22, 8]), [(0, 2), (1, 4)])
+        # Touching the corner of a square
+        self.assertEqual(index.query([30, 30, 35, 35]), [(6, 2), (6, 3)])
+        self.assertEqual(index.query([11, 11, 19, 19]), [])
+        self.assertEqual(len(index.query([-10, -10, 200, 200])), 100)
+
+    def test_radius(self) -> None:
+        index = grid()
+        self.assertEqual(index.query_radius(15 + 5j, 5), [(0, 2), (1, 4)])
+        self.assertEqual(index.query_radius(15 + 5j, 4.9), [])
+        # Close to the boxes of the bottom and right sides, but not the curve
+        path = parse_path("M 0,0 Q 100,0 100,100")
+        index = SegmentIndex([path])
+        self.assertEqual(index.query_radius(90 + 10j, 10), [])
+        self.assertEqual(index.query_radius(90 + 10j, 40), [(0, 1)])
+
+    def test_nearest(self) -> None:
+        index = grid()
+        self.assertEqual(index.nearest(16 + 5j), [(1, 4)])
+        self.assertEqual(index.nearest(16 + 5j, 2), [(1, 4), (0, 2)])
+        self.assertEqual(len(index.nearest(16 + 5j, 1000)), 100)
+        self.assertEqual(SegmentIndex().nearest(0j), [])
+
+    def test_moves(self) -> None:
+        index = SegmentIndex([Path(Move(5 + 5j)), Path()])
+        self.assertEqual(len(index), 0)
+        self.assertEqual(index.query([0, 0, 10, 10]), [])
+        self.assertEqual(index.nearest(0j), [])
+
+    def test_edit(self) -> None:
+        index = grid()
+        path = index.path(0)
+        path.insert(1, Line(0j, -10 - 10j))
+        index.insert(0, 1)
+        self.assertEqual(index.query([-10, -10, -5, -5]), [(0, 1)])
+        self.assertEqual(index.query([8, 2, 22, 8]), [(0, 3), (1, 4)])
+
+        path[1] = Line(0j, 100 + 100j)
+        index.replace(0, 1)
+        self.assertEqual(index.query([-10, -10, -5, -5]), [])
+        self.assertEqual(index.nearest(95 + 95j), [(0, 1)])
+
+        path[1].end = 0.5j
+        index.replace(0, -4)
+        self.assertEqual(index.nearest(95 + 95j), [(24, 2)])
+
+        del path[1]
+        index.delete(0, 1)
+        self.assertEqual(index.query([8, 2, 22, 8]), [(0, 2), (1, 4)])
+        self.assertEqual(len(index), 100)
+
+        with self.assertRaises(IndexError):
+            index.delete(0, 5)
+
+    def test_segment_changed(self) -> None:
+        index = grid()
+        path = index.path(0)
+        path[1].end = 100 + 100j
+        self.assertEqual(index.nearest(95 + 95j), [(0, 1)])
+        self.assertEqual(index.query([52, 52, 58, 58]), [(0, 1)])
+        path[1].end = 10 + 0j
+        self.assertEqual(index.query([52, 52, 58, 58]), [])
+        self.assertEqual(index.query([8, 2, 22, 8]), [(0, 2), (1, 4)])
+        self.assertEqual(len(index), 100)
+
+    def test_segment_changed_other_path(self) -> None:
+        index = grid()
+        other = parse_path("M 0,0 L 10,10")
+        other.boundingbox()
+        other[1].end = 5 + 5j
+        removed = index.path(0)[1]
+        index.path(0)[1] = Line(removed.start, 100 + 100j)
+        index.replace(0, 1)
+        removed.end = 500 + 500j
+        # Only the segments of the paths in the index are indexed again
+        self.assertEqual(index._changed, set())
+        index.path(2)[3].end = 200 + 200j
+        self.assertEqual(len(index._changed), 1)
+        self.assertEqual(index.query([150, 150, 250, 250]), [(2, 3)])
+        self.assertEqual(index._changed, set())
+        # A removed path no longer tells the index
+        path = index.path(2)
+        index.remove(2)
+        path[3].end = 300 + 300j
+        self.assertEqual(index._changed, set())
+        self.assertEqual(index.nearest(95 + 95j), [(0, 1)])
+
+    def test_add_remove(self) -> None:
+        index = SegmentIndex(capacity=2)
+        for x in range(0, 100, 10):
+            self.assertEqual(index.add(parse_path(f"M {x},0 v 10 h 5")), x // 10)
+        self.assertEqual(len(index), 20)
+        self.assertEqual(index.query([12, 0, 18, 20]), [(1, 2)])
+        self.assertEqual(index.nearest(16 + 5j, 3), [(2, 1), (1, 2), (1, 1)])
+        for path_id in range(0, 10, 2):
+            index.remove(path_id)
+        self.assertEqual(len(index), 10)
+        self.assertEqual(index.nearest(4 + 12j), [(1, 1)])
+        self.assertEqual(index.add(parse_path("M 0,10 h 5")), 10)
+        self.assertEqual(index.nearest(4 + 12j), [(10, 1)])
+        with self.assertRaises(KeyError):
+            index.remove(0)
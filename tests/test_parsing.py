@@ -1,6 +1,14 @@
+import mmap
+import pickle
+import tempfile
+import threading
 import unittest
+from collections import Counter
 from svg.path import CubicBezier, QuadraticBezier, Line, Arc, Path, Move, Close
-from svg.path import parse_path
+from svg.path import parse_path, parse_paths
+from svg.path.parser import InvalidPathError, PathParser, iterparse_path
+from svg.path.parser import _parse_packed, _split_at_moves, validate_path
+from svg.path.parser import PathCache, cache_info, disable_cache, enable_cache
 
 
 class TestParser(unittest.TestCase):
@@ -559,6 +567,7 @@ class TestParser(unittest.TestCase):
 
     def test_errors(self) -> None:
         self.assertRaises(ValueError, parse_path, "M 100 100 L 200 200 Z 100 200")
+        self.assertRaises(InvalidPathError, parse_path, "L 100 100 Z")
 
     def test_non_path(self) -> None:
         # It's possible in SVG to create paths that has zero length,
@@ -612,3 +621,324 @@ class TestParser(unittest.TestCase):
 
         path = parse_path("M 0..1")
         self.assertEqual(path.d(), "M 0,0.1")
+
+    def test_bytes(self) -> None:
+        pathdef = (
+            "M 100,100 L 300 100 200 300 A 25,25 -30 0,1 700,300 z m 1 1 s 1 2 3 4"
+        )
+        expected = parse_path(pathdef)
+        data = pathdef.encode()
+        self.assertEqual(parse_path(data), expected)
+        self.assertEqual(parse_path(bytearray(data)), expected)
+        self.assertEqual(parse_path(memoryview(data)), expected)
+
+        with tempfile.TemporaryFile() as f:
+            f.write(data)
+            f.flush()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                self.assertEqual(parse_path(mapped), expected)
+
+        with self.assertRaises(InvalidPathError) as cm:
+            parse_path(b"M 100 100 L 200 x")
+        self.assertEqual(str(cm.exception), "Invalid path element L 200 x")
+        self.assertRaises(InvalidPathError, parse_path, b"X 100 100")
+        self.assertRaises(InvalidPathError, parse_path, b"M 100 100 A 1 1 0 2 0 1 1")
+
+
+class TestPathParser(unittest.TestCase):
+    PATHS = [
+        "M 100 100 L 300 100 L 200 300 z",
+        "M100,200 C100,100 250,100 250,200 S400,300 400,200 s 150,-100 150,0",
+        "M200,300 Q400,50 600,300 T1000,300 t 150,0",
+        "M 0 0 L 50 20 m 50 80 L 300 100 L 200 300 z l -3.4e-3,3.4E+3 z",
+        "M 5 1 v 7.344 A 3.574 3.574 0 003.5 8 3.515 3.515 0 000 11.5 h 6 V 1 z",
+        "M 0 0 L 10 10 20 20 x 30 30",
+    ]
+
+    def test_chunks(self) -> None:
+        for pathdef in self.PATHS:
+            expected = parse_path(pathdef)
+            for size in (1, 2, 3, 7, 100):
+                chunks = [pathdef[i:][:size] for i in range(0, len(pathdef), size)]
+                self.assertEqual(Path(*iterparse_path(chunks)), expected)
+                bchunks = [chunk.encode() for chunk in chunks]
+                self.assertEqual(Path(*iterparse_path(bchunks)), expected)
+
+    def test_feed(self) -> None:
+        parser = PathParser()
+        # The second coordinate could still continue in the next chunk
+        self.assertEqual(parser.feed("M 100 10"), [])
+        self.assertEqual(parser.feed("0 L 300 1"), [Move(100 + 100j)])
+        self.assertEqual(
+            parser.feed("00 C 300,200 400,200 400,100 S 500 0"),
+            [
+                Line(100 + 100j, 300 + 100j),
+                CubicBezier(300 + 100j, 300 + 200j, 400 + 200j, 400 + 100j),
+            ],
+        )
+        # The smooth curve reflects the control point of the previous chunk
+        self.assertEqual(
+            parser.feed(" 500,100 z"),
+            [
+                CubicBezier(400 + 100j, 400 + 0j, 500 + 0j, 500 + 100j),
+                Close(500 + 100j, 100 + 100j),
+            ],
+        )
+        self.assertEqual(parser.close(), [])
+
+    def test_feed_after_junk(self) -> None:
+        # Anything after an invalid character is ignored, and not kept
+        parser = PathParser()
+        self.assertEqual(parser.feed("M 0 0 L 1 1 "), [Move(0j), Line(0j, 1 + 1j)])
+        for _ in range(10):
+            self.assertEqual(parser.feed("X" * 100), [])
+            self.assertEqual(len(parser._buffer), 0)
+        self.assertEqual(parser.close(), [])
+
+    def test_errors(self) -> None:
+        parser = PathParser()
+        self.assertRaises(ValueError, parser.feed, "X 100 100")
+
+        parser = PathParser()
+        parser.feed("M 100 100 L 200")
+        self.assertRaises(ValueError, parser.close)
+
+
+class TestPathCache(unittest.TestCase):
+    def tearDown(self) -> None:
+        disable_cache()
+
+    def test_statistics(self) -> None:
+        cache = PathCache(maxsize=2)
+        cache.parse("M 0,0 L 1,1")
+        cache.parse("M 0,0 L 1,1")
+        cache.parse("M 0,0 L 2,2")
+        # Using the first path makes the second the least recently used
+        cache.parse("M 0,0 L 1,1")
+        cache.parse("M 0,0 L 3,3")
+        self.assertEqual(tuple(cache.info()), (2, 3, 1, 2, 2))
+        cache.parse("M 0,0 L 1,1")
+        self.assertEqual(cache.info().hits, 3)
+        cache.parse("M 0,0 L 2,2")
+        self.assertEqual(cache.info().misses, 4)
+
+        cache.clear()
+        self.assertEqual(tuple(cache.info()), (0, 0, 0, 2, 0))
+        with self.assertRaises(ValueError):
+            PathCache(maxsize=0)
+
+    def test_parse_path(self) -> None:
+        pathdef = "M 100,200 C 100,100 250,100 250,200 S 400,300 400,200"
+        self.assertIsNone(cache_info())
+        enable_cache(maxsize=10)
+        path1 = parse_path(pathdef)
+        path2 = parse_path(pathdef)
+        self.assertEqual(path1, path2)
+        self.assertEqual(path1, Path(*PathParser()._parse(pathdef, final=True)))
+        info = cache_info()
+        assert info is not None
+        self.assertEqual((info.hits, info.misses), (1, 1))
+        disable_cache()
+        parse_path(pathdef)
+        self.assertIsNone(cache_info())
+
+    def test_copy_on_write(self) -> None:
+        cache = PathCache()
+        pathdef = "M 100,200 C 100,100 250,100 250,200 L 300,300 z"
+        path1 = cache.parse(pathdef)
+        path2 = cache.parse(pathdef)
+        expected = parse_path(pathdef)
+
+        # Changing a segment from one path doesn't change the other paths
+        segment = path1[1]
+        assert isinstance(segment, CubicBezier)
+        segment.control1 = 0j
+        self.assertIs(path1[1], segment)
+        self.assertEqual(path2, expected)
+        self.assertEqual(cache.parse(pathdef), expected)
+
+        # Neither does iterating and changing the path
+        for each in path2:
+            each.end += 1
+        del path2[0]
+        path2.append(Line(0j, 1j))
+        self.assertEqual(cache.parse(pathdef), expected)
+
+        # Nor slicing and assigning slices
+        part = cache.parse(pathdef)[1:3]
+        part[0].start = 5j
+        path3 = Path(Line(0j, 1j))
+        path3[0:1] = cache.parse(pathdef)
+        path3[1].start = 5j
+        self.assertEqual(cache.parse(pathdef), expected)
+
+    def test_threads(self) -> None:
+        cache = PathCache(maxsize=5)
+        pathdefs = [f"M 0,0 L {i},{i} Q 1,2 3,4" for i in range(20)]
+        errors = []
+
+        def parse() -> None:
+            for pathdef in pathdefs * 20:
+                if cache.parse(pathdef) != parse_path(pathdef):
+                    errors.append(pathdef)
+
+        threads = [threading.Thread(target=parse) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        info = cache.info()
+        self.assertEqual(info.hits + info.misses, 4 * 20 * 20)
+        self.assertEqual(info.currsize, 5)
+
+
+class TestParsePaths(unittest.TestCase):
+    PATHDEFS = [
+        "M 100 100 L 300 100 L 200 300 z",
+        "M100,200 C100,100 250,100 250,200 S400,300 400,200",
+        "M200,300 Q400,50 600,300 T1000,300",
+        "M 600,350 l 50,-25 a25,25 -30 0,1 50,-25 l 50,-25 h 10 v 10 H 5 V 5",
+        "m 1 2 3 4 z m 5 6 c 1 2 3 4 5 6 s 1 2 3 4 q 1 2 3 4 t 5 6 Z",
+        "",
+    ]
+
+    def test_packed(self) -> None:
+        packed = pickle.loads(pickle.dumps(_parse_packed(self.PATHDEFS)))
+        expected = [parse_path(pathdef) for pathdef in self.PATHDEFS]
+        paths = packed.unpack()
+        self.assertEqual(paths, expected)
+        for path, expected_path in zip(paths, expected):
+            self.assertEqual(path.d(), expected_path.d())
+
+    def test_order(self) -> None:
+        pathdefs = [
+            f"M {i} 0 L {i} 1 {pathdef[1:]}"
+            for i, pathdef in enumerate(self.PATHDEFS * 10)
+        ]
+        expected = [parse_path(pathdef) for pathdef in pathdefs]
+        self.assertEqual(parse_paths(pathdefs, workers=2, chunksize=3), expected)
+        self.assertEqual(parse_paths(iter(pathdefs), workers=1), expected)
+        self.assertEqual(parse_paths([], workers=2), [])
+
+    def test_errors(self) -> None:
+        with self.assertRaises(InvalidPathError):
+            parse_paths(self.PATHDEFS + ["M 100 100 L 200 x"], workers=2, chunksize=2)
+        with self.assertRaises(ValueError):
+            parse_paths(self.PATHDEFS, chunksize=0)
+
+
+class TestParallelParsing(unittest.TestCase):
+    # Each with a subpath that can't be split off, as its start isn't known
+    PATHDEFS = [
+        "M 100 100 L 300 100 L 200 300 z M 1 2 3 4 M 5 6 m 1 1 l 2 2",
+        "m 1 2 3 4 z m 5 6 c 1 2 3 4 5 6 s 1 2 3 4 z m 1 1 7 8 m 1 1 z m 2 2",
+        "M200,300 Q400,50 600,300 T1000,300 zm 1,1 t 5,5 Zm1-1s1 2 3 4 m 1 1",
+        "M 0 0 L 1 1 M 2 2 L 3 3 x M 4 4 L 5 5",
+        "  m 1 1 h 10 v 10 z",
+    ]
+
+    def test_split(self) -> None:
+        pathdef = "m 1 2 l 3 4 z m 1 1 l 2 2 m 3 3 Z m 1 1 M 10 10 z m 1 1"
+        self.assertEqual(
+            _split_at_moves(pathdef, 100),
+            [(0, 0j), (14, 1 + 2j), (40, 0j), (50, 10 + 10j)],
+        )
+        self.assertEqual(_split_at_moves(pathdef, 1), [(0, 0j)])
+        self.assertEqual(_split_at_moves(pathdef.encode(), 2), [(0, 0j), (40, 0j)])
+
+    def test_same_as_serial(self) -> None:
+        for pathdef in self.PATHDEFS:
+            # The same path many times, so that it's split into many parts
+            pathdef = " ".join([pathdef] * 10)
+            expected = parse_path(pathdef)
+            for definition in (pathdef, pathdef.encode()):
+                path = parse_path(definition, workers=2)
+                self.assertEqual(path, expected)
+                self.assertEqual(path.d(), expected.d())
+
+    def test_errors(self) -> None:
+        # In the first part, and in the last part
+        with self.assertRaises(InvalidPathError):
+            parse_path("M 1 1 L x " + "M 3 3 L 4 4 " * 10, workers=2)
+        with self.assertRaises(InvalidPathError):
+            parse_path("M 3 3 L 4 4 " * 10 + "M 1 1 L x", workers=2)
+
+
+class TestValidatePath(unittest.TestCase):
+    # Both valid and invalid path definitions, written in many ways
+    PATHDEFS = [
+        "",
+        "  ",
+        "M 100 100 L 300 100 L 200 300 z",
+        "M100,200 C100,100 250,100 250,200 S400,300 400,200",
+        "M600,800 C625,700 725,700 750,800 S875,900 900,800",
+        "M200,300 Q400,50 600,300 T1000,300",
+        "M 1 2 3 4 5 6 m 1 2 3 4",
+        "M-3.4e38 3.4E+38L-3.4E-38,3.4e-38",
+        "M 0. .1",
+        "M 0..1",
+        "M0-1.5.5-2e-1-.5",
+        "M120,120 h25 a25,25 0 1,0 -25,25 z",
+        "M200,120 h-25 a25,25 0 1125,25 z",
+        "M120,200 h25 a25,25 0 1 1-25,-25 z",
+        "M 0 0 A -0 0 0 0 0 1 1",
+        "M 0 0 L 1 1 % a comment",
+        "M 0 0 L 1 1 2 x",
+        "M 0 0 L 1 1 2 2 3 z m 1 1",
+        "M280,120 h25 a25,25 0 6 0 -25,25 z",
+        "M360,120 h-25 a25,25 0 1 -1 25,25 z",
+        "M200,200 h-25 a25,2501 025,-25 z",
+        "M 0 0 A -1 1 0 0 0 1 1",
+        "M 0 0 A 1 1 0 0 0 1 1 -1 1 0 0 0 2 2",
+        "M 0 0 A 1 1 0 0 0 1 1 1 -1 0 0 0 2 2",
+        "M 100 100 L 200 200 Z 100 200",
+        "M 100 100 L 200 200 Z,",
+        "M,100 100",
+        "M 100 100 L",
+        "M 100 100 L 200",
+        "M 100 100 L 200 - 300",
+        "M 100 100 L 200 1e",
+        "X 100 100",
+        "100 100",
+        "L 100 100 Z",
+        "M 100 100 L 200 200 X 300 300",
+    ]
+
+    def test_same_as_parsing(self) -> None:
+        for pathdef in self.PATHDEFS:
+            result = validate_path(pathdef)
+            parser = PathParser()
+            try:
+                for token in parser._tokenizer.tokenize(pathdef):
+                    parser._command(token)
+            except InvalidPathError:
+                self.assertFalse(result.valid, pathdef)
+                self.assertIsNotNone(result.offset)
+                self.assertIsNotNone(result.message)
+            else:
+                self.assertTrue(result.valid, pathdef)
+                self.assertIsNone(result.offset)
+                self.assertIsNone(result.message)
+            # The segments made before the error are counted
+            counts = Counter(type(segment).__name__ for segment in parser._segments)
+            self.assertEqual(result.counts, dict(counts), pathdef)
+
+    def test_offset(self) -> None:
+        result = validate_path("M 100 100 L 200 - 300")
+        self.assertEqual(result.offset, 16)
+        self.assertEqual(result.counts, {"Move": 1})
+
+        result = validate_path("M 0 0 A 1 1 0 0 0 1 1 1 -1 0 0 0 2 2")
+        self.assertEqual(result.offset, 24)
+        self.assertEqual(result.counts, {"Move": 1, "Arc": 1})
+
+        result = validate_path("M 100 100 L 200 200 Z 100 200")
+        self.assertEqual(result.offset, 22)
+        self.assertEqual(result.counts, {"Move": 1, "Line": 1, "Close": 1})
+
+        result = validate_path("  100 100")
+        self.assertEqual(result.offset, 2)
+        self.assertEqual(result.message, "Path does not start with a command")
+        self.assertEqual(result.counts, {})
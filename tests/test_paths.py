@@ -1,6 +1,9 @@
 import unittest
+import copy
 import pytest
-from math import sqrt, pi
+from cmath import exp
+from math import atan, sqrt, pi, radians
+from typing import List, Tuple
 
 from svg.path import (
     CubicBezier,
@@ -12,7 +15,8 @@ from svg.path import (
     Path,
     PathSegment,
 )
-from svg.path import parse_path
+from svg.path import intersections, parse_path, parser
+from svg.path.path import QUADRATURE
 
 
 class PathTest(unittest.TestCase):
@@ -66,6 +70,7 @@ class PathTest(unittest.TestCase):
     def test_path_lengths(self) -> None:
         path = parse_path("M 0 0 L 100 0 L 100 50 L 0 50 z")
         self.assertAlmostEqual(path.length(), 300.0)
+        self.assertAlmostEqual(path.length(method=QUADRATURE), 300.0)
         self.assertEqual(len(path), 5)
 
         lengths = path.lengths
@@ -109,6 +114,24 @@ class PathTest(unittest.TestCase):
             for pos in (0.0, 0.25, 0.5, 0.75, 1.0):
                 self.assertAlmostEqual(path.point(pos), clean.point(pos))
 
+    def test_slots(self) -> None:
+        # Segments have no __dict__, to save memory
+        for segment in (
+            Line(0j, 1 + 1j),
+            Close(0j, 1 + 1j),
+            Move(1 + 1j),
+            CubicBezier(0j, 1j, 1 + 1j, 1 + 0j),
+            QuadraticBezier(0j, 1j, 1 + 0j),
+            Arc(0j, 1 + 1j, 0, 0, 1, 2 + 0j),
+        ):
+            self.assertFalse(hasattr(segment, "__dict__"))
+            with self.assertRaises(AttributeError):
+                segment.color = "red"  # type: ignore[union-attr]
+
+        arc = Arc(0j, 1 + 1j, 0, 0, 1, 2 + 0j)
+        self.assertEqual(arc.center, 1 + 0j)
+        self.assertEqual(arc.radius_scale, 1)
+
 
 # Most of these test points are not calculated separately, as that would
 # take too long and be too error prone. Instead the curves have been verified
@@ -377,6 +400,32 @@ class CubicBezierTest(unittest.TestCase):
         )
         self.assertTrue(arc.length() > 300.0)
 
+    def test_quadrature_length(self) -> None:
+        curves = [
+            CubicBezier(300 + 100j, 100 + 100j, 200 + 200j, 200 + 300j),
+            CubicBezier(600 + 500j, 600 + 350j, 900 + 650j, 900 + 500j),
+            # A cusp
+            CubicBezier(0j, 100 + 100j, 0 + 100j, 100 + 0j),
+            # A straight line with the control points on the ends
+            CubicBezier(0j, 0j, 100 + 100j, 100 + 100j),
+        ]
+        for curve in curves:
+            # The subdivision is the less accurate of the two methods
+            self.assertAlmostEqual(
+                curve.length(method=QUADRATURE), curve.length(), places=7
+            )
+
+        with pytest.raises(ValueError):
+            curves[0].length(method="guesswork")
+
+    def test_quadrature_length_far_from_origin(self) -> None:
+        # Rounding errors must not make the quadrature subdivide endlessly
+        curve = CubicBezier(0j, 5j, 1 + 5j, 1 + 0j)
+        far = CubicBezier(40000 + 0j, 40000 + 5j, 40001 + 5j, 40001 + 0j)
+        self.assertAlmostEqual(
+            far.length(method=QUADRATURE), curve.length(method=QUADRATURE), places=9
+        )
+
     def test_equality(self) -> None:
         # This is to test the __eq__ and __ne__ methods, so we can't use
         # assertEqual and assertNotEqual
@@ -399,6 +448,36 @@ class CubicBezierTest(unittest.TestCase):
         cb2.set_smooth_from(cb1)
         self.assertTrue(cb2.is_smooth_from(cb1))
 
+    def test_changed(self) -> None:
+        # The cached coefficients follow changes to the points
+        segment = CubicBezier(0j, 100j, 100 + 100j, 100 + 0j)
+        segment.point(0.5)
+        for name, value in (
+            ("start", 200 + 0j),
+            ("control1", 200 + 100j),
+            ("control2", 300 + 200j),
+            ("end", 100 + 300j),
+        ):
+            setattr(segment, name, value)
+            fresh = CubicBezier(
+                segment.start, segment.control1, segment.control2, segment.end
+            )
+            for pos in (0.25, 0.75):
+                self.assertEqual(segment.point(pos), fresh.point(pos))
+                self.assertEqual(segment.tangent(pos), fresh.tangent(pos))
+            self.assertEqual(segment.length(), fresh.length())
+            self.assertEqual(segment.boundingbox(), fresh.boundingbox())
+        self.assertAlmostEqual(segment.point(0.5), 225 + 150j)
+
+    def test_ends_far_from_origin(self) -> None:
+        segment = CubicBezier(
+            1e8 + 0.1j, 1e8 + 100.3j, 1e8 + 100.7 + 100j, 1e8 + 100.9 + 0.5j
+        )
+        self.assertEqual(segment.point(0), segment.start)
+        self.assertEqual(segment.point(1), segment.end)
+        self.assertEqual(segment.tangent(0), 3 * (segment.control1 - segment.start))
+        self.assertEqual(segment.tangent(1), 3 * (segment.end - segment.control2))
+
 
 class QuadraticBezierTest(unittest.TestCase):
     def test_svg_examples(self) -> None:
@@ -478,6 +557,24 @@ class QuadraticBezierTest(unittest.TestCase):
         cb2.set_smooth_from(cb1)
         self.assertTrue(cb2.is_smooth_from(cb1))
 
+    def test_changed(self) -> None:
+        # The cached coefficients follow changes to the points
+        segment = QuadraticBezier(0j, 100j, 100 + 0j)
+        segment.point(0.5)
+        for name, value in (
+            ("start", 200 + 0j),
+            ("control", 200 + 100j),
+            ("end", 100 + 300j),
+        ):
+            setattr(segment, name, value)
+            fresh = QuadraticBezier(segment.start, segment.control, segment.end)
+            for pos in (0.25, 0.75):
+                self.assertEqual(segment.point(pos), fresh.point(pos))
+                self.assertEqual(segment.tangent(pos), fresh.tangent(pos))
+            self.assertEqual(segment.length(), fresh.length())
+            self.assertEqual(segment.boundingbox(), fresh.boundingbox())
+        self.assertAlmostEqual(segment.point(0.5), 175 + 125j)
+
 
 class ArcTest(unittest.TestCase):
     def test_points(self) -> None:
@@ -556,6 +653,29 @@ class ArcTest(unittest.TestCase):
         self.assertAlmostEqual(arc1.length(), pi * 100)
         self.assertAlmostEqual(arc2.length(), pi * 100)
 
+    def test_quadrature_length(self) -> None:
+        arcs = [
+            Arc(0j, 100 + 50j, 0, False, True, 200 + 0j),
+            Arc(0j, 100 + 50j, 30, True, False, 20 + 10j),
+            Arc(0j, 30 + 50j, -45, False, False, 50 + 50j),
+            # Out of range radius
+            Arc(0j, 1 + 2j, 0, False, False, 200 + 0j),
+        ]
+        for arc in arcs:
+            self.assertAlmostEqual(
+                arc.length(method=QUADRATURE), arc.length(), places=7
+            )
+
+    def test_tangent(self) -> None:
+        # The tangent is the derivative of the point by the angle, also for
+        # ellipses, so it has the same direction as the path.
+        arc = Arc(0j, 100 + 50j, 30, True, False, 20 + 10j)
+        for pos in (0, 0.2, 0.5, 0.8, 1):
+            step = 1e-6
+            difference = arc.point(pos + step) - arc.point(pos - step)
+            derivative = difference / (2 * step) / radians(arc.delta)
+            self.assertAlmostEqual(arc.tangent(pos), derivative, places=4)
+
     def test_length_out_of_range(self) -> None:
         # See F.6.2 Out-of-range parameters
 
@@ -594,7 +714,7 @@ class ArcTest(unittest.TestCase):
 
     def test_issue25(self) -> None:
         # This raised a math domain error
-        Arc(
+        arc = Arc(
             (725.307482225571 - 915.5548199281527j),
             (202.79421639137703 + 148.77294617167183j),
             225.6910319606926,
@@ -602,6 +722,54 @@ class ArcTest(unittest.TestCase):
             1,
             (-624.6375539637027 + 896.5483089399895j),
         )
+        arc.point(0.5)
+
+    def test_lazy_parameterization(self) -> None:
+        arc = Arc(0j, 100 + 100j, 0, 0, 0, 200 + 0j)
+        self.assertEqual(Path(Move(0j), arc).d(), "M 0,0 A 100,100 0 0,0 200,0")
+        self.assertFalse(arc._parameterized)
+        self.assertAlmostEqual(arc.point(0.5), 100 + 100j)
+        self.assertTrue(arc._parameterized)
+
+        # Changing the arc calculates the parameterization again
+        arc.end = 100 + 100j
+        self.assertAlmostEqual(arc.center, 100 + 0j)
+        self.assertAlmostEqual(arc.delta, -90)
+        arc.sweep = 1
+        self.assertAlmostEqual(arc.center, 100j)
+        self.assertAlmostEqual(arc.delta, 90)
+        arc.radius = 200 + 200j
+        self.assertAlmostEqual(arc.radius_scale, 1)
+        self.assertAlmostEqual(arc.point(0), 0j)
+        self.assertAlmostEqual(arc.point(1), 100 + 100j)
+        arc.rotation = 90
+        arc.radius = 10 + 20j
+        self.assertAlmostEqual(arc.point(0), 0j)
+        self.assertAlmostEqual(arc.point(1), 100 + 100j)
+        # Rotated, the half distance between the ends is 50 by -50
+        self.assertAlmostEqual(arc.radius_scale, sqrt(50**2 / 10**2 + 50**2 / 20**2))
+
+    def test_boundingbox_out_of_range(self) -> None:
+        arc = Arc(10 + 20j, 100 + 100j, 0, 0, 0, 10 + 20j)
+        self.assertEqual(arc.boundingbox(), [10, 20, 10, 20])
+        arc = Arc(200 + 0j, 0j, 0, 0, 0, 10 + 20j)
+        self.assertEqual(arc.boundingbox(), [10, 0, 200, 20])
+
+    def test_boundingbox_ends(self) -> None:
+        # The box has the exact ends, not the points at 0 and 1
+        arc = Arc(0.1 + 0.2j, 3 + 2j, 30, 0, 1, 2.3 + 1.7j)
+        self.assertEqual(arc.boundingbox(), [0.1, 0.2, 2.3, 1.7])
+        arc = Arc(100j, 60 + 40j, 30, 1, 0, 100 + 0j)
+        self.assertEqual(arc.boundingbox()[:2], [0, 0])
+
+    def test_scaled_radius_ends(self) -> None:
+        # When the radius is scaled up, the center is halfway between the ends
+        for radius in (25 + 25j, 25 + 50j, 25 + 75j, 25 + 100j):
+            arc = Arc(650 + 325j, radius, -30, 0, 1, 700 + 300j)
+            self.assertEqual(arc.center, 675 + 312.5j)
+            self.assertEqual(arc.delta, 180)
+            self.assertAlmostEqual(arc.point(0), arc.start, delta=1e-9)
+            self.assertAlmostEqual(arc.point(1), arc.end, delta=1e-9)
 
 
 class TestPath(unittest.TestCase):
@@ -616,6 +784,276 @@ class TestPath(unittest.TestCase):
         self.assertAlmostEqual(path.point(1.0), (0j))
         self.assertAlmostEqual(path.length(), pi * 200)
 
+    def test_quadrature_length(self) -> None:
+        path = parse_path(
+            "M 100,200 C 100,100 250,100 250,200 S 400,300 400,200 "
+            "A 50,25 -30 0,1 450,250 Q 400,50 600,300 z"
+        )
+        length = path.length()
+        self.assertAlmostEqual(path.length(method=QUADRATURE), length, places=7)
+        # Changing the method recalculates the lengths
+        self.assertNotEqual(path.length(), path.length(method=QUADRATURE))
+
+    def test_point_by_length(self) -> None:
+        for pathdef in (
+            "M 300,100 C 100,100 200,200 200,300",
+            "M 0,0 A 100,50 30 0,1 300,400",
+            "M 200,300 Q 400,50 600,300",
+        ):
+            path = parse_path(pathdef)
+            step = path.length(method=QUADRATURE) / 100
+            points = [path.point(i / 100, by_length=True) for i in range(101)]
+            # The points are evenly spaced, so the chords are all (almost)
+            # as long as the arcs between them.
+            for p1, p2 in zip(points, points[1:]):
+                self.assertAlmostEqual(abs(p2 - p1) / step, 1, places=3)
+            self.assertEqual(points[0], path.point(0))
+            self.assertEqual(points[-1], path.point(1))
+
+        # Lines are unaffected
+        path = parse_path("M 0,0 L 100,0 L 100,300")
+        self.assertAlmostEqual(path.point(0.5, by_length=True), 100 + 100j)
+        self.assertAlmostEqual(path.tangent(0.5, by_length=True), 300j)
+
+    def test_point_by_length_bent(self) -> None:
+        # Almost a cusp, where a fixed quadrature rule is far off
+        path = Path(Move(0j), QuadraticBezier(0j, 100 + 1j, 1 + 0j))
+        length = path.length()
+        for i in range(101):
+            self.assertAlmostEqual(
+                path.point(i / 100, by_length=True),
+                path.point_at_distance(i / 100 * length),
+                delta=1e-9,
+            )
+
+    def test_point_by_length_mutated(self) -> None:
+        path = parse_path("M 0,0 L 100,0 L 100,300")
+        self.assertAlmostEqual(path.point(0.5, by_length=True), 100 + 100j)
+        # The length tables are recalculated when the path changes
+        path[2] = Line(100 + 0j, 100 + 100j)
+        self.assertAlmostEqual(path.point(0.5, by_length=True), 100 + 0j)
+        del path[2]
+        self.assertAlmostEqual(path.point(0.5, by_length=True), 50 + 0j)
+        path.insert(1, Line(0j, 0 + 100j))
+        self.assertAlmostEqual(path.point(0.25, by_length=True), 0 + 50j)
+
+    def test_boundingbox_cached(self) -> None:
+        calls = []
+
+        class CountingLine(Line):
+            def boundingbox(self) -> List[float]:
+                calls.append(self)
+                return super().boundingbox()
+
+        path = Path(*(CountingLine(i + 0j, i + 1j) for i in range(100)))
+        self.assertEqual(path.boundingbox(), [0, 0, 99, 1])
+        self.assertEqual(len(calls), 100)
+        # The boxes are cached
+        self.assertEqual(path.boundingbox(), [0, 0, 99, 1])
+        self.assertEqual(len(calls), 100)
+        # Only the box of a replaced segment is recalculated
+        path[-3] = CountingLine(50 + 0j, 150 - 1j)
+        self.assertEqual(path.boundingbox(), [0, -1, 150, 1])
+        self.assertEqual(len(calls), 101)
+        # Also for inserted segments
+        path.insert(0, CountingLine(-5 + 0j, 0j))
+        self.assertEqual(path.boundingbox(), [-5, -1, 150, 1])
+        self.assertEqual(len(calls), 102)
+
+    def test_boundingbox_mutated(self) -> None:
+        path = parse_path(
+            "M 100,100 L 300,100 L 200,300 z m 10,10 C 100,100 250,100 250,200 "
+            "S 400,300 400,200 Q 400,50 600,300 T 1000,300 "
+            "A 25,50 -30 0,1 1050,250 M 0,0"
+        )
+        segments = list(path)
+        path.boundingbox()
+
+        def check() -> None:
+            self.assertEqual(path.boundingbox(), Path(*path).boundingbox())
+
+        path[3] = Line(-10 + 0j, 0j)
+        check()
+        del path[-1]
+        check()
+        path.insert(2, Line(0j, 2000 + 0j))
+        check()
+        path[5:8] = [Line(0j, 3j)]
+        check()
+        path[::2] = path[::2]
+        check()
+        del path[0:3]
+        check()
+        path[-1] = segments[8]
+        check()
+
+        with self.assertRaises(ValueError):
+            Path().boundingbox()
+
+    def test_boundingbox_segment_changed(self) -> None:
+        path = parse_path("M 0 0 L 10 10 L 20 0")
+        self.assertEqual(path.boundingbox(), [0, 0, 20, 10])
+        self.assertAlmostEqual(path.length(), 2 * sqrt(200))
+        path[1].end = 100 + 100j
+        self.assertEqual(path.boundingbox(), [0, 0, 100, 100])
+        self.assertAlmostEqual(path.length(), sqrt(20000) + sqrt(200))
+
+        square = parse_path("M 0,0 H 10 V 10 H 0 Z")
+        self.assertFalse(square.contains(50 + 5j))
+        square[1].end = square[2].start = 100 + 0j
+        square[2].end = square[3].start = 100 + 10j
+        self.assertTrue(square.contains(50 + 5j))
+        self.assertEqual(square.closest_point(150 + 5j).point, 100 + 5j)
+
+        quadratic = QuadraticBezier(0j, 50 + 0j, 100 + 0j)
+        cubic = CubicBezier(100 + 0j, 100 + 0j, 200 + 0j, 200 + 0j)
+        arc = Arc(200 + 0j, 50 + 50j, 0, False, True, 300 + 0j)
+        path = Path(Move(0j), quadratic, cubic, arc)
+        self.assertEqual(path.boundingbox(), [0, -50, 300, 0])
+        quadratic.control = 50 + 100j
+        self.assertEqual(path.boundingbox(), [0, -50, 300, 50])
+        cubic.control2 = 150 - 100j
+        arc.sweep = False
+        self.assertEqual(path.boundingbox(), Path(*path).boundingbox())
+        self.assertAlmostEqual(path.boundingbox()[1], -400 / 9)
+        # A slice has the same segments, and both paths notice the change
+        part = path[1:3]
+        part.boundingbox()
+        part[0].end = 100 + 200j
+        self.assertAlmostEqual(part.boundingbox()[3], 200)
+        self.assertAlmostEqual(path.boundingbox()[3], 200)
+
+        calls = []
+
+        class CountingLine(Line):
+            def boundingbox(self) -> List[float]:
+                calls.append(self)
+                return super().boundingbox()
+
+        path = Path(*(CountingLine(i + 0j, i + 1j) for i in range(100)))
+        path.boundingbox()
+        # Only the box of the changed segment is recalculated
+        path[50].end = 50 + 10j
+        self.assertEqual(path.boundingbox(), [0, 0, 99, 10])
+        self.assertEqual(len(calls), 101)
+        self.assertEqual(path.boundingbox(), [0, 0, 99, 10])
+        self.assertEqual(len(calls), 101)
+
+    def test_segment_changed_other_path(self) -> None:
+        big = Path(*(Line(i + 0j, i + 1j) for i in range(1000)))
+        self.assertEqual(big.boundingbox(), [0, 0, 999, 1])
+        small = parse_path("M 0 0 L 10 10")
+        small.boundingbox()
+        small[1].end = 20 + 20j
+        self.assertEqual(small.boundingbox(), [0, 0, 20, 20])
+        # Changing a segment of another path doesn't make the big path look
+        # for the changed segments in its own
+        assert big._boxes is not None
+        self.assertIsNone(big._positions)
+        self.assertEqual(big._boxes.changed, set())
+        self.assertEqual(big.boundingbox(), [0, 0, 999, 1])
+
+        # Removed segments and copies don't tell the path when they change
+        removed = big[999]
+        big[999] = Line(999 + 0j, 999 + 2j)
+        self.assertEqual(big.boundingbox(), [0, 0, 999, 2])
+        removed.end = 999 + 3j
+        copied = copy.deepcopy(big[0])
+        copied.end = 5j
+        self.assertEqual(big._boxes.changed, set())
+        self.assertEqual(big.boundingbox(), [0, 0, 999, 2])
+        big[0].end = 4j
+        self.assertEqual(big._boxes.changed, {0})
+        self.assertEqual(big.boundingbox(), [0, 0, 999, 4])
+
+    def test_lengths_incremental(self) -> None:
+        calls = []
+
+        class CountingLine(Line):
+            def length(
+                self,
+                error: float = 1e-12,
+                min_depth: int = 5,
+                method: str = "subdivision",
+            ) -> float:
+                calls.append(self)
+                return super().length(error, min_depth, method)
+
+        path = Path(*(CountingLine(i * 10 + 0j, i * 10 + 10 + 0j) for i in range(100)))
+        self.assertAlmostEqual(path.point(0.5), 500 + 0j)
+        self.assertEqual(len(calls), 100)
+        # Only the length of a replaced or inserted segment is calculated
+        path[10] = CountingLine(100 + 0j, 100 + 1000j)
+        self.assertAlmostEqual(path.length(), 1990)
+        self.assertEqual(len(calls), 101)
+        path.insert(0, CountingLine(-1010 + 0j, 0j))
+        self.assertAlmostEqual(path.point(0.25), -260 + 0j)
+        self.assertEqual(len(calls), 102)
+        del path[0]
+        self.assertAlmostEqual(path.point(0.1), 100 + 99j)
+        self.assertEqual(len(calls), 102)
+        self.assertEqual(len(path._fractions), len(path))
+        self.assertAlmostEqual(sum(path.lengths), 1.0)
+        # Changing the method calculates all lengths again
+        path.length(method=QUADRATURE)
+        self.assertEqual(len(calls), 202)
+
+        # Changing a segment of another path doesn't touch the lengths
+        self.assertAlmostEqual(path.point(0.5, by_length=True), 100 + 895j)
+        calls.clear()
+        other = Path(CountingLine(0j, 10 + 0j))
+        other.point(0.5, by_length=True)
+        other[0].end = 20 + 0j
+        self.assertAlmostEqual(other.length(), 20)
+        self.assertEqual(len(calls), 2)
+        assert path._segment_lengths is not None and path._tables is not None
+        self.assertIsNone(path._positions)
+        self.assertEqual(path._segment_lengths.changed, set())
+        self.assertEqual(path._tables.changed, set())
+        self.assertAlmostEqual(path.point(0.5, by_length=True), 100 + 895j)
+        self.assertEqual(len(calls), 2)
+        # A segment changed in place is measured again
+        path[20].end = path[21].start = 205 + 0j
+        self.assertAlmostEqual(path.point(0.5, by_length=True), 100 + 895j)
+        self.assertAlmostEqual(path.length(method=QUADRATURE), 1990)
+        self.assertEqual(len(calls), 6)
+
+    def test_t_at_length(self) -> None:
+        for segment in (
+            CubicBezier(300 + 100j, 100 + 100j, 200 + 200j, 200 + 300j),
+            QuadraticBezier(200 + 300j, 400 + 50j, 600 + 300j),
+            Arc(0j, 100 + 50j, 30, 0, 1, 300 + 400j),
+            Line(0j, 300 + 400j),
+        ):
+            length = segment.length(method=QUADRATURE)
+            self.assertEqual(segment.t_at_length(-1), 0.0)
+            self.assertEqual(segment.t_at_length(length + 1), 1.0)
+            for fraction in (0.1, 0.25, 0.5, 0.9):
+                pos = segment.t_at_length(length * fraction)
+                # The length up to the position is the requested length
+                part = length * fraction
+                points = [segment.point(pos * i / 1000) for i in range(1001)]
+                chords = sum(abs(b - a) for a, b in zip(points, points[1:]))
+                self.assertAlmostEqual(chords, part, places=3)
+
+        # Zero length segments
+        self.assertEqual(Move(1 + 1j).t_at_length(1), 0.0)
+        self.assertEqual(Arc(1j, 1 + 1j, 0, 0, 0, 1j).t_at_length(1), 0.0)
+
+    def test_point_at_distance(self) -> None:
+        path = parse_path("M 0,0 L 100,0 L 100,300")
+        self.assertAlmostEqual(path.point_at_distance(50), 50 + 0j)
+        self.assertAlmostEqual(path.point_at_distance(200), 100 + 100j)
+        self.assertEqual(path.point_at_distance(-10), 0j)
+        self.assertEqual(path.point_at_distance(1000), 100 + 300j)
+
+        path = parse_path("M 300,100 C 100,100 200,200 200,300")
+        length = path.length()
+        self.assertAlmostEqual(
+            path.point_at_distance(length / 3), path.point(1 / 3, by_length=True)
+        )
+        self.assertEqual(parse_path("M 10,10").point_at_distance(5), 10 + 10j)
+
     def test_svg_specs(self) -> None:
         """The paths that are in the SVG specs"""
 
@@ -670,11 +1108,11 @@ class TestPath(unittest.TestCase):
 
         # These are *not* calculated, but just regression tests. Be skeptical.
         self.assertAlmostEqual(path.point(0.0), (600 + 350j))
-        self.assertAlmostEqual(path.point(0.3), (755.23979927 + 212.1820209585j))
-        self.assertAlmostEqual(path.point(0.5), (827.73074926 + 147.8241574162j))
-        self.assertAlmostEqual(path.point(0.9), (971.28435780 + 106.3023526073j))
+        self.assertAlmostEqual(path.point(0.3), (755.23979957 + 212.1820209640j))
+        self.assertAlmostEqual(path.point(0.5), (827.73074948 + 147.8241566709j))
+        self.assertAlmostEqual(path.point(0.9), (971.28435781 + 106.3023522725j))
         self.assertAlmostEqual(path.point(1.0), (1050 + 125j))
-        self.assertAlmostEqual(path.length(), 928.388639381)
+        self.assertAlmostEqual(path.length(), 928.388643549)
 
     def test_repr(self) -> None:
         path = Path(
@@ -811,12 +1249,12 @@ class TestPath(unittest.TestCase):
         self.assertEqual(path.tangent(0), 50 - 25j)
         # These are *not* calculated, but just regression tests. Be skeptical.
         self.assertAlmostEqual(
-            path.tangent(0.25), 197.17077123205894 + 106.56022001841387j
+            path.tangent(0.25), 197.17077282509507 + 106.56022281825221j
         )
         self.assertAlmostEqual(
-            path.tangent(0.5), -226.30788045372367 - 364.5433357646594j
+            path.tangent(0.5), -226.3078795906382 - 364.5433354896086j
         )
-        self.assertAlmostEqual(path.tangent(0.75), 13.630819414210208j)
+        self.assertAlmostEqual(path.tangent(0.75), 13.630818747809855j)
         self.assertAlmostEqual(path.tangent(1), 600j)
 
     def test_tangent_magnitude(self) -> None:
@@ -841,3 +1279,632 @@ class TestPath(unittest.TestCase):
         qb2 = QuadraticBezier(start=0, control=2 + 2j, end=4)
         # Length should be double, tangent is double.
         self.assertAlmostEqual(qb2.tangent(0.5) / qb1.tangent(0.5), 2)
+
+
+class ClosestPointTest(unittest.TestCase):
+    def test_line(self) -> None:
+        line = Line(0j, 100 + 0j)
+        self.assertEqual(line.closest_point(50 + 30j), (0.5, 50 + 0j, 30))
+        self.assertEqual(line.closest_point(150 + 0j), (1.0, 100 + 0j, 50))
+        self.assertEqual(line.closest_point(-30 - 40j), (0.0, 0j, 50))
+        self.assertEqual(Line(5j, 5j).closest_point(0j), (0.0, 5j, 5))
+
+    def test_curves(self) -> None:
+        # Symmetric curves, with the point on the convex side of the middle
+        for curve in (
+            QuadraticBezier(0j, 50 + 100j, 100 + 0j),
+            CubicBezier(0j, 100j, 100 + 100j, 100 + 0j),
+            Arc(100 + 0j, 100 + 100j, 0, 0, 1, -100 + 0j),
+            Arc(100 + 0j, 100 + 50j, 0, 0, 0, -100 + 0j),
+        ):
+            middle = curve.point(0.5)
+            normal = curve.tangent(0.5) * 1j / abs(curve.tangent(0.5))
+            point = middle + normal * 1000
+            if abs(point - curve.point(0.4)) < abs(point - middle):
+                point = middle - normal * 1000
+            t, closest, distance = curve.closest_point(point)
+            self.assertAlmostEqual(t, 0.5)
+            self.assertAlmostEqual(closest, middle)
+            self.assertAlmostEqual(distance, abs(point - middle))
+
+    def test_ends(self) -> None:
+        for curve in (
+            QuadraticBezier(0j, 50 + 100j, 100 + 0j),
+            CubicBezier(0j, 100j, 100 + 100j, 100 + 0j),
+            Arc(100 + 0j, 100 + 100j, 0, 0, 1, -100 + 0j),
+        ):
+            # Beyond the start, in the direction from the end
+            point = curve.start + (curve.start - curve.end) * 10
+            distance = abs(point - curve.start)
+            self.assertEqual(curve.closest_point(point), (0.0, curve.start, distance))
+
+    def test_out_of_range_arcs(self) -> None:
+        arc = Arc(10j, 100 + 100j, 0, 0, 0, 10j)
+        self.assertEqual(arc.closest_point(0j), (0.0, 10j, 10))
+        arc = Arc(0j, 0j, 0, 0, 0, 100 + 0j)
+        self.assertEqual(arc.closest_point(50 + 10j), (0.5, 50 + 0j, 10))
+
+    def polyline(self, segment: PathSegment) -> Path:
+        points = [segment.point(i / 1000) for i in range(1001)]
+        return Path(*(Line(start, end) for start, end in zip(points, points[1:])))
+
+    def test_against_samples(self) -> None:
+        path = parse_path(
+            "M 100,100 L 300,100 L 200,300 z M 100,200 C 100,100 250,100 250,200 "
+            "S 400,300 400,200 M 200,300 Q 400,50 600,300 T 1000,300 "
+            "M 600,350 l 50,-25 a 25,25 -30 0,1 50,-25 l 50,-25 "
+            "a 25,50 -30 0,1 50,-25 l 50,-25 a 25,75 -30 0,1 50,-25 l 50,-25"
+        )
+        for x in range(0, 1100, 100):
+            for y in range(0, 400, 50):
+                point = complex(x, y)
+                closest = path.closest_point(point)
+                segment = path[closest.segment]
+                self.assertNotIsInstance(segment, Move)
+                self.assertAlmostEqual(segment.point(closest.t), closest.point)
+                self.assertAlmostEqual(abs(closest.point - point), closest.distance)
+                # No segment has a point closer than that
+                for segment in path:
+                    for i in range(101):
+                        distance = abs(segment.point(i / 100) - point)
+                        self.assertGreater(distance, closest.distance - 1e-9)
+
+    def test_changed(self) -> None:
+        path = Path(Move(0j), Line(0j, 100 + 0j), Line(100 + 0j, 100 + 100j))
+        self.assertEqual(path.closest_point(50 + 10j).segment, 1)
+        path[1] = Line(0j, 100j)
+        self.assertEqual(path.closest_point(50 + 10j).segment, 1)
+        self.assertEqual(path.closest_point(50 + 10j).point, 10j)
+        path.append(Line(100 + 100j, 50 + 10j))
+        self.assertEqual(path.closest_point(50 + 10j), (3, 1.0, 50 + 10j, 0))
+
+    def test_no_segments(self) -> None:
+        with self.assertRaises(ValueError):
+            Path().closest_point(0j)
+        with self.assertRaises(ValueError):
+            Path(Move(0j), Move(10j)).closest_point(0j)
+
+
+class IntersectionsTest(unittest.TestCase):
+    def assertIntersections(
+        self,
+        found: List[Tuple[float, float, complex]],
+        expected: List[Tuple[float, float, complex]],
+    ) -> None:
+        self.assertEqual(len(found), len(expected), found)
+        for (t1, t2, point), (expected_t1, expected_t2, expected_point) in zip(
+            found, expected
+        ):
+            self.assertAlmostEqual(t1, expected_t1)
+            self.assertAlmostEqual(t2, expected_t2)
+            self.assertAlmostEqual(point, expected_point)
+
+    def test_lines(self) -> None:
+        self.assertEqual(
+            intersections(Line(0j, 100 + 100j), Line(100 + 0j, 100j)),
+            [(0.5, 0.5, 50 + 50j)],
+        )
+        # Touching at the ends, parallel and apart
+        self.assertEqual(
+            intersections(Line(0j, 100 + 0j), Line(100 + 0j, 200j)),
+            [(1.0, 0.0, 100 + 0j)],
+        )
+        self.assertEqual(intersections(Line(0j, 100 + 0j), Line(10j, 100 + 10j)), [])
+        self.assertEqual(intersections(Line(0j, 100 + 0j), Line(50j, 50 + 10j)), [])
+        # Overlapping lines intersect at the ends of the overlap
+        self.assertEqual(
+            intersections(Line(0j, 100 + 0j), Line(50 + 0j, 150 + 0j)),
+            [(0.5, 0.0, 50 + 0j), (1.0, 0.5, 100 + 0j)],
+        )
+        # Lines with integer coordinates still intersect at a complex point
+        [(_, _, point)] = intersections(Line(0, 100), Line(50 - 50j, 50 + 50j))
+        self.assertIsInstance(point, complex)
+
+    def test_line_and_curves(self) -> None:
+        # y = 300 t (1 - t), which is 50 at t = (1 ± sqrt(1/3)) / 2
+        curve = CubicBezier(0j, 100j, 100 + 100j, 100 + 0j)
+        low = (1 - sqrt(1 / 3)) / 2
+        x = curve.point(low).real
+        line = Line(50j, 100 + 50j)
+        self.assertIntersections(
+            intersections(line, curve),
+            [(x / 100, low, x + 50j), (1 - x / 100, 1 - low, 100 - x + 50j)],
+        )
+        # The order of the segments swaps the positions
+        self.assertIntersections(
+            intersections(curve, line),
+            [(low, x / 100, x + 50j), (1 - low, 1 - x / 100, 100 - x + 50j)],
+        )
+        # The top of the curve only touches the line
+        self.assertIntersections(
+            intersections(Line(75j, 100 + 75j), curve), [(0.5, 0.5, 50 + 75j)]
+        )
+
+        quadratic = QuadraticBezier(0j, 50 + 100j, 100 + 0j)
+        self.assertIntersections(
+            intersections(Line(50 - 100j, 50 + 100j), quadratic),
+            [(0.75, 0.5, 50 + 50j)],
+        )
+
+        # A half circle, and a line through its center
+        arc = Arc(-100 + 0j, 100 + 100j, 0, 0, 1, 100 + 0j)
+        self.assertIntersections(
+            intersections(Line(-200 - 100j, 200 + 100j), arc),
+            [(0.5 - sqrt(0.2) / 2, atan(0.5) / pi, -sqrt(8000) - sqrt(2000) * 1j)],
+        )
+        self.assertIntersections(
+            intersections(Line(-200 + 0j, 200 + 0j), arc),
+            [(0.25, 0.0, -100 + 0j), (0.75, 1.0, 100 + 0j)],
+        )
+        self.assertEqual(intersections(Line(-200 + 10j, 200 + 10j), arc), [])
+
+    def test_curves(self) -> None:
+        curve1 = CubicBezier(0j, 100j, 100 + 100j, 100 + 0j)
+        curve2 = CubicBezier(100j, 0j, 100 + 0j, 100 + 100j)
+        low = (1 - sqrt(1 / 3)) / 2
+        self.assertIntersections(
+            intersections(curve1, curve2),
+            [(low, low, curve1.point(low)), (1 - low, 1 - low, curve1.point(1 - low))],
+        )
+        # Two circles of radius 100, 100 apart
+        arc1 = Arc(-100 + 0j, 100 + 100j, 0, 0, 1, 100 + 0j)
+        arc2 = Arc(0j, 100 + 100j, 0, 0, 1, 200 + 0j)
+        self.assertIntersections(
+            intersections(arc1, arc2), [(2 / 3, 1 / 3, 50 - sqrt(7500) * 1j)]
+        )
+        # Touching circles
+        arc3 = Arc(100 - 200j, 100 + 100j, 0, 0, 1, -100 - 200j)
+        self.assertIntersections(intersections(arc1, arc3), [(0.5, 0.5, -100j)])
+
+        quadratic = QuadraticBezier(0j, 50 + 100j, 100 + 0j)
+        found = intersections(quadratic, arc1)
+        self.assertEqual(len(found), 1)
+        t1, t2, point = found[0]
+        self.assertAlmostEqual(quadratic.point(t1), point)
+        self.assertAlmostEqual(arc1.point(t2), point)
+        self.assertAlmostEqual(abs(point), 100)
+
+    def test_overlap(self) -> None:
+        # The part of the curve between 0.25 and 0.75
+        curve = CubicBezier(0j, 100j, 100 + 100j, 100 + 0j)
+        part = CubicBezier(
+            15.625 + 56.25j, 34.375 + 81.25j, 65.625 + 81.25j, 84.375 + 56.25j
+        )
+        self.assertIntersections(
+            intersections(curve, part),
+            [(0.25, 0.0, curve.point(0.25)), (0.75, 1.0, curve.point(0.75))],
+        )
+        arc = Arc(-100 + 0j, 100 + 100j, 0, 0, 1, 100 + 0j)
+        self.assertEqual(
+            intersections(arc, arc), [(0.0, 0.0, -100 + 0j), (1.0, 1.0, 100 + 0j)]
+        )
+
+    def test_crossing_itself(self) -> None:
+        # The line goes through the point where the curve crosses itself
+        curve = CubicBezier(0j, 200 + 100j, -100 + 100j, 100 + 0j)
+        low = 0.5 - sqrt(0.15)
+        self.assertIntersections(
+            intersections(curve, Line(-100 + 30j, 200 + 30j)),
+            [(low, 0.5, 50 + 30j), (1 - low, 0.5, 50 + 30j)],
+        )
+
+    def test_not_drawn(self) -> None:
+        line = Line(-100 + 0j, 100 + 0j)
+        self.assertEqual(intersections(line, Move(0j)), [])
+        self.assertEqual(intersections(line, Line(0j, 0j)), [])
+        self.assertEqual(intersections(Arc(0j, 10 + 10j, 0, 0, 1, 0j), line), [])
+        # Curves that are only a point
+        self.assertEqual(intersections(QuadraticBezier(0j, 0j, 0j), line), [])
+        self.assertEqual(intersections(line, CubicBezier(0j, 0j, 0j, 0j)), [])
+
+    def polyline(self, segment: PathSegment) -> Path:
+        points = [segment.point(i / 1000) for i in range(1001)]
+        return Path(*(Line(start, end) for start, end in zip(points, points[1:])))
+
+    def test_touching_curves(self) -> None:
+        # Where curves touch, the point is found several times, but returned once
+        arc = Arc(50j, 50 + 50j, 0, 0, 1, 100 + 50j)
+        curve = QuadraticBezier(-10j, 50 + 10j, 100 - 10j)
+        self.assertIntersections(intersections(arc, curve), [(0.5, 0.5, 50 + 0j)])
+        arc = Arc(20 + 90j, 50 + 50j, 0, 0, 0, 80 + 10j)
+        curve = QuadraticBezier(55 + 102j, 50 + 98j, 45 + 102j)
+        [(t1, t2, point)] = intersections(arc, curve)
+        self.assertAlmostEqual(t1, atan(0.75) / pi)
+        self.assertAlmostEqual(t2, 0.5)
+        self.assertAlmostEqual(point, 50 + 100j, delta=1e-6)
+
+    def test_against_samples(self) -> None:
+        segments = [
+            Line(10 + 80j, 90 + 10j),
+            CubicBezier(0j, 150 + 50j, -50 + 50j, 100 + 100j),
+            QuadraticBezier(0j, 200 + 50j, 0 + 100j),
+            Arc(100j, 60 + 40j, 30, 1, 0, 100 + 0j),
+            Arc(20 + 0j, 30 + 80j, -20, 0, 1, 80 + 100j),
+        ]
+        for segment1 in segments:
+            for segment2 in segments:
+                if segment1 is segment2:
+                    continue
+                found = intersections(segment1, segment2)
+                for t1, t2, point in found:
+                    self.assertAlmostEqual(segment1.point(t1), point)
+                    self.assertAlmostEqual(segment2.point(t2), point)
+                # Polylines through points on the segments cross as often
+                polyline1 = self.polyline(segment1)
+                polyline2 = self.polyline(segment2)
+                self.assertEqual(len(polyline1.intersections(polyline2)), len(found))
+
+    def test_path(self) -> None:
+        square = parse_path("M 0,0 L 100,0 L 100,100 L 0,100 Z")
+        lines = parse_path("M 50,-50 L 50,150 M 100,0 L 150,50 M -50,100 H 0 V 200")
+        self.assertEqual(
+            square.intersections(lines),
+            [
+                (1, 0.5, 1, 0.25, 50 + 0j),
+                # The corners are found at the start of the next segment
+                (2, 0.0, 3, 0.0, 100 + 0j),
+                (3, 0.5, 1, 0.75, 50 + 100j),
+                (4, 0.0, 6, 0.0, 100j),
+            ],
+        )
+        self.assertEqual(lines.intersections(square)[0], (1, 0.25, 1, 0.5, 50 + 0j))
+        # The end of the path is joined to the start by the Close
+        self.assertEqual(
+            square.intersections(parse_path("M -10,-10 L 10,10")),
+            [(1, 0.0, 1, 0.5, 0j)],
+        )
+        self.assertEqual(square.intersections(Path()), [])
+        self.assertEqual(square.intersections(Path(Move(50 + 0j))), [])
+
+    def test_path_joins(self) -> None:
+        # A curve that closes a subpath on its own is joined to itself
+        loop = parse_path("M 0,0 C 100,100 -100,100 0,0")
+        self.assertEqual(
+            loop.intersections(parse_path("M -10,0 L 10,0")), [(1, 0.0, 1, 0.5, 0j)]
+        )
+        # A curve that slows to a stop at its end, where its position is only
+        # found to the square root of the precision
+        path = parse_path("M 0,0 Q 100,0 100,0 L 100,100")
+        line = Path(Line(99.9 - 0.3j, 100.1 + 0.3j))
+        [(segment1, t1, segment2, t2, point)] = path.intersections(line)
+        self.assertEqual((segment1, t1, segment2), (2, 0.0, 0))
+        self.assertAlmostEqual(t2, 0.5)
+        self.assertAlmostEqual(point, 100 + 0j)
+
+    def test_path_changed(self) -> None:
+        path1 = parse_path("M 0,0 L 100,100")
+        path2 = parse_path("M 0,100 L 100,0")
+        self.assertEqual(path1.intersections(path2), [(1, 0.5, 1, 0.5, 50 + 50j)])
+        path2[1] = Line(100j, 100 + 100j)
+        self.assertEqual(path1.intersections(path2), [(1, 1.0, 1, 1.0, 100 + 100j)])
+
+
+class SelfIntersectionsTest(unittest.TestCase):
+    def test_simple(self) -> None:
+        self.assertEqual(
+            parse_path("M 0,0 L 100,0 L 100,100 L 0,100 Z").self_intersections(), []
+        )
+        # Curves that close a subpath on their own
+        self.assertEqual(
+            parse_path("M 0,0 C 100,100 -100,100 0,0").self_intersections(), []
+        )
+        self.assertEqual(
+            parse_path(
+                "M 0,50 Q 0,0 50,0 H 150 A 50,50 0 0 1 150,100 H 50 C 20,100 0,80 0,50 Z"
+            ).self_intersections(),
+            [],
+        )
+        self.assertEqual(Path().self_intersections(), [])
+        self.assertEqual(Path(Move(0j)).self_intersections(), [])
+
+    def test_crossing(self) -> None:
+        bowtie = parse_path("M 0,0 L 100,100 L 100,0 L 0,100 Z")
+        self.assertEqual(bowtie.self_intersections(), [(1, 0.5, 3, 0.5, 50 + 50j)])
+        # Other subpaths don't cross
+        bowtie = parse_path("M 0,0 L 100,100 L 100,0 L 0,100 Z M 200,0 H 300 V 100 Z")
+        self.assertEqual(bowtie.self_intersections(), [(1, 0.5, 3, 0.5, 50 + 50j)])
+
+    def test_touching(self) -> None:
+        # The last line ends on the first one, and the Close goes back over it
+        path = parse_path("M 0,0 L 100,0 L 100,100 L 50,0 Z")
+        self.assertEqual(path.self_intersections(), [(1, 0.5, 4, 0.0, 50 + 0j)])
+        # A circle, and a curve that touches it at the top and crosses it
+        path = parse_path(
+            "M 50,0 A 50,50 0 0 1 50,100 A 50,50 0 0 1 50,0 Z "
+            "M 0,50 Q 50,-50 100,50 T 0,50"
+        )
+        found = path.self_intersections()
+        self.assertEqual(
+            [(segment1, segment2) for segment1, _, segment2, _, _ in found],
+            [(1, 5), (1, 6), (1, 6), (2, 5)],
+        )
+        for segment1, t1, segment2, t2, point in found:
+            self.assertAlmostEqual(path[segment1].point(t1), point)
+            self.assertAlmostEqual(path[segment2].point(t2), point)
+        self.assertEqual(found[0][:4], (1, 0.0, 5, 0.5))
+
+    def test_through_end(self) -> None:
+        # The curve goes through its end halfway, and the line crosses its start
+        path = parse_path("M 0,0 C 300,300 400,-300 300,0 L 300,100 M -50,-50 L 50,50")
+        self.assertEqual(
+            path.self_intersections(),
+            [(1, 0.0, 4, 0.5, 0j), (1, 0.5, 2, 0.0, 300 + 0j)],
+        )
+
+    def test_loop(self) -> None:
+        path = parse_path("M 0,0 C 300,300 -200,300 100,0")
+        [(segment1, t1, segment2, t2, point)] = path.self_intersections()
+        self.assertEqual((segment1, segment2), (1, 1))
+        self.assertAlmostEqual(t1, 0.5 - sqrt(3) / 4)
+        self.assertAlmostEqual(t2, 0.5 + sqrt(3) / 4)
+        self.assertAlmostEqual(path[1].point(t1), point)
+        self.assertAlmostEqual(path[1].point(t2), point)
+
+    def test_star(self) -> None:
+        # A star of curves and arcs, drawn through every other point of a pentagon
+        corners = [100 * exp(0.8j * pi * i) for i in range(5)]
+        segments: List[PathSegment] = [Move(corners[0])]
+        for i, (start, end) in enumerate(zip(corners, corners[1:] + corners[:1])):
+            if i % 3 == 0:
+                segments.append(Line(start, end))
+            elif i % 3 == 1:
+                segments.append(QuadraticBezier(start, (start + end) * 0.6, end))
+            else:
+                segments.append(Arc(start, 400 + 400j, 0, 0, 1, end))
+        path = Path(*segments, Close(corners[0], corners[0]))
+        found = path.self_intersections()
+        self.assertEqual(
+            [(segment1, segment2) for segment1, _, segment2, _, _ in found],
+            [(1, 3), (1, 4), (2, 4), (2, 5), (3, 5)],
+        )
+        for segment1, t1, segment2, t2, point in found:
+            self.assertAlmostEqual(path[segment1].point(t1), point)
+            self.assertAlmostEqual(path[segment2].point(t2), point)
+
+    def test_path_changed(self) -> None:
+        path = parse_path("M 0,0 L 100,100 L 100,0 L 0,100")
+        self.assertEqual(path.self_intersections(), [(1, 0.5, 3, 0.5, 50 + 50j)])
+        path[3] = Line(100 + 0j, 200 + 100j)
+        self.assertEqual(path.self_intersections(), [])
+
+
+class ContainsTest(unittest.TestCase):
+    def test_square(self) -> None:
+        path = parse_path("M 0,0 L 100,0 L 100,100 L 0,100 Z")
+        self.assertTrue(path.contains(50 + 50j))
+        self.assertTrue(path.contains(1 + 99j))
+        self.assertFalse(path.contains(150 + 50j))
+        self.assertFalse(path.contains(-50 + 50j))
+        self.assertFalse(path.contains(50 - 50j))
+        # Level with a vertex
+        self.assertTrue(path.contains(50 + 0j) != path.contains(50 + 100j))
+        self.assertFalse(path.contains(-50 + 0j))
+        self.assertFalse(path.contains(-50 + 100j))
+
+    def test_fill_rule(self) -> None:
+        # Two squares in the same direction, and a third going the other way
+        path = parse_path(
+            "M 0,0 h 100 v 100 h -100 z M 25,25 h 50 v 50 h -50 z "
+            "M 200,0 h 100 v 100 h -100 z M 225,25 v 50 h 50 v -50 z"
+        )
+        self.assertTrue(path.contains(50 + 50j))
+        self.assertFalse(path.contains(50 + 50j, fill_rule="evenodd"))
+        self.assertTrue(path.contains(10 + 10j, fill_rule="evenodd"))
+        self.assertFalse(path.contains(250 + 50j))
+        self.assertFalse(path.contains(250 + 50j, fill_rule="evenodd"))
+        self.assertTrue(path.contains(210 + 10j))
+        with self.assertRaises(ValueError):
+            path.contains(50 + 50j, fill_rule="winding")
+
+    def test_curves(self) -> None:
+        # A circle of two arcs, not closed, so closed with a line of no length
+        circle = parse_path("M 0,50 A 50,50 0 0,1 100,50 A 50,50 0 0,1 0,50")
+        self.assertTrue(circle.contains(50 + 50j))
+        self.assertTrue(circle.contains(50 + 1j))
+        self.assertTrue(circle.contains(50 + 50j + 49 * exp(1j)))
+        self.assertFalse(circle.contains(50 + 50j + 51 * exp(1j)))
+        self.assertFalse(circle.contains(1 + 1j))
+
+        # A half circle of a cubic curve, closed with a line
+        dome = parse_path("M 0,100 C 0,-33 100,-33 100,100")
+        self.assertTrue(dome.contains(50 + 50j))
+        self.assertTrue(dome.contains(50 + 1j))
+        self.assertFalse(dome.contains(50 - 1j))
+        self.assertFalse(dome.contains(2 + 2j))
+        self.assertFalse(dome.contains(50 + 101j))
+
+        # A lens of two quadratic curves
+        lens = parse_path("M 0,50 Q 50,0 100,50 Q 50,100 0,50")
+        self.assertTrue(lens.contains(50 + 50j))
+        self.assertTrue(lens.contains(50 + 26j))
+        self.assertFalse(lens.contains(50 + 24j))
+        self.assertFalse(lens.contains(50 + 76j))
+
+    def test_figure_eight(self) -> None:
+        # The loops of a figure eight wind in opposite directions
+        path = parse_path("M 0,0 C 200,200 200,-200 0,0 C -200,200 -200,-200 0,0")
+        self.assertTrue(path.contains(100 + 0j))
+        self.assertTrue(path.contains(-100 + 0j))
+        self.assertFalse(path.contains(0 + 50j))
+        self.assertFalse(path.contains(200 + 0j))
+
+    def test_empty(self) -> None:
+        self.assertFalse(Path().contains(0j))
+        self.assertFalse(Path(Move(0j)).contains(0j))
+        self.assertFalse(parse_path("M 0,0 L 100,100").contains(50 + 50j))
+
+    def test_path_changed(self) -> None:
+        path = parse_path("M 0,0 L 100,0 L 100,100 L 0,100 Z")
+        self.assertFalse(path.contains(120 + 50j))
+        path[2] = Line(100 + 0j, 200 + 100j)
+        path[3] = Line(200 + 100j, 100j)
+        self.assertTrue(path.contains(120 + 50j))
+
+    def test_closings_changed(self) -> None:
+        # A triangle, closed with a line from the last point to the first
+        path = parse_path("M 0,0 L 100,0 L 100,100")
+        self.assertTrue(path.contains(80 + 50j))
+        self.assertFalse(path.contains(20 + 50j))
+        # The closing lines are only found again when the path changes
+        closings = path._closing_lines
+        self.assertFalse(path.contains(50 + 80j))
+        self.assertIs(path._closing_lines, closings)
+        path[2].end = 100j
+        self.assertTrue(path.contains(20 + 50j))
+        path.insert(1, Line(0j, -100j))
+        path[2].start = -100j
+        self.assertTrue(path.contains(20 - 10j))
+        # Not closed along the y axis any more
+        self.assertTrue(path.contains(20 + 50j))
+        del path[-1]
+        self.assertFalse(path.contains(-10 + 50j))
+        self.assertTrue(path.contains(20 - 10j))
+
+
+class AreaTest(unittest.TestCase):
+    def test_polygon(self) -> None:
+        square = parse_path("M 0,0 L 100,0 L 100,100 L 0,100 Z")
+        self.assertEqual(square.areas(), [10000.0])
+        self.assertEqual(square.area(), 10000.0)
+        self.assertEqual(square.centroid(), 50 + 50j)
+        self.assertTrue(square.is_clockwise())
+
+        # Not closed, and going the other way
+        triangle = parse_path("M 0,0 L 0,30 L 60,30")
+        self.assertEqual(triangle.area(), -900.0)
+        self.assertAlmostEqual(triangle.centroid(), 20 + 20j)
+        self.assertFalse(triangle.is_clockwise())
+
+    def test_curves(self) -> None:
+        circle = parse_path("M 0,50 A 50,50 0 0,1 100,50 A 50,50 0 0,1 0,50")
+        self.assertAlmostEqual(circle.area(), pi * 2500)
+        self.assertAlmostEqual(circle.centroid(), 50 + 50j)
+
+        # An ellipse with a scaled up radius, rotated and far from the origin
+        ellipse = Path(
+            Move(1e6 + 1e6j),
+            Arc(
+                1e6 + 1e6j, 2 + 1j, 45, False, False, 1e6 + 1e6j + 60 * exp(1j * pi / 4)
+            ),
+            Arc(
+                1e6 + 1e6j + 60 * exp(1j * pi / 4), 2 + 1j, 45, False, False, 1e6 + 1e6j
+            ),
+        )
+        self.assertAlmostEqual(ellipse.area(), -pi * 30 * 15, places=6)
+        self.assertAlmostEqual(ellipse.centroid(), 1e6 + 1e6j + 30 * exp(1j * pi / 4))
+
+        # The area under a parabola is two thirds of the rectangle around it
+        parabola = parse_path("M 0,0 Q 50,100 100,0 Z")
+        self.assertAlmostEqual(parabola.area(), -100 * 50 * 2 / 3)
+        self.assertAlmostEqual(parabola.centroid(), 50 + 20j)
+
+        # The integral of y dx is 270 * 720 * t^2 * (1 - t)^2 dt
+        cubic = parse_path("M 0,0 C 0,90 120,90 120,0")
+        self.assertAlmostEqual(cubic.area(), -6480)
+
+    def test_subpaths(self) -> None:
+        # A square with a hole going the other way, and another square
+        path = parse_path(
+            "M 0,0 h 100 v 100 h -100 z M 25,25 v 50 h 50 v -50 z m 175,-25 h 10 v 10 h -10"
+        )
+        self.assertEqual(path.areas(), [10000.0, -2500.0, 100.0])
+        self.assertEqual(path.area(), 7600.0)
+        self.assertAlmostEqual(
+            path.centroid(), ((50 + 50j) * 7500 + (205 + 5j) * 100) / 7600
+        )
+
+    def test_no_area(self) -> None:
+        self.assertEqual(Path().areas(), [])
+        self.assertEqual(Path().area(), 0)
+        self.assertEqual(parse_path("M 0,0 L 100,100").areas(), [0.0])
+        # The loops of a figure eight go opposite ways
+        eight = parse_path("M 0,0 L 100,100 L 100,0 L 0,100 Z")
+        self.assertEqual(eight.area(), 0)
+        with self.assertRaises(ValueError):
+            eight.centroid()
+
+    def test_reversed(self) -> None:
+        path = parse_path("M 100,200 C 100,100 250,100 250,200 A 80,40 30 1,0 100,200")
+        reversed_path = parse_path(
+            "M 100,200 A 80,40 30 1,1 250,200 C 250,100 100,100 100,200"
+        )
+        self.assertAlmostEqual(reversed_path.area(), -path.area())
+        self.assertAlmostEqual(reversed_path.centroid(), path.centroid())
+        self.assertNotEqual(path.is_clockwise(), reversed_path.is_clockwise())
+
+
+class TransformTest(unittest.TestCase):
+    def test_segments(self) -> None:
+        matrix = [[2, 0, 10], [0, 3, 20]]
+        line = Line(0j, 10 + 10j, relative=True)
+        self.assertEqual(line.transform(matrix), Line(10 + 20j, 30 + 50j))
+        self.assertTrue(line.transform(matrix).relative)
+        self.assertEqual(line, Line(0j, 10 + 10j))
+        self.assertEqual(
+            CubicBezier(0j, 1j, 1 + 1j, 1).transform(matrix),
+            CubicBezier(10 + 20j, 10 + 23j, 12 + 23j, 12 + 20j),
+        )
+        self.assertEqual(
+            QuadraticBezier(0j, 1j, 1).transform(matrix),
+            QuadraticBezier(10 + 20j, 10 + 23j, 12 + 20j),
+        )
+        self.assertEqual(Move(1j).transform(matrix), Move(10 + 23j))
+        self.assertEqual(Close(1j, 0j).transform(matrix), Close(10 + 23j, 10 + 20j))
+        with self.assertRaises(ValueError):
+            line.transform([[1, 0], [0, 1]])
+
+    def test_arc(self) -> None:
+        arc = Arc(0j, 20 + 10j, 0, False, True, 40 + 0j)
+        # Scaling y up makes the ellipse taller than it's wide
+        scaled = arc.transform([[1, 0, 0], [0, 3, 0]])
+        self.assertAlmostEqual(scaled.radius, 30 + 20j)
+        self.assertAlmostEqual(scaled.rotation % 180, 90)
+        self.assertTrue(scaled.sweep)
+        self.assertAlmostEqual(scaled.point(0.5), 20 - 30j)
+
+        # A reflection changes the direction
+        mirrored = arc.transform([[1, 0, 0], [0, -1, 0]])
+        self.assertAlmostEqual(mirrored.radius, 20 + 10j)
+        self.assertFalse(mirrored.sweep)
+        self.assertAlmostEqual(mirrored.point(0.5), 20 + 10j)
+
+        # A shear of a circle makes a rotated ellipse
+        circle = Arc(10 + 0j, 10 + 10j, 0, False, True, -10 + 0j)
+        sheared = circle.transform([[1, 1, 0], [0, 1, 0]])
+        self.assertAlmostEqual(sheared.radius.real * sheared.radius.imag, 100)
+        for pos in (0.0, 0.25, 0.5, 0.75, 1.0):
+            point = circle.point(pos)
+            expected = complex(point.real + point.imag, point.imag)
+            self.assertAlmostEqual(sheared.closest_point(expected)[2], 0, places=5)
+
+        # An arc that is a straight line stays straight
+        line = Arc(0j, 0 + 10j, 30, False, True, 10 + 10j)
+        rotated = line.transform([[0, -1, 0], [1, 0, 0]])
+        self.assertEqual(rotated.radius.imag, 0)
+        self.assertAlmostEqual(rotated.point(0.5), -5 + 5j)
+
+    def test_path(self) -> None:
+        path = parse_path("M 0,0 L 100,0 A 50,50 0 0,1 100,100 L 0,100 Z")
+        area = path.area()
+        # Rotate a quarter turn around 50,50, and mirror
+        matrix = [[0, -1, 100], [1, 0, 0]]
+        rotated = path.transform(matrix)
+        self.assertAlmostEqual(rotated.area(), area)
+        self.assertAlmostEqual(rotated.centroid(), 100 - path.centroid() * -1j)
+        self.assertEqual(rotated.boundingbox(), [0.0, 0.0, 100.0, 150.0])
+        mirrored = path.transform([[-1, 0, 0], [0, 1, 0]])
+        self.assertAlmostEqual(mirrored.area(), -area)
+
+        self.assertAlmostEqual(path.length(), 300 + 50 * pi)
+        path.transform_in_place([[2, 0, 0], [0, 2, 0]])
+        self.assertAlmostEqual(path.area(), 4 * area)
+        self.assertAlmostEqual(path.length(), 600 + 100 * pi)
+        self.assertEqual(path.boundingbox(), [0.0, 0.0, 300.0, 200.0])
+
+    def test_shared_segments(self) -> None:
+        # Paths from the parse cache share their segments
+        cache = parser.PathCache()
+        path = cache.parse("M 0,0 L 100,0 L 100,100")
+        path.transform_in_place([[1, 0, 10], [0, 1, 10]])
+        self.assertEqual(path[1], Line(10 + 10j, 110 + 10j))
+        self.assertEqual(cache.parse("M 0,0 L 100,0 L 100,100")[1], Line(0j, 100 + 0j))
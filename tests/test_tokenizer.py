@@ -5,27 +5,12 @@ from svg.path import parser
 PATHS = [
     (
         "M 100 100 L 300 100 L 200 300 z",
-        [("M", "100 100"), ("L", "300 100"), ("L", "200 300"), ("z", "")],
         [("M", 100 + 100j), ("L", 300 + 100j), ("L", 200 + 300j), ("z",)],
     ),
     (
         "M 5 1 v 7.344 A 3.574 3.574 0 003.5 8 3.515 3.515 0 000 11.5 C 0 13.421 1.579 15 3.5 15 "
         "A 3.517 3.517 0 007 11.531 v -7.53 h 6 v 4.343 A 3.574 3.574 0 0011.5 8 3.515 3.515 0 008 11.5 "
         "c 0 1.921 1.579 3.5 3.5 3.5 1.9 0 3.465 -1.546 3.5 -3.437 V 1 z",
-        [
-            ("M", "5 1"),
-            ("v", "7.344"),
-            ("A", "3.574 3.574 0 003.5 8 3.515 3.515 0 000 11.5"),
-            ("C", "0 13.421 1.579 15 3.5 15"),
-            ("A", "3.517 3.517 0 007 11.531"),
-            ("v", "-7.53"),
-            ("h", "6"),
-            ("v", "4.343"),
-            ("A", "3.574 3.574 0 0011.5 8 3.515 3.515 0 008 11.5"),
-            ("c", "0 1.921 1.579 3.5 3.5 3.5 1.9 0 3.465 -1.546 3.5 -3.437"),
-            ("V", "1"),
-            ("z", ""),
-        ],
         [
             ("M", 5 + 1j),
             ("v", 7.344),
@@ -46,12 +31,6 @@ PATHS = [
     ),
     (
         "M 600,350 L 650,325 A 25,25 -30 0,1 700,300 L 750,275",
-        [
-            ("M", "600,350"),
-            ("L", "650,325"),
-            ("A", "25,25 -30 0,1 700,300"),
-            ("L", "750,275"),
-        ],
         [
             ("M", 600 + 350j),
             ("L", 650 + 325j),
@@ -62,22 +41,49 @@ PATHS = [
 ]
 
 
-@pytest.mark.parametrize("path, commands, tokens", PATHS)
-def test_commandifier(
+@pytest.mark.parametrize("path, tokens", PATHS)
+def test_tokenizer(
     path: str,
-    commands: List[Tuple[str, ...]],
     tokens: List[Tuple[Union[str, complex, float, bool, None], ...]],
 ) -> None:
-    assert list(parser._commandify_path(path)) == commands
     assert list(parser._tokenize_path(path)) == tokens
+    assert list(parser._tokenize_path(path.encode())) == tokens
 
 
-@pytest.mark.parametrize("path, commands, tokens", PATHS)
+@pytest.mark.parametrize("path, tokens", PATHS)
 def test_parser(
     path: str,
-    commands: List[Tuple[str, ...]],
     tokens: List[Tuple[Union[str, complex, float, bool, None], ...]],
 ) -> None:
     # TODO: Add a check that svg_path.d() is correct.
     # flake8: F841 local variable 'svg_path' is assigned to but never used
     svg_path = parser.parse_path(path)  # noqa: F841
+
+
+def test_long_implicit_arguments() -> None:
+    # Thousands of implicit coordinate pairs after a single command letter
+    pathdef = "M 0,0 L " + " ".join(f"{i},{-i}" for i in range(5000)) + " z"
+    tokens = list(parser._tokenize_path(pathdef))
+    assert len(tokens) == 5002
+    assert tokens[1] == ("L", 0j)
+    assert tokens[-2] == ("L", 4999 - 4999j)
+    assert tokens[-1] == ("z",)
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "100 100 L 200 200",
+        "M 100 100 L",
+        "M 100 100 Z 200 200",
+        "M 100 100 L 200",
+        "M 100 100 A 25,25 0 1 7 50,50",
+        "M 100 100 A 25,25 0 -1 0 50,50",
+        "M -. 100",
+    ],
+)
+def test_tokenizer_errors(path: str) -> None:
+    with pytest.raises(parser.InvalidPathError):
+        list(parser._tokenize_path(path))
+    with pytest.raises(parser.InvalidPathError):
+        list(parser._tokenize_path(path.encode()))